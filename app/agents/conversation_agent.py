@@ -7,21 +7,73 @@ conversations with phase-based progression, context extraction, and tool integra
 
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
-from langchain.schema import HumanMessage, AIMessage, SystemMessage
+from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 
 from app.db import AsyncConversationDB, ConversationPhase, MessageRole
-from app.services import AsyncWebSearchService, AsyncToolOrchestrator
+from app.services import AsyncToolOrchestrator, get_shared_web_search_service
 from app.config import get_settings
+from app.utils import KeywordMatcher, SemanticResponseCache, utc_now_iso
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Keyword tables for context extraction, built once at import time.
+# Matching is by substring so plurals and multi-word phrases still hit.
+BEGINNER_KEYWORDS = ('beginner', 'new', 'start', 'basic')
+ADVANCED_KEYWORDS = ('advanced', 'expert', 'professional')
+TEACHING_GOAL_KEYWORDS = ('teach', 'teaching', 'education', 'learn', 'learning')
+LEARNING_GOAL_KEYWORDS = ('learn', 'learning', 'study', 'understand')
+HIGHER_EDUCATION_KEYWORDS = ('high school', 'college', 'university', 'student', 'students')
+K12_EDUCATION_KEYWORDS = ('elementary', 'middle school', 'grade')
+GENRE_KEYWORDS = (
+    'jazz', 'rock', 'pop', 'hip hop', 'classical', 'blues', 'country',
+    'electronic', 'folk', 'reggae', 'soul', 'r&b', 'metal', 'punk',
+    'funk', 'disco', 'latin', 'world', 'ambient', 'experimental'
+)
+CULTURAL_ELEMENT_KEYWORDS = (
+    'history', 'tradition', 'culture', 'society', 'community',
+    'ceremony', 'celebration', 'ritual', 'spiritual', 'religious',
+    'heritage', 'custom', 'practice', 'belief'
+)
+THEORY_CONCEPT_KEYWORDS = (
+    'rhythm', 'melody', 'harmony', 'chord', 'scale', 'key', 'tempo',
+    'beat', 'syncopation', 'polyrhythm', 'modulation', 'transposition'
+)
+GENERATION_CONFIRMATION_KEYWORDS = ('yes', 'ready', 'go', 'create', 'generate')
+GENRE_INTEREST_KEYWORDS = (
+    'genre', 'music', 'style', 'type', 'explore', 'jazz', 'rock', 'pop',
+    'classical', 'blues', 'country', 'electronic', 'folk', 'reggae', 'soul',
+    'r&b', 'metal', 'punk', 'funk', 'disco', 'latin', 'world', 'ambient',
+    'experimental'
+)
+
+# Single-pass matcher over every keyword table above
+CONTEXT_KEYWORD_MATCHER = KeywordMatcher({
+    'beginner': BEGINNER_KEYWORDS,
+    'advanced': ADVANCED_KEYWORDS,
+    'teaching_goal': TEACHING_GOAL_KEYWORDS,
+    'learning_goal': LEARNING_GOAL_KEYWORDS,
+    'higher_education': HIGHER_EDUCATION_KEYWORDS,
+    'k12_education': K12_EDUCATION_KEYWORDS,
+    'genre': GENRE_KEYWORDS,
+    'cultural_element': CULTURAL_ELEMENT_KEYWORDS,
+    'theory_concept': THEORY_CONCEPT_KEYWORDS,
+    'generation_confirmation': GENERATION_CONFIRMATION_KEYWORDS,
+    'genre_interest': GENRE_INTEREST_KEYWORDS
+})
+
+# Volatile tool context, sent after the stable prompt prefix when search results exist
+TOOL_RESULTS_PROMPT_TEMPLATE = (
+    "I have found {total_results} relevant sources that may help inform our conversation. "
+    "Use this information to provide more accurate and educational responses."
+)
+
 
 class ConversationPhase(str, Enum):
     """Conversation phases for the educational mashup generation process."""
@@ -33,6 +85,21 @@ class ConversationPhase(str, Enum):
     ERROR = "error"
 
 
+# Canned responses used when the model cannot be reached, built once per process
+FALLBACK_RESPONSES: Dict[ConversationPhase, str] = {
+    ConversationPhase.INITIAL: "I'm here to help you create an educational music mashup! What kind of music are you interested in exploring?",
+    ConversationPhase.GENRE_EXPLORATION: "That's interesting! What other genres would you like to explore or combine?",
+    ConversationPhase.EDUCATIONAL_CLARIFICATION: "Great! What music theory concepts would you like to learn about?",
+    ConversationPhase.CULTURAL_RESEARCH: "Excellent! Let's explore the cultural context of these genres. What aspects interest you most?",
+    ConversationPhase.READY_FOR_GENERATION: "Perfect! Are you ready to create your educational music mashup?"
+}
+DEFAULT_FALLBACK_RESPONSE = "I'm here to help you with your music mashup project!"
+
+# Precomputed phase <-> stored value maps for the per-message hot path
+PHASE_VALUES: Dict[ConversationPhase, str] = {phase: phase.value for phase in ConversationPhase}
+PHASE_BY_VALUE: Dict[str, ConversationPhase] = {value: phase for phase, value in PHASE_VALUES.items()}
+
+
 class SkillLevel(str, Enum):
     """Educational skill levels."""
     BEGINNER = "beginner"
@@ -40,6 +107,48 @@ class SkillLevel(str, Enum):
     ADVANCED = "advanced"
 
 
+def _has_genre_interest(normalized_message: str, extracted_context: Dict[str, Any]) -> bool:
+    """Check whether the user message shows interest in genres or styles."""
+    return bool(CONTEXT_KEYWORD_MATCHER.match(normalized_message)['genre_interest'])
+
+
+def _has_mentioned_genres(normalized_message: str, extracted_context: Dict[str, Any]) -> bool:
+    """Check whether genres were extracted from the message."""
+    return bool(extracted_context.get('mentioned_genres'))
+
+
+def _has_educational_goals(normalized_message: str, extracted_context: Dict[str, Any]) -> bool:
+    """Check whether educational goals are clear."""
+    return 'theory_concepts' in extracted_context or 'has_educational_goals' in extracted_context
+
+
+def _has_cultural_context(normalized_message: str, extracted_context: Dict[str, Any]) -> bool:
+    """Check whether cultural context has been explored."""
+    return 'cultural_elements' in extracted_context or 'mentioned_genres' in extracted_context
+
+
+# A transition rule pairs a predicate over (lowercased message, extracted_context) with the next phase
+PhaseTransitionRule = Tuple[Callable[[str, Dict[str, Any]], bool], ConversationPhase]
+
+# Phase transition table: per phase, rules checked in order; the first match wins.
+# READY_FOR_GENERATION has no rules and stays put until the user confirms generation.
+PHASE_TRANSITION_RULES: Dict[ConversationPhase, Tuple[PhaseTransitionRule, ...]] = {
+    ConversationPhase.INITIAL: (
+        (_has_genre_interest, ConversationPhase.GENRE_EXPLORATION),
+    ),
+    ConversationPhase.GENRE_EXPLORATION: (
+        (_has_mentioned_genres, ConversationPhase.EDUCATIONAL_CLARIFICATION),
+    ),
+    ConversationPhase.EDUCATIONAL_CLARIFICATION: (
+        (_has_educational_goals, ConversationPhase.CULTURAL_RESEARCH),
+    ),
+    ConversationPhase.CULTURAL_RESEARCH: (
+        (_has_cultural_context, ConversationPhase.READY_FOR_GENERATION),
+    ),
+    ConversationPhase.READY_FOR_GENERATION: ()
+}
+
+
 class AsyncConversationalMashupAgent:
     """
     Async conversational AI agent with phase-based conversation management and tool integration.
@@ -55,7 +164,8 @@ class AsyncConversationalMashupAgent:
         tavily_api_key: Optional[str] = None,
         db_path: Optional[str] = None,
         openai_api_key: Optional[str] = None,
-        enable_tools: bool = True
+        enable_tools: bool = True,
+        response_cache: Optional[SemanticResponseCache] = None
     ):
         """
         Initialize the conversational agent.
@@ -67,12 +177,15 @@ class AsyncConversationalMashupAgent:
             db_path: Path to the database
             openai_api_key: Optional OpenAI API key
             enable_tools: Whether to enable tool integration
+            response_cache: Optional cache for reusing model responses to
+                repeated messages within a phase
         """
         self.model_name = model_name
         self.model_type = model_type
         self.tavily_api_key = tavily_api_key
         self.openai_api_key = openai_api_key
         self.enable_tools = enable_tools
+        self.response_cache = response_cache
         
         # Initialize database
         settings = get_settings()
@@ -82,7 +195,7 @@ class AsyncConversationalMashupAgent:
         self._initialize_model()
         
         # Initialize tool orchestrator if enabled
-        self.tool_orchestrator = None
+        self.tool_orchestrator: Optional[AsyncToolOrchestrator] = None
         if self.enable_tools:
             self._initialize_tool_orchestrator()
         
@@ -91,7 +204,7 @@ class AsyncConversationalMashupAgent:
         
         logger.info(f"Initialized AsyncConversationalMashupAgent with {model_type} model: {model_name}, tools: {enable_tools}")
     
-    def _initialize_model(self):
+    def _initialize_model(self) -> None:
         """Initialize the AI model based on model_type."""
         try:
             if self.model_type == "ollama":
@@ -113,11 +226,11 @@ class AsyncConversationalMashupAgent:
             logger.error(f"Failed to initialize model: {e}")
             raise
     
-    def _initialize_tool_orchestrator(self):
+    def _initialize_tool_orchestrator(self) -> None:
         """Initialize the tool orchestrator."""
         try:
-            # Initialize web search service
-            web_search_service = AsyncWebSearchService(self.tavily_api_key)
+            # Reuse the process-wide web search service for this API key
+            web_search_service = get_shared_web_search_service(self.tavily_api_key)
             
             # Initialize tool orchestrator
             self.tool_orchestrator = AsyncToolOrchestrator(
@@ -129,9 +242,9 @@ class AsyncConversationalMashupAgent:
             logger.warning(f"Failed to initialize tool orchestrator: {e}")
             self.tool_orchestrator = None
     
-    def _initialize_system_prompts(self):
+    def _initialize_system_prompts(self) -> None:
         """Initialize system prompts for different conversation phases."""
-        self.system_prompts = {
+        self.system_prompts: Dict[ConversationPhase, str] = {
             ConversationPhase.INITIAL: """You are an educational AI assistant for music mashup creation. 
             Your goal is to help users create educational music mashups that combine different genres 
             while teaching music theory and cultural context. Start by understanding the user's goals 
@@ -157,6 +270,12 @@ class AsyncConversationalMashupAgent:
             Confirm that you have all the information needed to create an educational mashup that combines 
             the chosen genres while teaching the specified music theory concepts and cultural context."""
         }
+        
+        # Phase prompts are static, so build their system messages once
+        self._system_message_cache: Dict[ConversationPhase, SystemMessage] = {
+            phase: SystemMessage(content=sys.intern(prompt))
+            for phase, prompt in self.system_prompts.items()
+        }
     
     async def process_message(
         self, 
@@ -178,36 +297,122 @@ class AsyncConversationalMashupAgent:
         try:
             # Get or create conversation
             conversation = await self._get_or_create_conversation(session_id)
-            current_phase = ConversationPhase(conversation['phase'])
+            current_phase = PHASE_BY_VALUE[conversation['phase']]
+            
+            # Lowercase once for keyword matching in extraction and phase transition
+            normalized = user_message.lower()
             
             # Extract context from user message
-            extracted_context = await self._extract_context(user_message, current_phase)
+            extracted_context = await self._extract_context(user_message, current_phase, normalized)
             
             # Handle conversation phase with tool integration
             response_data = await self._handle_conversation_phase_with_tools(
-                session_id, user_message, conversation, current_phase, extracted_context
+                session_id, user_message, conversation, current_phase, extracted_context, normalized
             )
             
-            # Add user message to database
-            await self.db.add_message(session_id, MessageRole.USER, user_message)
-            
-            # Add AI response to database
-            await self.db.add_message(session_id, MessageRole.ASSISTANT, response_data['response'])
-            
-            # Update conversation phase if needed
-            if response_data['phase_transition']:
-                await self.db.update_conversation_phase(session_id, response_data['new_phase'])
+            # Store the turn and update the conversation phase if needed
+            await self._persist_turn(session_id, user_message, response_data)
             
             return response_data
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
-            return {
-                'response': "I apologize, but I encountered an error processing your message. Please try again.",
-                'phase': ConversationPhase.ERROR,
-                'phase_transition': False,
-                'error': str(e)
-            }
+            return self._get_error_response(e)
+    
+    async def stream_message(
+        self, 
+        session_id: str, 
+        user_message: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a user message, yielding the AI response as it is generated.
+        
+        Args:
+            session_id: Session identifier
+            user_message: User's message
+            context: Optional additional context
+            
+        Yields:
+            ``{'delta': text}`` for each response chunk, then the same response
+            data as ``process_message`` with ``'done': True``
+        """
+        try:
+            # Get or create conversation
+            conversation = await self._get_or_create_conversation(session_id)
+            current_phase = PHASE_BY_VALUE[conversation['phase']]
+            normalized = user_message.lower()
+            
+            extracted_context = await self._extract_context(user_message, current_phase, normalized)
+            
+            # Stream AI response, reusing a cached one for repeated messages
+            # without running tools or loading history
+            chunks = []
+            tool_results: Dict[str, Any] = {}
+            cached_response = self._lookup_cached_response(session_id, current_phase, user_message)
+            
+            if cached_response is not None:
+                chunks.append(cached_response)
+                yield {'delta': cached_response}
+            else:
+                tool_results, ai_messages = await self._prepare_turn(
+                    session_id, user_message, current_phase, extracted_context
+                )
+                try:
+                    async for chunk in self.model.astream(ai_messages):
+                        if chunk.content:
+                            chunks.append(chunk.content)
+                            yield {'delta': chunk.content}
+                    
+                    if self.response_cache is not None:
+                        self.response_cache.store(
+                            session_id, PHASE_VALUES[current_phase], user_message, "".join(chunks)
+                        )
+                except Exception as e:
+                    logger.error(f"Error streaming AI response: {e}")
+                    if not chunks:
+                        fallback = self._get_fallback_response(current_phase)
+                        chunks.append(fallback)
+                        yield {'delta': fallback}
+            
+            response_data = await self._build_response_data(
+                session_id, user_message, current_phase, extracted_context,
+                tool_results, "".join(chunks), normalized
+            )
+            await self._persist_turn(session_id, user_message, response_data)
+            
+            yield {**response_data, 'done': True}
+            
+        except Exception as e:
+            logger.error(f"Error streaming message: {e}")
+            yield {**self._get_error_response(e), 'done': True}
+    
+    async def _persist_turn(
+        self,
+        session_id: str,
+        user_message: str,
+        response_data: Dict[str, Any]
+    ) -> None:
+        """Store the user message and AI response, and the phase transition if any, concurrently."""
+        writes = [
+            self.db.add_messages(session_id, [
+                {'role': MessageRole.USER, 'content': user_message},
+                {'role': MessageRole.ASSISTANT, 'content': response_data['response']}
+            ])
+        ]
+        if response_data['phase_transition']:
+            writes.append(self.db.update_conversation_phase(session_id, response_data['new_phase']))
+        
+        await asyncio.gather(*writes)
+    
+    def _get_error_response(self, error: Exception) -> Dict[str, Any]:
+        """Build the response returned when a message cannot be processed."""
+        return {
+            'response': "I apologize, but I encountered an error processing your message. Please try again.",
+            'phase': ConversationPhase.ERROR,
+            'phase_transition': False,
+            'error': str(error)
+        }
     
     async def _get_or_create_conversation(self, session_id: str) -> Dict[str, Any]:
         """Get existing conversation or create a new one."""
@@ -220,7 +425,8 @@ class AsyncConversationalMashupAgent:
     async def _extract_context(
         self, 
         user_message: str, 
-        current_phase: ConversationPhase
+        current_phase: ConversationPhase,
+        normalized: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Extract context from user message based on current phase.
@@ -228,33 +434,37 @@ class AsyncConversationalMashupAgent:
         Args:
             user_message: User's message
             current_phase: Current conversation phase
+            normalized: Optional lowercased user message, computed if omitted
             
         Returns:
             Extracted context dictionary
         """
+        if normalized is None:
+            normalized = user_message.lower()
+        
         context = {
             'message': user_message,
             'phase': current_phase,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': utc_now_iso()
         }
         
         # Phase-specific context extraction
         if current_phase == ConversationPhase.INITIAL:
-            context.update(await self._extract_initial_context(user_message))
+            context.update(await self._extract_initial_context(user_message, normalized))
         elif current_phase == ConversationPhase.GENRE_EXPLORATION:
-            context.update(await self._extract_genre_context(user_message))
+            context.update(await self._extract_genre_context(user_message, normalized))
         elif current_phase == ConversationPhase.EDUCATIONAL_CLARIFICATION:
-            context.update(await self._extract_educational_context(user_message))
+            context.update(await self._extract_educational_context(user_message, normalized))
         elif current_phase == ConversationPhase.CULTURAL_RESEARCH:
-            context.update(await self._extract_cultural_context(user_message))
+            context.update(await self._extract_cultural_context(user_message, normalized))
         elif current_phase == ConversationPhase.READY_FOR_GENERATION:
-            context.update(await self._extract_generation_context(user_message))
+            context.update(await self._extract_generation_context(user_message, normalized))
         
         return context
     
-    async def _extract_initial_context(self, message: str) -> Dict[str, Any]:
+    async def _extract_initial_context(self, message: str, normalized: Optional[str] = None) -> Dict[str, Any]:
         """Extract context from initial phase messages."""
-        message_lower = message.lower()
+        matches = CONTEXT_KEYWORD_MATCHER.match(normalized if normalized is not None else message.lower())
         context = {
             'educational_goals': [],
             'target_audience': None,
@@ -263,68 +473,48 @@ class AsyncConversationalMashupAgent:
         }
         
         # Extract skill level
-        if any(word in message_lower for word in ['beginner', 'new', 'start', 'basic']):
+        if matches['beginner']:
             context['skill_level'] = SkillLevel.BEGINNER
-        elif any(word in message_lower for word in ['advanced', 'expert', 'professional']):
+        elif matches['advanced']:
             context['skill_level'] = SkillLevel.ADVANCED
         
         # Extract educational goals
-        if any(word in message_lower for word in ['teach', 'teaching', 'education', 'learn', 'learning']):
+        if matches['teaching_goal']:
             context['educational_goals'].append('teaching')
-        if any(word in message_lower for word in ['learn', 'learning', 'study', 'understand']):
+        if matches['learning_goal']:
             context['educational_goals'].append('learning')
         
         # Extract target audience
-        if any(word in message_lower for word in ['high school', 'college', 'university', 'student', 'students']):
+        if matches['higher_education']:
             context['target_audience'] = 'higher_education'
-        elif any(word in message_lower for word in ['elementary', 'middle school', 'grade']):
+        elif matches['k12_education']:
             context['target_audience'] = 'k12_education'
         
         # Extract music interests and mentioned genres
-        genres = ['jazz', 'classical', 'rock', 'pop', 'hip hop', 'blues', 'folk', 'electronic', 'country', 'reggae', 'soul', 'r&b', 'metal', 'punk', 'funk', 'disco', 'latin', 'world', 'ambient', 'experimental']
-        for genre in genres:
-            if genre in message_lower:
-                context['music_interests'].append(genre)
-                context['mentioned_genres'] = context.get('mentioned_genres', []) + [genre]
+        genres = matches['genre']
+        if genres:
+            context['music_interests'].extend(genres)
+            context['mentioned_genres'] = genres
         
         return context
     
-    async def _extract_genre_context(self, message: str) -> Dict[str, Any]:
+    async def _extract_genre_context(self, message: str, normalized: Optional[str] = None) -> Dict[str, Any]:
         """Extract genre-related context."""
-        message_lower = message.lower()
+        matches = CONTEXT_KEYWORD_MATCHER.match(normalized if normalized is not None else message.lower())
         context = {
             'mentioned_genres': [],
             'cultural_elements': [],
             'combination_ideas': []
         }
         
-        # Common music genres
-        genres = [
-            'jazz', 'rock', 'pop', 'hip hop', 'classical', 'blues', 'country',
-            'electronic', 'folk', 'reggae', 'soul', 'r&b', 'metal', 'punk',
-            'funk', 'disco', 'latin', 'world', 'ambient', 'experimental'
-        ]
-        
-        for genre in genres:
-            if genre in message_lower:
-                context['mentioned_genres'].append(genre)
-        
-        # Extract cultural elements
-        cultural_elements = [
-            'history', 'tradition', 'culture', 'society', 'community',
-            'ceremony', 'celebration', 'ritual', 'spiritual', 'religious',
-            'heritage', 'custom', 'practice', 'belief', 'ceremony'
-        ]
-        
-        for element in cultural_elements:
-            if element in message_lower:
-                context['cultural_elements'].append(element)
+        context['mentioned_genres'] = matches['genre']
+        context['cultural_elements'] = matches['cultural_element']
         
         return context
     
-    async def _extract_educational_context(self, message: str) -> Dict[str, Any]:
+    async def _extract_educational_context(self, message: str, normalized: Optional[str] = None) -> Dict[str, Any]:
         """Extract educational context."""
-        message_lower = message.lower()
+        matches = CONTEXT_KEYWORD_MATCHER.match(normalized if normalized is not None else message.lower())
         context = {
             'skill_level': SkillLevel.INTERMEDIATE,
             'theory_concepts': [],
@@ -333,52 +523,35 @@ class AsyncConversationalMashupAgent:
         }
         
         # Extract skill level
-        if any(word in message_lower for word in ['beginner', 'new', 'start', 'basic']):
+        if matches['beginner']:
             context['skill_level'] = SkillLevel.BEGINNER
-        elif any(word in message_lower for word in ['advanced', 'expert', 'professional']):
+        elif matches['advanced']:
             context['skill_level'] = SkillLevel.ADVANCED
         
-        # Music theory concepts
-        theory_concepts = [
-            'rhythm', 'melody', 'harmony', 'chord', 'scale', 'key', 'tempo',
-            'beat', 'syncopation', 'polyrhythm', 'modulation', 'transposition'
-        ]
-        
-        for concept in theory_concepts:
-            if concept in message_lower:
-                context['theory_concepts'].append(concept)
+        context['theory_concepts'] = matches['theory_concept']
         
         return context
     
-    async def _extract_cultural_context(self, message: str) -> Dict[str, Any]:
+    async def _extract_cultural_context(self, message: str, normalized: Optional[str] = None) -> Dict[str, Any]:
         """Extract cultural context."""
-        message_lower = message.lower()
+        matches = CONTEXT_KEYWORD_MATCHER.match(normalized if normalized is not None else message.lower())
         context = {
             'cultural_elements': [],
             'historical_context': [],
             'social_significance': []
         }
         
-        # Cultural elements
-        cultural_elements = [
-            'history', 'tradition', 'culture', 'society', 'community',
-            'ceremony', 'celebration', 'ritual', 'spiritual', 'religious',
-            'heritage', 'custom', 'practice', 'belief', 'ceremony'
-        ]
-        
-        for element in cultural_elements:
-            if element in message_lower:
-                context['cultural_elements'].append(element)
+        context['cultural_elements'] = matches['cultural_element']
         
         return context
     
-    async def _extract_generation_context(self, message: str) -> Dict[str, Any]:
+    async def _extract_generation_context(self, message: str, normalized: Optional[str] = None) -> Dict[str, Any]:
         """Extract generation context."""
-        message_lower = message.lower()
+        matches = CONTEXT_KEYWORD_MATCHER.match(normalized if normalized is not None else message.lower())
         context = {}
         
         # Check for confirmation words
-        if any(word in message_lower for word in ['yes', 'ready', 'go', 'create', 'generate']):
+        if matches['generation_confirmation']:
             context['ready_for_generation'] = True
         
         return context
@@ -389,7 +562,8 @@ class AsyncConversationalMashupAgent:
         user_message: str,
         conversation: Dict[str, Any],
         current_phase: ConversationPhase,
-        extracted_context: Dict[str, Any]
+        extracted_context: Dict[str, Any],
+        normalized: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Handle conversation phase with tool integration.
@@ -400,34 +574,83 @@ class AsyncConversationalMashupAgent:
             conversation: Current conversation data
             current_phase: Current conversation phase
             extracted_context: Extracted context from user message
+            normalized: Optional lowercased user message
             
         Returns:
             Response data with tool results and potential phase transition
         """
-        # Execute tools based on phase and context
-        tool_results = await self._execute_phase_tools(
-            session_id, current_phase, extracted_context
-        )
-        
-        # Get conversation history
-        messages = await self.db.get_messages(session_id, limit=10)
+        # Reuse a cached response for a repeated message, skipping tools and history
+        cached_response = self._lookup_cached_response(session_id, current_phase, user_message)
+        if cached_response is not None:
+            return await self._build_response_data(
+                session_id, user_message, current_phase, extracted_context,
+                {}, cached_response, normalized
+            )
         
-        # Prepare messages for AI model with tool results
-        ai_messages = await self._prepare_messages_for_ai_with_tools(
-            messages, current_phase, extracted_context, tool_results
+        tool_results, ai_messages = await self._prepare_turn(
+            session_id, user_message, current_phase, extracted_context
         )
         
         # Get AI response
         try:
             response = await self.model.ainvoke(ai_messages)
             ai_response = response.content
+            if self.response_cache is not None:
+                self.response_cache.store(session_id, PHASE_VALUES[current_phase], user_message, ai_response)
         except Exception as e:
             logger.error(f"Error getting AI response: {e}")
             ai_response = self._get_fallback_response(current_phase)
         
-        # Determine phase transition
+        return await self._build_response_data(
+            session_id, user_message, current_phase, extracted_context,
+            tool_results, ai_response, normalized
+        )
+    
+    def _lookup_cached_response(
+        self,
+        session_id: str,
+        current_phase: ConversationPhase,
+        user_message: str
+    ) -> Optional[str]:
+        """Return the cached response for this session's message, if caching is enabled."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.lookup(session_id, PHASE_VALUES[current_phase], user_message)
+    
+    async def _prepare_turn(
+        self,
+        session_id: str,
+        user_message: str,
+        current_phase: ConversationPhase,
+        extracted_context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[BaseMessage]]:
+        """Run phase tools and load history concurrently, then build the model input."""
+        # Execute tools based on phase and context while loading conversation history
+        tool_results, messages = await asyncio.gather(
+            self._execute_phase_tools(session_id, current_phase, extracted_context),
+            self.db.get_messages(session_id, limit=10)
+        )
+        
+        # Prepare messages for AI model with tool results
+        ai_messages = await self._prepare_messages_for_ai_with_tools(
+            messages, current_phase, extracted_context, tool_results, user_message
+        )
+        
+        return tool_results, ai_messages
+    
+    async def _build_response_data(
+        self,
+        session_id: str,
+        user_message: str,
+        current_phase: ConversationPhase,
+        extracted_context: Dict[str, Any],
+        tool_results: Dict[str, Any],
+        ai_response: str,
+        normalized: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Determine the phase transition and assemble the response data."""
         phase_transition = await self._determine_phase_transition(
-            current_phase, user_message, ai_response, extracted_context
+            current_phase, user_message, ai_response, extracted_context, normalized
         )
         
         return {
@@ -512,21 +735,19 @@ class AsyncConversationalMashupAgent:
         messages: List[Dict[str, Any]],
         current_phase: ConversationPhase,
         extracted_context: Dict[str, Any],
-        tool_results: Dict[str, Any]
-    ) -> List:
-        """Prepare messages for AI model with tool results."""
-        ai_messages = []
-        
-        # Add system message with tool context
-        system_prompt = self.system_prompts[current_phase]
-        
-        # Add tool results to system prompt if available
-        if tool_results and 'synthesized' in tool_results:
-            synthesized = tool_results['synthesized']
-            if synthesized.get('total_results', 0) > 0:
-                system_prompt += f"\n\nI have found {synthesized['total_results']} relevant sources that may help inform our conversation. Use this information to provide more accurate and educational responses."
+        tool_results: Dict[str, Any],
+        user_message: Optional[str] = None
+    ) -> List[BaseMessage]:
+        """
+        Prepare messages for AI model with tool results.
         
-        ai_messages.append(SystemMessage(content=system_prompt))
+        The static phase prompt and conversation history come first so the
+        prompt prefix stays byte-identical between turns and can be reused by
+        the model server's prefix cache. Tool context and the current user
+        message, which change every turn, are appended last.
+        """
+        # Stable prefix: cached phase system message
+        ai_messages = [self._system_message_cache[current_phase]]
         
         # Add conversation history
         for message in messages[-6:]:  # Last 6 messages for context
@@ -535,6 +756,17 @@ class AsyncConversationalMashupAgent:
             elif message['role'] == MessageRole.ASSISTANT:
                 ai_messages.append(AIMessage(content=message['content']))
         
+        # Volatile tail: tool results and the current user message
+        if tool_results and 'synthesized' in tool_results:
+            synthesized = tool_results['synthesized']
+            if synthesized.get('total_results', 0) > 0:
+                ai_messages.append(SystemMessage(
+                    content=TOOL_RESULTS_PROMPT_TEMPLATE.format(total_results=synthesized['total_results'])
+                ))
+        
+        if user_message:
+            ai_messages.append(HumanMessage(content=user_message))
+        
         return ai_messages
     
     async def _prepare_messages_for_ai(
@@ -542,13 +774,12 @@ class AsyncConversationalMashupAgent:
         messages: List[Dict[str, Any]],
         current_phase: ConversationPhase,
         extracted_context: Dict[str, Any]
-    ) -> List:
+    ) -> List[BaseMessage]:
         """Prepare messages for AI model."""
         ai_messages = []
         
         # Add system message
-        system_prompt = self.system_prompts[current_phase]
-        ai_messages.append(SystemMessage(content=system_prompt))
+        ai_messages.append(self._system_message_cache[current_phase])
         
         # Add conversation history
         for message in messages[-6:]:  # Last 6 messages for context
@@ -564,7 +795,8 @@ class AsyncConversationalMashupAgent:
         current_phase: ConversationPhase,
         user_message: str,
         ai_response: str,
-        extracted_context: Dict[str, Any]
+        extracted_context: Dict[str, Any],
+        normalized: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Determine if conversation should transition to next phase.
@@ -574,51 +806,20 @@ class AsyncConversationalMashupAgent:
             user_message: User's message
             ai_response: AI's response
             extracted_context: Extracted context
+            normalized: Optional lowercased user message, computed if omitted
             
         Returns:
             Dictionary with transition decision
         """
-        # Simple phase transition logic (can be enhanced with AI)
-        message_lower = user_message.lower()
-        
-        if current_phase == ConversationPhase.INITIAL:
-            # Transition to genre exploration if user shows interest in specific genres
-            if any(word in message_lower for word in ['genre', 'music', 'style', 'type', 'explore', 'jazz', 'rock', 'pop', 'classical', 'blues', 'country', 'electronic', 'folk', 'reggae', 'soul', 'r&b', 'metal', 'punk', 'funk', 'disco', 'latin', 'world', 'ambient', 'experimental']):
-                return {
-                    'should_transition': True,
-                    'new_phase': ConversationPhase.GENRE_EXPLORATION
-                }
+        # Table-driven phase transition logic (can be enhanced with AI)
+        if normalized is None:
+            normalized = user_message.lower()
         
-        elif current_phase == ConversationPhase.GENRE_EXPLORATION:
-            # Transition to educational clarification if genres are mentioned
-            if 'mentioned_genres' in extracted_context and extracted_context['mentioned_genres']:
+        for predicate, new_phase in PHASE_TRANSITION_RULES.get(current_phase, ()):
+            if predicate(normalized, extracted_context):
                 return {
                     'should_transition': True,
-                    'new_phase': ConversationPhase.EDUCATIONAL_CLARIFICATION
-                }
-        
-        elif current_phase == ConversationPhase.EDUCATIONAL_CLARIFICATION:
-            # Transition to cultural research if educational goals are clear
-            if 'theory_concepts' in extracted_context or 'has_educational_goals' in extracted_context:
-                return {
-                    'should_transition': True,
-                    'new_phase': ConversationPhase.CULTURAL_RESEARCH
-                }
-        
-        elif current_phase == ConversationPhase.CULTURAL_RESEARCH:
-            # Transition to ready for generation if cultural context is explored
-            if 'cultural_elements' in extracted_context or 'mentioned_genres' in extracted_context:
-                return {
-                    'should_transition': True,
-                    'new_phase': ConversationPhase.READY_FOR_GENERATION
-                }
-        
-        elif current_phase == ConversationPhase.READY_FOR_GENERATION:
-            # Stay in ready phase until user confirms
-            if 'ready_for_generation' in extracted_context:
-                return {
-                    'should_transition': False,
-                    'new_phase': current_phase
+                    'new_phase': new_phase
                 }
         
         return {
@@ -628,16 +829,9 @@ class AsyncConversationalMashupAgent:
     
     def _get_fallback_response(self, phase: ConversationPhase) -> str:
         """Get fallback response for a given phase."""
-        fallback_responses = {
-            ConversationPhase.INITIAL: "I'm here to help you create an educational music mashup! What kind of music are you interested in exploring?",
-            ConversationPhase.GENRE_EXPLORATION: "That's interesting! What other genres would you like to explore or combine?",
-            ConversationPhase.EDUCATIONAL_CLARIFICATION: "Great! What music theory concepts would you like to learn about?",
-            ConversationPhase.CULTURAL_RESEARCH: "Excellent! Let's explore the cultural context of these genres. What aspects interest you most?",
-            ConversationPhase.READY_FOR_GENERATION: "Perfect! Are you ready to create your educational music mashup?"
-        }
-        return fallback_responses.get(phase, "I'm here to help you with your music mashup project!")
+        return FALLBACK_RESPONSES.get(phase, DEFAULT_FALLBACK_RESPONSE)
     
-    async def close(self):
+    async def close(self) -> None:
         """Close the agent and cleanup resources."""
         if self.db:
             await self.db.close()
@@ -8,18 +8,26 @@ proper async/await patterns and error handling.
 
 import asyncio
 import logging
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
 
 from app.config import get_settings
+from app.utils import utc_now
 from app.db.enums import ConversationPhase, MessageRole, ToolCallType
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Applied once per connection; the connection is reused for every operation
+SQLITE_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456"
+)
+
 
 class AsyncConversationDB:
     """
@@ -59,6 +67,11 @@ class AsyncConversationDB:
             
             self._connection = await aiosqlite.connect(self.db_path)
             self._connection.row_factory = aiosqlite.Row
+            
+            # WAL lets readers proceed during writes; NORMAL sync is durable in WAL mode
+            for pragma in SQLITE_CONNECTION_PRAGMAS:
+                await self._connection.execute(pragma)
+            
             logger.info(f"Connected to database: {self.db_path}")
     
     async def close(self) -> None:
@@ -194,7 +207,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 metadata_json = self._dict_to_json(metadata) if metadata else None
                 
                 await self._connection.execute("""
@@ -261,7 +274,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 await self._connection.execute("""
                     UPDATE conversations 
                     SET phase = ?, updated_at = ?
@@ -297,7 +310,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 metadata_json = self._dict_to_json(metadata) if metadata else None
                 
                 await self._connection.execute("""
@@ -313,6 +326,49 @@ class AsyncConversationDB:
                 logger.error(f"Error adding message to conversation {conversation_id}: {e}")
                 return False
     
+    async def add_messages(
+        self, 
+        conversation_id: str, 
+        messages: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Add several messages to the conversation in a single transaction.
+        
+        Args:
+            conversation_id: Unique identifier for the conversation
+            messages: Message dictionaries with 'role' (MessageRole), 'content'
+                and optional 'metadata' keys, in conversation order
+            
+        Returns:
+            bool: True if all messages were added successfully
+        """
+        async with self._lock:
+            try:
+                now = utc_now()
+                rows = [
+                    (
+                        conversation_id,
+                        message['role'].value,
+                        message['content'],
+                        now,
+                        self._dict_to_json(message['metadata']) if message.get('metadata') else None
+                    )
+                    for message in messages
+                ]
+                
+                await self._connection.executemany("""
+                    INSERT INTO messages (conversation_id, role, content, timestamp, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+                
+                await self._connection.commit()
+                logger.debug(f"Added {len(rows)} messages to conversation {conversation_id}")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Error adding messages to conversation {conversation_id}: {e}")
+                return False
+    
     async def get_messages(
         self, 
         conversation_id: str, 
@@ -335,7 +391,7 @@ class AsyncConversationDB:
                 query = """
                     SELECT * FROM messages 
                     WHERE conversation_id = ?
-                    ORDER BY timestamp ASC
+                    ORDER BY timestamp ASC, message_id ASC
                 """
                 params = [conversation_id]
                 
@@ -387,7 +443,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 completed_at = now if status in ["completed", "failed"] else None
                 
                 cursor = await self._connection.execute("""
@@ -428,7 +484,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 completed_at = now if status in ["completed", "failed"] else None
                 
                 await self._connection.execute("""
@@ -468,7 +524,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 
                 await self._connection.execute("""
                     INSERT INTO web_sources 
@@ -507,7 +563,7 @@ class AsyncConversationDB:
         """
         async with self._lock:
             try:
-                now = datetime.now(timezone.utc)
+                now = utc_now()
                 metadata_json = self._dict_to_json(metadata) if metadata else None
                 
                 cursor = await self._connection.execute("""
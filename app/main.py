@@ -20,6 +20,7 @@ from app.config import get_settings
 from app.services import (
     AsyncWebSearchService, 
     get_web_search_service, 
+    get_shared_web_search_service,
     AsyncToolOrchestrator, 
     get_tool_orchestrator,
     AsyncEnhancedGenerationService,
@@ -41,6 +42,9 @@ logger = logging.getLogger(__name__)
 # Global database instance for lifespan management
 db_instance: Optional[AsyncConversationDB] = None
 
+# Substrings rejected in free-text request fields
+HARMFUL_CONTENT_PATTERNS = ('<script>', 'javascript:', 'data:text/html')
+
 # Rate limiting storage - reset for each test
 rate_limit_storage = defaultdict(list)
 
@@ -280,14 +284,15 @@ class ConversationCreateRequest(BaseModel):
 
     @validator('conversation_id')
     def validate_conversation_id(cls, v):
-        if not v.strip():
+        stripped = v.strip()
+        if not stripped:
             raise ValueError('Conversation ID cannot be empty')
         if len(v) > 100:
             raise ValueError('Conversation ID too long')
         # Check for valid characters
         if not v.replace('-', '').replace('_', '').isalnum():
             raise ValueError('Conversation ID can only contain alphanumeric characters, hyphens, and underscores')
-        return v.strip()
+        return stripped
 
     @validator('metadata')
     def validate_metadata(cls, v):
@@ -318,17 +323,17 @@ class MessageCreateRequest(BaseModel):
 
     @validator('content')
     def validate_content(cls, v):
-        if not v.strip():
+        stripped = v.strip()
+        if not stripped:
             raise ValueError('Message content cannot be empty')
         if len(v) > 10000:
             raise ValueError('Message content too long')
         # Check for potentially harmful content
-        harmful_patterns = ['<script>', 'javascript:', 'data:text/html']
         v_lower = v.lower()
-        for pattern in harmful_patterns:
+        for pattern in HARMFUL_CONTENT_PATTERNS:
             if pattern in v_lower:
                 raise ValueError('Message content contains potentially harmful content')
-        return v.strip()
+        return stripped
 
     @validator('metadata')
     def validate_metadata(cls, v):
@@ -368,11 +373,12 @@ class ToolCallCreateRequest(BaseModel):
 
     @validator('input_data')
     def validate_input_data(cls, v):
-        if not v.strip():
+        stripped = v.strip()
+        if not stripped:
             raise ValueError('Input data cannot be empty')
         if len(v) > 10000:
             raise ValueError('Input data too long')
-        return v.strip()
+        return stripped
 
     @validator('output_data')
     def validate_output_data(cls, v):
@@ -456,17 +462,17 @@ class MashupCreateRequest(BaseModel):
 
     @validator('title')
     def validate_title(cls, v):
-        if not v.strip():
+        stripped = v.strip()
+        if not stripped:
             raise ValueError('Title cannot be empty')
         if len(v) > 200:
             raise ValueError('Title too long')
         # Check for potentially harmful content
-        harmful_patterns = ['<script>', 'javascript:', 'data:text/html']
         v_lower = v.lower()
-        for pattern in harmful_patterns:
+        for pattern in HARMFUL_CONTENT_PATTERNS:
             if pattern in v_lower:
                 raise ValueError('Title contains potentially harmful content')
-        return v.strip()
+        return stripped
 
     @validator('description')
     def validate_description(cls, v):
@@ -528,17 +534,17 @@ class ChatRequest(BaseModel):
 
     @validator('message')
     def validate_message(cls, v):
-        if not v.strip():
+        stripped = v.strip()
+        if not stripped:
             raise ValueError('Message cannot be empty')
         if len(v) > 5000:
             raise ValueError('Message too long')
         # Check for potentially harmful content
-        harmful_patterns = ['<script>', 'javascript:', 'data:text/html']
         v_lower = v.lower()
-        for pattern in harmful_patterns:
+        for pattern in HARMFUL_CONTENT_PATTERNS:
             if pattern in v_lower:
                 raise ValueError('Message contains potentially harmful content')
-        return v.strip()
+        return stripped
 
     @validator('session_id')
     def validate_session_id(cls, v):
@@ -790,7 +796,7 @@ async def get_settings_dep():
 async def get_tool_orchestrator_dep():
     """Get tool orchestrator instance."""
     db = await get_db()
-    web_search = get_web_search_service()
+    web_search = get_shared_web_search_service()
     return await get_tool_orchestrator(web_search_service=web_search, db=db)
 
 async def get_conversation_agent():
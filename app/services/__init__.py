@@ -5,7 +5,7 @@ This module contains all service implementations including web search,
 content generation, tool orchestration, and other external service integrations.
 """
 
-from .web_search import AsyncWebSearchService, get_web_search_service
+from .web_search import AsyncWebSearchService, get_shared_web_search_service, get_web_search_service
 from .tool_orchestrator import AsyncToolOrchestrator, get_tool_orchestrator
 from .generation_service import (
     AsyncEnhancedGenerationService,
@@ -23,6 +23,7 @@ from .generation_service import (
 __all__ = [
     "AsyncWebSearchService",
     "get_web_search_service",
+    "get_shared_web_search_service",
     "AsyncToolOrchestrator",
     "get_tool_orchestrator",
     "AsyncEnhancedGenerationService",
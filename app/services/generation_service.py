@@ -24,6 +24,16 @@ from app.db import AsyncConversationDB, ConversationPhase, MessageRole
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Keyword lists used by ContentValidator, built once at import
+EDUCATIONAL_INDICATORS = (
+    "explain", "understand", "learn", "practice", "example",
+    "concept", "theory", "technique", "method", "approach"
+)
+INAPPROPRIATE_FOR_YOUNG = (
+    "explicit", "mature", "adult", "complex theory",
+    "advanced mathematics", "sophisticated analysis"
+)
+
 class ContentType(str, Enum):
     """Types of educational content that can be generated."""
     THEORY_LESSON = "theory_lesson"
@@ -353,13 +363,8 @@ class ContentValidator:
     def _assess_educational_value(self, content: str, skill_level: SkillLevel) -> float:
         """Assess educational value of content (0.0 to 1.0)."""
         # Simple heuristic-based scoring
-        educational_indicators = [
-            "explain", "understand", "learn", "practice", "example",
-            "concept", "theory", "technique", "method", "approach"
-        ]
-        
         content_lower = content.lower()
-        indicator_count = sum(1 for indicator in educational_indicators 
+        indicator_count = sum(1 for indicator in EDUCATIONAL_INDICATORS 
                             if indicator in content_lower)
         
         # Base score based on educational indicators
@@ -378,13 +383,8 @@ class ContentValidator:
         content_lower = content.lower()
         
         # Simple age-appropriateness check
-        inappropriate_for_young = [
-            "explicit", "mature", "adult", "complex theory",
-            "advanced mathematics", "sophisticated analysis"
-        ]
-        
         if skill_level == SkillLevel.BEGINNER:
-            return not any(term in content_lower for term in inappropriate_for_young)
+            return not any(term in content_lower for term in INAPPROPRIATE_FOR_YOUNG)
         
         return True
 
@@ -8,8 +8,9 @@ execution, error handling, and tool call tracking.
 
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple, Union
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal, ROUND_HALF_UP
@@ -21,6 +22,10 @@ from app.config import get_settings
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Query templates for topic searches; each takes the topic as its only field
+GENRE_QUERY_TEMPLATE = "{} music history cultural significance educational"
+CULTURAL_QUERY_TEMPLATE = "{} music culture history significance"
+
 
 class ToolExecutionStatus(str, Enum):
     """Status of tool execution."""
@@ -31,9 +36,9 @@ class ToolExecutionStatus(str, Enum):
     TIMEOUT = "timeout"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolCallResult:
-    """Result of a tool call operation."""
+    """Result of a tool call operation (immutable, slotted)."""
     tool_type: ToolCallType
     input_data: str
     output_data: Optional[str] = None
@@ -57,7 +62,10 @@ class AsyncToolOrchestrator:
         web_search_service: Optional[AsyncWebSearchService] = None,
         db: Optional[AsyncConversationDB] = None,
         max_concurrent_tools: int = 3,
-        tool_timeout: float = 30.0
+        tool_timeout: float = 30.0,
+        search_cache_ttl: float = 300.0,
+        clock: Callable[[], float] = time.perf_counter,
+        enable_pending_rows: bool = False
     ):
         """
         Initialize the tool orchestrator.
@@ -67,12 +75,28 @@ class AsyncToolOrchestrator:
             db: Database instance for tool call tracking
             max_concurrent_tools: Maximum number of concurrent tool executions
             tool_timeout: Timeout for tool execution in seconds
+            search_cache_ttl: Seconds a successful genre/cultural search is reused
+            clock: Monotonic clock in seconds used to time tool executions
+                and expire cached topic searches
+            enable_pending_rows: Write a running row before each tool call and
+                update it on completion, instead of a single row once it finishes
         """
         self.web_search_service = web_search_service
         self.db = db
         self.max_concurrent_tools = max_concurrent_tools
         self.tool_timeout = tool_timeout
-        self.semaphore = asyncio.Semaphore(max_concurrent_tools)
+        self.clock = clock
+        self.enable_pending_rows = enable_pending_rows
+        
+        # Running tool count, guarded by a condition so the limit can be resized
+        self._tool_slots = asyncio.Condition()
+        self._active_tools = 0
+        # Wakeups deferred from cancelled releases, referenced until they run
+        self._notify_tasks: Set[asyncio.Task] = set()
+        
+        # Successful topic searches keyed by (query, context), with clock timestamps
+        self.search_cache_ttl = search_cache_ttl
+        self._search_cache: Dict[Tuple, Tuple[float, ToolCallResult]] = {}
         
         # Settings for configuration
         self.settings = get_settings()
@@ -96,43 +120,34 @@ class AsyncToolOrchestrator:
         Returns:
             ToolCallResult with search results and metadata
         """
-        start_time = datetime.now(timezone.utc)
+        start_time = self.clock()
         tool_call_id = None
         
+        # Optionally record an in-flight row before the search starts
+        if self.enable_pending_rows and self.db and conversation_id:
+            tool_call_id = await self.db.add_tool_call(
+                conversation_id=conversation_id,
+                tool_type=ToolCallType.WEB_SEARCH,
+                input_data=query,
+                status="running"
+            )
+        
         try:
-            # Create tool call record if database is available
-            if self.db and conversation_id:
-                tool_call_id = await self.db.add_tool_call(
-                    conversation_id=conversation_id,
-                    tool_type=ToolCallType.WEB_SEARCH,
-                    input_data=query,
-                    status="running"
-                )
-            
             # Execute the search with timeout
-            async with self.semaphore:
+            async with self._tool_slot():
                 search_result = await asyncio.wait_for(
                     self._execute_search_with_error_handling(query, context),
                     timeout=self.tool_timeout
                 )
             
-            execution_time = (datetime.now(timezone.utc) - start_time).total_seconds()
+            execution_time = self.clock() - start_time
             
             # Check if the search result contains an error
             has_error = "error" in search_result and search_result["error"]
             status = ToolExecutionStatus.FAILED if has_error else ToolExecutionStatus.COMPLETED
             error_message = search_result.get("error") if has_error else None
             
-            # Update tool call record
-            if tool_call_id and self.db:
-                await self.db.update_tool_call(
-                    tool_call_id=tool_call_id,
-                    output_data=str(search_result),
-                    status=status.value,
-                    error_message=error_message
-                )
-            
-            return ToolCallResult(
+            result = ToolCallResult(
                 tool_type=ToolCallType.WEB_SEARCH,
                 input_data=query,
                 output_data=str(search_result),
@@ -146,14 +161,7 @@ class AsyncToolOrchestrator:
             error_msg = f"Web search timed out after {self.tool_timeout} seconds"
             logger.warning(error_msg)
             
-            if tool_call_id and self.db:
-                await self.db.update_tool_call(
-                    tool_call_id=tool_call_id,
-                    status="timeout",
-                    error_message=error_msg
-                )
-            
-            return ToolCallResult(
+            result = ToolCallResult(
                 tool_type=ToolCallType.WEB_SEARCH,
                 input_data=query,
                 status=ToolExecutionStatus.TIMEOUT,
@@ -164,66 +172,240 @@ class AsyncToolOrchestrator:
             error_msg = f"Web search failed: {str(e)}"
             logger.error(error_msg)
             
-            if tool_call_id and self.db:
-                await self.db.update_tool_call(
-                    tool_call_id=tool_call_id,
-                    status="failed",
-                    error_message=error_msg
-                )
-            
-            return ToolCallResult(
+            result = ToolCallResult(
                 tool_type=ToolCallType.WEB_SEARCH,
                 input_data=query,
                 status=ToolExecutionStatus.FAILED,
                 error_message=error_msg
             )
+        
+        await self._record_tool_call(result, conversation_id, tool_call_id)
+        return result
     
-    async def execute_concurrent_searches(
+    async def _record_tool_call(
+        self,
+        result: ToolCallResult,
+        conversation_id: Optional[str],
+        tool_call_id: Optional[int]
+    ) -> None:
+        """
+        Persist the final state of a tool call.
+        
+        Without a pending row the call is written once, already finished;
+        otherwise the pending row is updated in place.
+        
+        Args:
+            result: Finished tool call result
+            conversation_id: Optional conversation ID for tracking
+            tool_call_id: ID of the pending row, if one was written
+        """
+        if not self.db or not conversation_id:
+            return
+        
+        if tool_call_id:
+            await self.db.update_tool_call(
+                tool_call_id=tool_call_id,
+                output_data=result.output_data,
+                status=result.status.value,
+                error_message=result.error_message
+            )
+        elif not self.enable_pending_rows:
+            await self._add_tool_call_row(result, conversation_id)
+    
+    async def _add_tool_call_row(self, result: ToolCallResult, conversation_id: str) -> None:
+        """Write a finished tool call as a single row."""
+        await self.db.add_tool_call(
+            conversation_id=conversation_id,
+            tool_type=result.tool_type,
+            input_data=result.input_data,
+            output_data=result.output_data,
+            status=result.status.value,
+            error_message=result.error_message
+        )
+    
+    @asynccontextmanager
+    async def _tool_slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``max_concurrent_tools`` slots for the duration of the block."""
+        async with self._tool_slots:
+            try:
+                await self._tool_slots.wait_for(
+                    lambda: self._active_tools < self.max_concurrent_tools
+                )
+            except asyncio.CancelledError:
+                # A waiter cancelled after being notified would swallow the wakeup; pass it on
+                self._tool_slots.notify(1)
+                raise
+            self._active_tools += 1
+        
+        try:
+            yield
+        finally:
+            # Free the slot before waiting on the lock, so a cancelled release cannot leak it
+            self._active_tools -= 1
+            try:
+                await self._notify_slot_waiters()
+            except asyncio.CancelledError:
+                # Cancelled while waiting for the lock; wake the waiters from a fresh task
+                task = asyncio.create_task(self._notify_slot_waiters())
+                self._notify_tasks.add(task)
+                task.add_done_callback(self._notify_tasks.discard)
+                raise
+    
+    async def _notify_slot_waiters(self) -> None:
+        """Wake every slot waiter to re-check the limit after a slot is freed."""
+        async with self._tool_slots:
+            self._tool_slots.notify_all()
+    
+    async def set_max_concurrent_tools(self, max_concurrent_tools: int) -> None:
+        """
+        Resize the tool concurrency limit.
+        
+        Searches already running keep their slots; when the limit grows,
+        waiting searches are woken to claim the new ones.
+        
+        Args:
+            max_concurrent_tools: New maximum number of concurrent tool executions
+        """
+        async with self._tool_slots:
+            grew = max_concurrent_tools > self.max_concurrent_tools
+            self.max_concurrent_tools = max_concurrent_tools
+            if grew:
+                self._tool_slots.notify_all()
+        
+        logger.info(f"Resized AsyncToolOrchestrator to {max_concurrent_tools} max concurrent tools")
+    
+    async def stream_concurrent_searches(
         self,
-        queries: List[str],
+        queries: Iterable[str],
         context: Dict[str, Any],
         conversation_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[int, ToolCallResult]]:
+        """
+        Execute web searches through a worker pool, yielding as they finish.
+        
+        Queries are fed into a queue consumed by one worker per query, so a slow
+        query never holds back results that are already done. How many searches
+        run at once is bounded by the tool slots rather than the pool size, so
+        ``set_max_concurrent_tools`` also applies to a batch already in flight.
+        
+        Args:
+            queries: Iterable of search queries
+            context: Context information for the searches
+            conversation_id: Optional conversation ID for tracking
+            
+        Yields:
+            Tuples of (query index, ToolCallResult) in completion order
+        """
+        queries = list(queries)
+        worker_count = max(1, len(queries))
+        input_queue: asyncio.Queue = asyncio.Queue()
+        output_queue: asyncio.Queue = asyncio.Queue()
+        
+        async def produce() -> None:
+            try:
+                for item in enumerate(queries):
+                    await input_queue.put(item)
+            finally:
+                # One sentinel per worker so every worker shuts down
+                for _ in range(worker_count):
+                    await input_queue.put(None)
+        
+        async def work() -> None:
+            try:
+                while True:
+                    item = await input_queue.get()
+                    if item is None:
+                        return
+                    index, query = item
+                    try:
+                        result = await self.execute_web_search(query, context, conversation_id)
+                    except asyncio.CancelledError:
+                        # Only the worker's own cancellation stops it; a search that
+                        # was cancelled underneath it is reported as failed
+                        if asyncio.current_task().cancelling():
+                            raise
+                        logger.error(f"Search {index} was cancelled")
+                        result = ToolCallResult(
+                            tool_type=ToolCallType.WEB_SEARCH,
+                            input_data=query,
+                            status=ToolExecutionStatus.FAILED,
+                            error_message="Search cancelled"
+                        )
+                    except Exception as e:
+                        logger.error(f"Search {index} failed with exception: {e}")
+                        result = ToolCallResult(
+                            tool_type=ToolCallType.WEB_SEARCH,
+                            input_data=query,
+                            status=ToolExecutionStatus.FAILED,
+                            error_message=str(e)
+                        )
+                    await output_queue.put((index, result))
+            finally:
+                # Always post the sentinel, so the consumer never waits on a dead worker
+                output_queue.put_nowait(None)
+        
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(worker_count))
+        
+        finished_workers = 0
+        try:
+            while finished_workers < worker_count:
+                item = await output_queue.get()
+                if item is None:
+                    finished_workers += 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def execute_concurrent_searches(
+        self,
+        queries: Iterable[str],
+        context: Dict[str, Any],
+        conversation_id: Optional[str] = None,
+        fail_fast: bool = False
     ) -> List[ToolCallResult]:
         """
         Execute multiple web searches concurrently.
         
         Args:
-            queries: List of search queries
+            queries: Iterable of search queries
             context: Context information for the searches
             conversation_id: Optional conversation ID for tracking
+            fail_fast: Cancel the remaining searches as soon as one does not
+                complete, freeing their tool slots; cancelled queries are
+                reported as failed
             
         Returns:
-            List of ToolCallResult objects
+            List of ToolCallResult objects in query order
         """
+        queries = list(queries)
         if not queries:
             return []
         
         logger.info(f"Executing {len(queries)} concurrent web searches")
         
-        # Create tasks for all searches
-        tasks = [
-            self.execute_web_search(query, context, conversation_id)
-            for query in queries
-        ]
-        
-        # Execute all searches concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results and handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Search {i} failed with exception: {result}")
-                processed_results.append(ToolCallResult(
+        results: List[Optional[ToolCallResult]] = [None] * len(queries)
+        async with aclosing(self.stream_concurrent_searches(queries, context, conversation_id)) as stream:
+            async for index, result in stream:
+                results[index] = result
+                if fail_fast and result.status is not ToolExecutionStatus.COMPLETED:
+                    logger.warning(f"Search {index} did not complete; cancelling remaining searches")
+                    break
+        
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = ToolCallResult(
                     tool_type=ToolCallType.WEB_SEARCH,
-                    input_data=queries[i],
+                    input_data=queries[index],
                     status=ToolExecutionStatus.FAILED,
-                    error_message=str(result)
-                ))
-            else:
-                processed_results.append(result)
+                    error_message="Cancelled after an earlier search failed"
+                )
         
-        return processed_results
+        return results
     
     async def execute_genre_exploration_searches(
         self,
@@ -242,21 +424,12 @@ class AsyncToolOrchestrator:
         Returns:
             Dictionary mapping genres to their search results
         """
-        # Create enhanced queries for each genre
-        queries = []
-        for genre in genres:
-            enhanced_query = f"{genre} music history cultural significance educational"
-            queries.append(enhanced_query)
-        
-        # Execute concurrent searches
-        results = await self.execute_concurrent_searches(queries, context, conversation_id)
-        
-        # Map results back to genres
-        genre_results = {}
-        for i, result in enumerate(results):
-            genre_results[genres[i]] = result
-        
-        return genre_results
+        return await self._execute_cached_topic_searches(
+            genres,
+            GENRE_QUERY_TEMPLATE,
+            context,
+            conversation_id
+        )
     
     async def execute_cultural_research_searches(
         self,
@@ -275,21 +448,80 @@ class AsyncToolOrchestrator:
         Returns:
             Dictionary mapping cultural elements to their search results
         """
-        # Create enhanced queries for each cultural element
-        queries = []
-        for element in cultural_elements:
-            enhanced_query = f"{element} music culture history significance"
-            queries.append(enhanced_query)
+        return await self._execute_cached_topic_searches(
+            cultural_elements,
+            CULTURAL_QUERY_TEMPLATE,
+            context,
+            conversation_id
+        )
+    
+    @staticmethod
+    def _search_cache_key(query: str, context: Dict[str, Any]) -> Tuple:
+        """Build a cache key from the query and the context fields that shape the search."""
+        return (
+            query,
+            context.get("skill_level"),
+            tuple(context.get("cultural_elements") or ()),
+            tuple(context.get("genres") or ())
+        )
+    
+    async def _execute_cached_topic_searches(
+        self,
+        topics: List[str],
+        query_template: str,
+        context: Dict[str, Any],
+        conversation_id: Optional[str] = None
+    ) -> Dict[str, ToolCallResult]:
+        """
+        Execute one search per topic, reusing recent successful results.
+        
+        Duplicate topics are searched once, and topics searched successfully
+        within ``search_cache_ttl`` seconds are served from the cache. A cache
+        hit is still recorded as a completed tool call for the conversation.
+        
+        Args:
+            topics: Topics (genres or cultural elements) to search for
+            query_template: Format string turning a topic into a query
+            context: Context information for the searches
+            conversation_id: Optional conversation ID for tracking
+            
+        Returns:
+            Dictionary mapping topics to their search results
+        """
+        now = self.clock()
+        topic_results: Dict[str, ToolCallResult] = {}
+        pending: List[Tuple[str, Tuple]] = []
         
-        # Execute concurrent searches
-        results = await self.execute_concurrent_searches(queries, context, conversation_id)
+        for topic in dict.fromkeys(topics):
+            key = self._search_cache_key(query_template.format(topic), context)
+            cached = self._search_cache.get(key)
+            if cached and now - cached[0] < self.search_cache_ttl:
+                topic_results[topic] = cached[1]
+            else:
+                pending.append((topic, key))
         
-        # Map results back to cultural elements
-        element_results = {}
-        for i, result in enumerate(results):
-            element_results[cultural_elements[i]] = result
+        # Hits run no search, so record them here to keep the conversation's tool calls complete
+        if self.db and conversation_id and topic_results:
+            await asyncio.gather(*(
+                self._add_tool_call_row(result, conversation_id) for result in topic_results.values()
+            ))
         
-        return element_results
+        if pending:
+            results = await self.execute_concurrent_searches(
+                [key[0] for _, key in pending], context, conversation_id
+            )
+            
+            stored_at = self.clock()
+            self._search_cache = {
+                key: entry for key, entry in self._search_cache.items()
+                if stored_at - entry[0] < self.search_cache_ttl
+            }
+            for (topic, key), result in zip(pending, results, strict=True):
+                topic_results[topic] = result
+                if result.status is ToolExecutionStatus.COMPLETED:
+                    self._search_cache[key] = (stored_at, result)
+        
+        return topic_results
     
     async def _execute_search_with_error_handling(
         self,
@@ -339,32 +571,33 @@ class AsyncToolOrchestrator:
         Returns:
             Processed and synthesized results
         """
-        successful_results = [r for r in results if r.status == ToolExecutionStatus.COMPLETED]
-        failed_results = [r for r in results if r.status != ToolExecutionStatus.COMPLETED]
-        
-        # Extract and combine successful search results
-        combined_results = []
-        for result in successful_results:
-            if result.metadata and isinstance(result.metadata, dict):
-                search_data = result.metadata
-                if "results" in search_data:
-                    combined_results.extend(search_data["results"])
-        
-        # Remove duplicates based on URL
+        successful_searches = 0
+        errors = []
         unique_results = []
         seen_urls = set()
-        for result in combined_results:
-            if isinstance(result, dict) and "url" in result:
-                if result["url"] not in seen_urls:
-                    unique_results.append(result)
-                    seen_urls.add(result["url"])
+        
+        # Single pass: count outcomes and merge successful results, deduplicated by URL
+        for result in results:
+            if result.status is not ToolExecutionStatus.COMPLETED:
+                if result.error_message:
+                    errors.append(result.error_message)
+                continue
+            
+            successful_searches += 1
+            if not isinstance(result.metadata, dict):
+                continue
+            
+            for item in result.metadata.get("results", ()):
+                if isinstance(item, dict) and "url" in item and item["url"] not in seen_urls:
+                    seen_urls.add(item["url"])
+                    unique_results.append(item)
         
         return {
-            "successful_searches": len(successful_results),
-            "failed_searches": len(failed_results),
+            "successful_searches": successful_searches,
+            "failed_searches": len(results) - successful_searches,
             "total_results": len(unique_results),
             "results": unique_results,
-            "errors": [r.error_message for r in failed_results if r.error_message]
+            "errors": errors
         }
     
     async def get_tool_statistics(
@@ -417,6 +650,11 @@ class AsyncToolOrchestrator:
         return self.web_search_service.is_service_available()
 
 
+# Orchestrators keyed by the identity of their services. Each cached
+# orchestrator holds references to its services, so the ids stay unique.
+_orchestrator_cache: Dict[Tuple[int, int], AsyncToolOrchestrator] = {}
+
+
 async def get_tool_orchestrator(
     web_search_service: Optional[AsyncWebSearchService] = None,
     db: Optional[AsyncConversationDB] = None
@@ -424,6 +662,9 @@ async def get_tool_orchestrator(
     """
     Get a configured tool orchestrator instance.
     
+    Repeated calls with the same services return the same orchestrator
+    instead of constructing a new one per request.
+    
     Args:
         web_search_service: Optional web search service instance
         db: Optional database instance
@@ -431,7 +672,16 @@ async def get_tool_orchestrator(
     Returns:
         Configured AsyncToolOrchestrator instance
     """
-    return AsyncToolOrchestrator(
-        web_search_service=web_search_service,
-        db=db
-    ) 
\ No newline at end of file
+    key = (id(web_search_service), id(db))
+    orchestrator = _orchestrator_cache.get(key)
+    if orchestrator is None:
+        orchestrator = _orchestrator_cache[key] = AsyncToolOrchestrator(
+            web_search_service=web_search_service,
+            db=db
+        )
+    return orchestrator
+
+
+def reset_tool_orchestrator_cache() -> None:
+    """Drop all cached orchestrators so the next call builds a fresh one."""
+    _orchestrator_cache.clear() 
\ No newline at end of file
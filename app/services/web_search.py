@@ -8,7 +8,7 @@ query enhancement for the Lit Music Mashup platform.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 from datetime import datetime, timezone
 import re
 from urllib.parse import urlparse
@@ -47,6 +47,7 @@ class AsyncWebSearchService:
         self.settings = get_settings()
         self.api_key = api_key or self.settings.TAVILY_API_KEY
         self.client = None
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.is_available = False
         
         # Initialize Tavily client if available
@@ -171,6 +172,9 @@ class AsyncWebSearchService:
         """
         Perform the actual web search.
         
+        Concurrent searches for the same query share a single request: later
+        callers await the in-flight future instead of issuing their own call.
+        
         Args:
             query: Search query
             
@@ -180,6 +184,16 @@ class AsyncWebSearchService:
         if not self.client:
             raise Exception("Tavily client not available")
         
+        inflight = self._inflight.get(query)
+        if inflight is not None:
+            logger.debug(f"Joining in-flight web search for: {query}")
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved so an unshared error is not logged at GC
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[query] = future
+        
         try:
             # Perform search with timeout
             search_task = asyncio.create_task(
@@ -191,14 +205,25 @@ class AsyncWebSearchService:
                 timeout=self.settings.WEB_SEARCH_TIMEOUT_SECONDS
             )
             
+            future.set_result(results)
             return results
             
         except asyncio.TimeoutError:
             logger.warning(f"Web search timed out after {self.settings.WEB_SEARCH_TIMEOUT_SECONDS} seconds")
-            raise Exception("Search timeout")
+            error = Exception("Search timeout")
+            future.set_exception(error)
+            raise error
         except Exception as e:
             logger.error(f"Search error: {e}")
+            future.set_exception(e)
             raise
+        finally:
+            self._inflight.pop(query, None)
+            if not future.done():
+                # The owner was cancelled; fail joiners with an ordinary error so
+                # their Exception handlers still run, while the owner's own
+                # cancellation propagates
+                future.set_exception(Exception("Search cancelled"))
     
     async def _search_with_timeout(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -225,14 +250,14 @@ class AsyncWebSearchService:
     
     async def _filter_and_validate_results(
         self, 
-        results: List[Dict[str, Any]], 
+        results: Sequence[Mapping[str, Any]], 
         context: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """
         Filter and validate search results for educational content.
         
         Args:
-            results: Raw search results
+            results: Raw search results, which are copied and never mutated
             context: Context information
             
         Returns:
@@ -484,6 +509,29 @@ class AsyncWebSearchService:
         }
 
 
+# Process-wide services keyed by API key, shared by every agent
+_shared_services: Dict[Optional[str], AsyncWebSearchService] = {}
+
+
+def get_shared_web_search_service(api_key: Optional[str] = None) -> AsyncWebSearchService:
+    """
+    Get the process-wide web search service for an API key.
+    
+    The Tavily client and its connection pool are created once per key
+    and reused by every caller, instead of once per agent.
+    
+    Args:
+        api_key: Optional Tavily API key (None uses the configured key)
+        
+    Returns:
+        Shared AsyncWebSearchService instance
+    """
+    service = _shared_services.get(api_key)
+    if service is None:
+        service = _shared_services[api_key] = AsyncWebSearchService(api_key)
+    return service
+
+
 # Factory function for dependency injection
 async def get_web_search_service() -> AsyncWebSearchService:
     """Get web search service instance for dependency injection."""
@@ -0,0 +1,17 @@
+"""
+Utility module for the Lit Music Mashup AI platform.
+
+This module contains small, dependency-free helpers shared across services
+and agents.
+"""
+
+from .clock import utc_now, utc_now_iso
+from .keyword_matcher import KeywordMatcher
+from .response_cache import SemanticResponseCache
+
+__all__ = [
+    "utc_now",
+    "utc_now_iso",
+    "KeywordMatcher",
+    "SemanticResponseCache"
+]
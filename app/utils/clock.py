@@ -0,0 +1,28 @@
+"""
+Clock utilities for the Lit Music Mashup platform.
+
+This module provides the UTC clock used to stamp records, so every row
+and response timestamp is built the same way.
+"""
+
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """
+    Get the current UTC time.
+    
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    return datetime.now(timezone.utc)
+
+
+def utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string.
+    
+    Returns:
+        ISO formatted UTC timestamp
+    """
+    return utc_now().isoformat()
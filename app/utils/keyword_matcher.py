@@ -0,0 +1,96 @@
+"""
+Multi-keyword matching utilities for the Lit Music Mashup platform.
+
+This module provides the KeywordMatcher class, which finds every keyword
+from several named categories in a single scan of the input text.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern
+
+
+class KeywordMatcher:
+    """
+    Substring keyword matcher that scans text once for all categories.
+    
+    All keywords are compiled into one regular expression inside a
+    lookahead, so a single pass reports the longest keyword starting at
+    each position. Shorter keywords that are prefixes of that match are
+    added from a precomputed table, which yields exactly the same hits as
+    testing ``keyword in text`` for every keyword individually.
+    
+    Scan results are memoized per text, so repeated lookups of the same
+    message (extraction and phase transition in one turn) scan it once.
+    """
+    
+    def __init__(self, categories: Dict[str, Iterable[str]], cache_size: int = 128):
+        """
+        Initialize the matcher.
+        
+        Args:
+            categories: Mapping of category name to its keywords. Keywords
+                may appear in more than one category.
+            cache_size: Number of recently scanned texts to memoize
+        """
+        self.categories: Dict[str, tuple] = {
+            name: tuple(dict.fromkeys(keywords))
+            for name, keywords in categories.items()
+        }
+        
+        keywords = {keyword for group in self.categories.values() for keyword in group}
+        
+        # Every keyword maps to the keywords that are prefixes of it (itself included)
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in keywords if keyword.startswith(other))
+            for keyword in keywords
+        }
+        
+        self._pattern: Optional[Pattern[str]] = None
+        if keywords:
+            # Longest first so each position reports its longest keyword
+            alternatives = sorted(keywords, key=len, reverse=True)
+            self._pattern = re.compile(
+                "(?=(" + "|".join(re.escape(keyword) for keyword in alternatives) + "))"
+            )
+        
+        self._find_cached = lru_cache(maxsize=cache_size)(self._scan)
+    
+    def find(self, text: str) -> FrozenSet[str]:
+        """
+        Find all keywords occurring in the text.
+        
+        Args:
+            text: Text to scan (already normalized by the caller)
+        
+        Returns:
+            Set of keywords found anywhere in the text
+        """
+        return self._find_cached(text)
+    
+    def _scan(self, text: str) -> FrozenSet[str]:
+        """Scan the text once with the compiled pattern."""
+        if self._pattern is None:
+            return frozenset()
+        
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._prefixes[match.group(1)]
+        return frozenset(found)
+    
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """
+        Group the keywords found in the text by category.
+        
+        Args:
+            text: Text to scan (already normalized by the caller)
+        
+        Returns:
+            Mapping of category name to matched keywords, in the order the
+            keywords were declared
+        """
+        found = self.find(text)
+        return {
+            name: [keyword for keyword in keywords if keyword in found]
+            for name, keywords in self.categories.items()
+        }
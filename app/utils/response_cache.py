@@ -0,0 +1,139 @@
+"""
+Response caching utilities for the Lit Music Mashup platform.
+
+This module provides the SemanticResponseCache class, which lets the
+conversation agent reuse model responses for repeated or near-identical
+user messages within the same session and conversation phase.
+"""
+
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+class SemanticResponseCache:
+    """
+    In-memory cache of model responses keyed by session, phase and user message.
+    
+    Exact hits are looked up by a hash of the session, the phase and the
+    normalized message. Responses depend on the session's history, so
+    entries are never shared between sessions. When an embedding function
+    is supplied, misses fall back to the most similar cached message in the
+    same session and phase, accepted only if its cosine similarity reaches
+    the threshold. Without an embedding function the cache is purely
+    exact-match.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        similarity_threshold: float = 0.95,
+        embed: Optional[Callable[[str], Sequence[float]]] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses before the
+                least recently used entry is evicted
+            similarity_threshold: Minimum cosine similarity for a fuzzy hit
+            embed: Optional function mapping a normalized message to an
+                embedding vector
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._embeddings: "OrderedDict[str, Tuple[Tuple[str, str], List[float], float]]" = OrderedDict()
+    
+    @staticmethod
+    def _normalize(message: str) -> str:
+        """Lowercase the message and collapse whitespace."""
+        return " ".join(message.lower().split())
+    
+    @staticmethod
+    def _key(session_id: str, phase: str, normalized_message: str) -> str:
+        """Build the exact-match key for a session, phase and normalized message."""
+        return hashlib.sha256(
+            f"{session_id}\x00{phase}\x00{normalized_message}".encode("utf-8")
+        ).hexdigest()
+    
+    def lookup(self, session_id: str, phase: str, message: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            session_id: Session the message was sent in
+            phase: Conversation phase the message was sent in
+            message: User message
+        
+        Returns:
+            Cached response, or None on a miss
+        """
+        normalized = self._normalize(message)
+        key = self._key(session_id, phase, normalized)
+        
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+            return response
+        
+        if self.embed is None or not self._embeddings:
+            return None
+        
+        vector = [float(value) for value in self.embed(normalized)]
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0.0:
+            return None
+        
+        scope = (session_id, phase)
+        best_key = None
+        best_score = self.similarity_threshold
+        for cached_key, (cached_scope, cached_vector, cached_norm) in self._embeddings.items():
+            if cached_scope != scope or len(cached_vector) != len(vector):
+                continue
+            score = sum(a * b for a, b in zip(vector, cached_vector, strict=True)) / (norm * cached_norm)
+            if score >= best_score:
+                best_key, best_score = cached_key, score
+        
+        if best_key is None:
+            return None
+        
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key]
+    
+    def store(self, session_id: str, phase: str, message: str, response: str) -> None:
+        """
+        Cache a response.
+        
+        Args:
+            session_id: Session the message was sent in
+            phase: Conversation phase the message was sent in
+            message: User message
+            response: Model response to reuse
+        """
+        normalized = self._normalize(message)
+        key = self._key(session_id, phase, normalized)
+        
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        
+        if self.embed is not None and key not in self._embeddings:
+            vector = [float(value) for value in self.embed(normalized)]
+            norm = math.sqrt(sum(value * value for value in vector))
+            if norm > 0.0:
+                self._embeddings[key] = ((session_id, phase), vector, norm)
+        
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._embeddings.pop(evicted_key, None)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._embeddings.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
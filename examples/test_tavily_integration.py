@@ -23,6 +23,8 @@ This example demonstrates:
 import asyncio
 import sys
 import os
+import time
+import traceback
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
@@ -112,17 +114,18 @@ async def test_web_search_service():
         print(f"   Service Available: {result['service_available']}")
         print(f"   Total Results: {result['total_results']}")
         
-        # Display search results
+        # Display search results as a single summary table
         if result['results']:
-            print(f"\n📋 Search Results:")
-            for i, res in enumerate(result['results'][:2], 1):  # Show first 2 results
-                print(f"\n   Result {i}:")
-                print(f"   📰 Title: {res['title'][:80]}...")
-                print(f"   🔗 URL: {res['url']}")
-                print(f"   📊 Quality Score: {res.get('quality_score', 'N/A')}")
-                print(f"   🎯 Context Alignment: {res.get('context_alignment', 'N/A')}")
-                if res.get('content'):
-                    print(f"   📝 Content: {res['content'][:100]}...")
+            rows = [
+                (i, res['title'], res.get('educational_relevance_score', 0.0), res.get('context_alignment', 0.0), res['url'])
+                for i, res in enumerate(result['results'], 1)
+            ]
+            table = [f"\n📋 Search Results:", f"   {'#':>3} {'Title':<60} {'Quality':>7} {'Align':>5}  URL"]
+            table.extend(
+                f"   {i:>3} {title[:60]:<60} {quality:>7.2f} {alignment:>5.2f}  {url}"
+                for i, title, quality, alignment, url in rows
+            )
+            print("\n".join(table))
         
         return True
         
@@ -131,7 +134,7 @@ async def test_web_search_service():
         return False
 
 
-async def test_tool_orchestrator():
+async def test_tool_orchestrator(run_ts: str):
     """Test 3: Tool Orchestrator Integration"""
     print("\n🛠️  Test 3: Tool Orchestrator Integration")
     print("=" * 60)
@@ -151,7 +154,7 @@ async def test_tool_orchestrator():
         context = {
             "skill_level": "beginner",
             "educational_goals": ["music_theory_basics"],
-            "session_id": f"test-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            "session_id": f"test-{run_ts}"
         }
         
         # Execute multiple searches concurrently
@@ -161,11 +164,16 @@ async def test_tool_orchestrator():
             "classical music elements for students"
         ]
         
-        results = await tool_orchestrator.execute_concurrent_searches(
+        # Stream each result as soon as its search finishes
+        results = []
+        async for index, result in tool_orchestrator.stream_concurrent_searches(
             queries=search_queries,
             context=context,
             conversation_id=context["session_id"]
-        )
+        ):
+            results.append(result)
+            status = "✅ Success" if result.status == "completed" else f"❌ Failed: {result.error_message or 'Unknown error'}"
+            print(f"   Query {index+1}: {status}")
         
         print(f"✅ Concurrent searches completed!")
         print(f"   Queries Executed: {len(search_queries)}")
@@ -175,13 +183,6 @@ async def test_tool_orchestrator():
         successful_searches = sum(1 for r in results if r.status == "completed")
         print(f"   Successful Searches: {successful_searches}/{len(results)}")
         
-        for i, result in enumerate(results):
-            if hasattr(result, 'status'):
-                status = "✅ Success" if result.status == "completed" else f"❌ Failed: {result.error_message or 'Unknown error'}"
-            else:
-                status = "❓ Unknown status"
-            print(f"   Query {i+1}: {status}")
-        
         # Test tool statistics
         stats = await tool_orchestrator.get_tool_statistics(context["session_id"])
         print(f"\n📊 Tool Statistics:")
@@ -199,7 +200,7 @@ async def test_tool_orchestrator():
         return False
 
 
-async def test_conversational_agent_with_tools():
+async def test_conversational_agent_with_tools(run_ts: str):
     """Test 4: Conversational AI Agent with Tavily Integration"""
     print("\n🤖 Test 4: Conversational AI Agent with Tavily Integration")
     print("=" * 60)
@@ -214,7 +215,7 @@ async def test_conversational_agent_with_tools():
             enable_tools=True
         )
         
-        session_id = f"tavily-test-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        session_id = f"tavily-test-{run_ts}"
         
         print(f"🎭 Starting conversation with session: {session_id}")
         print(f"🔍 Web search tools: {'✅ Enabled' if agent.enable_tools else '❌ Disabled'}")
@@ -246,13 +247,14 @@ async def test_conversational_agent_with_tools():
         
         # Display tool results if any
         if response.get('tool_results'):
-            print(f"\n🛠️  Tool Execution Results:")
-            for tool_name, tool_result in response['tool_results'].items():
-                if isinstance(tool_result, dict) and 'results' in tool_result:
-                    result_count = len(tool_result['results'])
-                    print(f"   {tool_name}: {result_count} results found")
-                else:
-                    print(f"   {tool_name}: executed")
+            table = [f"\n🛠️  Tool Execution Results:"]
+            table.extend(
+                f"   {tool_name}: {len(tool_result['results'])} results found"
+                if isinstance(tool_result, dict) and 'results' in tool_result
+                else f"   {tool_name}: executed"
+                for tool_name, tool_result in response['tool_results'].items()
+            )
+            print("\n".join(table))
         else:
             print(f"\n🛠️  Tool Execution Results: None")
         
@@ -264,12 +266,14 @@ async def test_conversational_agent_with_tools():
         # Display extracted context
         context = response.get('context', {})
         if context:
-            print(f"\n🧠 Extracted Context:")
-            for key, value in context.items():
-                if isinstance(value, (list, dict)):
-                    print(f"   {key}: {len(value) if isinstance(value, list) else len(str(value))} items")
-                else:
-                    print(f"   {key}: {value}")
+            table = [f"\n🧠 Extracted Context:"]
+            table.extend(
+                f"   {key}: {len(value) if isinstance(value, list) else len(str(value))} items"
+                if isinstance(value, (list, dict))
+                else f"   {key}: {value}"
+                for key, value in context.items()
+            )
+            print("\n".join(table))
         else:
             print(f"\n🧠 Extracted Context: None")
         
@@ -282,7 +286,6 @@ async def test_conversational_agent_with_tools():
         
     except Exception as e:
         print(f"❌ Conversational agent test failed: {e}")
-        import traceback
         print(f"   Error details: {traceback.format_exc()}")
         return False
 
@@ -291,7 +294,11 @@ async def run_comprehensive_test():
     """Run all Tavily integration tests"""
     print("🧪 Lit Music Mashup AI - Tavily Integration Test Suite")
     print("=" * 70)
-    print(f"⏰ Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    # One timestamp per run so every session ID shares the same suffix
+    started_at = datetime.now()
+    run_ts = started_at.strftime('%Y%m%d-%H%M%S')
+    run_start = time.monotonic()
+    print(f"⏰ Test started at: {started_at.strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
     test_results = []
@@ -309,12 +316,12 @@ async def run_comprehensive_test():
     test_results.append(("Web Search Service", web_search_success))
     
     # Test 3: Tool Orchestrator
-    orchestrator_success = await test_tool_orchestrator()
+    orchestrator_success = await test_tool_orchestrator(run_ts)
     test_results.append(("Tool Orchestrator", orchestrator_success))
     
     # Test 4: Conversational Agent (only if previous tests passed)
     if web_search_success and orchestrator_success:
-        agent_success = await test_conversational_agent_with_tools()
+        agent_success = await test_conversational_agent_with_tools(run_ts)
         test_results.append(("Conversational Agent", agent_success))
     else:
         print("\n⚠️  Skipping conversational agent test due to previous failures.")
@@ -344,7 +351,7 @@ async def run_comprehensive_test():
         print("   3. The Tavily API service is accessible")
         print("   4. Check the error messages above for specific issues")
     
-    print(f"\n⏰ Test completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n⏰ Test completed in {time.monotonic() - run_start:.1f}s")
 
 
 def print_setup_instructions():
@@ -392,5 +399,4 @@ if __name__ == "__main__":
         print("\n\n⚠️  Test interrupted by user")
     except Exception as e:
         print(f"\n❌ Test suite failed with error: {e}")
-        import traceback
         print(f"Error details: {traceback.format_exc()}")
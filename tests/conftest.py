@@ -1,12 +1,22 @@
 import pytest
-import asyncio
-import tempfile
-import os
 from pathlib import Path
-from typing import AsyncGenerator, Generator
+from types import SimpleNamespace
+from typing import Annotated, AsyncGenerator, Callable, Dict, Generator, List, Tuple, Union
+from unittest.mock import Mock
 
 import httpx
+import orjson
+import pytest_asyncio
 from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from app.services.generation_service import (
+    AsyncEnhancedGenerationService,
+    ContentValidator,
+    OllamaClient,
+    PromptBuilder,
+    QualityScorer
+)
 
 # Import app components (will be created in later tasks)
 # from app.main import app
@@ -14,23 +24,10 @@ from fastapi.testclient import TestClient
 # from app.db.conversation_db import AsyncConversationDB
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
-def temp_db_path() -> str:
+def temp_db_path(tmp_path: Path) -> str:
     """Create a temporary database path for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        db_path = tmp.name
-    yield db_path
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    return str(tmp_path / "test.db")
 
 
 @pytest.fixture
@@ -64,6 +61,110 @@ async def async_app_client(test_settings: dict) -> AsyncGenerator[TestClient, No
     pass
 
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Create an async HTTP client bound to the FastAPI app for the session."""
+    from app.main import app
+    
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+
+# Canned Ollama replies keyed by (method, path); an exception value is raised instead
+OLLAMA_ROUTES: Dict[Tuple[str, str], Union[httpx.Response, Exception]] = {}
+
+
+def _serve_ollama_route(request: httpx.Request) -> httpx.Response:
+    """Answer a request to the mocked Ollama transport from OLLAMA_ROUTES."""
+    route = OLLAMA_ROUTES.get((request.method, request.url.path))
+    if route is None:
+        return httpx.Response(404)
+    if isinstance(route, Exception):
+        raise route
+    return route
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def ollama_client() -> AsyncGenerator[OllamaClient, None]:
+    """Create one OllamaClient for the session, served by a mocked transport."""
+    client = OllamaClient("http://localhost:11434")
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(_serve_ollama_route),
+        timeout=60.0
+    )
+    async with client:
+        yield client
+
+
+@pytest.fixture
+def ollama_routes(ollama_client: OllamaClient) -> Generator[Dict, None, None]:
+    """Provide the mocked Ollama routes, cleared after each test."""
+    yield OLLAMA_ROUTES
+    OLLAMA_ROUTES.clear()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def generation_service() -> AsyncGenerator[AsyncEnhancedGenerationService, None]:
+    """Create one generation service for the session, closing its Ollama client at teardown."""
+    async with AsyncEnhancedGenerationService() as service:
+        yield service
+
+
+# The generation components below are stateless, so one instance serves every test
+@pytest.fixture(scope="session")
+def prompt_builder() -> PromptBuilder:
+    """Create PromptBuilder instance for testing."""
+    return PromptBuilder()
+
+
+@pytest.fixture(scope="session")
+def content_validator() -> ContentValidator:
+    """Create ContentValidator instance for testing."""
+    return ContentValidator()
+
+
+@pytest.fixture(scope="session")
+def quality_scorer() -> QualityScorer:
+    """Create QualityScorer instance for testing."""
+    return QualityScorer()
+
+
+# Reply the fake Tavily client gives to search(); the service only iterates and copies the results
+TAVILY_SEARCH_PAYLOAD = {
+    "results": (
+        {
+            "title": "Music Theory Basics",
+            "url": "https://musictheory.net/lessons",
+            "content": "Learn the fundamentals of music theory including scales, chords, and rhythm."
+        },
+        {
+            "title": "Jazz Music History",
+            "url": "https://wikipedia.org/jazz_history",
+            "content": "Explore the rich history of jazz music and its cultural significance."
+        }
+    )
+}
+
+
+@pytest.fixture
+def fake_tavily() -> Mock:
+    """Create a Tavily client stand-in; tests override its search() reply via return_value or side_effect."""
+    # Spec on the one method the service calls, so tavily need not be installed
+    client = Mock(spec=["search"])
+    client.search.return_value = TAVILY_SEARCH_PAYLOAD
+    return client
+
+
+@pytest.fixture(scope="session")
+def fake_message() -> Callable[[str], SimpleNamespace]:
+    """Build stand-ins for model responses and stream chunks; the agent only reads ``content``."""
+    return lambda content: SimpleNamespace(content=content)
+
+
 @pytest.fixture
 async def mock_web_search_results() -> list:
     """Mock web search results for testing."""
@@ -123,11 +224,7 @@ def sample_chat_request() -> dict:
     }
 
 
-@pytest.fixture
-async def mock_ollama_response() -> str:
-    """Mock Ollama response for testing."""
-    return """
-{
+MOCK_OLLAMA_MASHUP = {
     "title": "Jazz-Hop Fusion: Improvisation Meets Rhythm",
     "lyrics": "In the classroom where jazz meets hip-hop beat\nImprovisation flows with rhythm so sweet\nFrom New Orleans to the Bronx we connect\nCultural fusion with deep respect",
     "educational_content": {
@@ -147,7 +244,21 @@ async def mock_ollama_response() -> str:
         "estimated_teaching_time": "45 minutes"
     }
 }
-"""
+
+# Encoded once; tests that need the raw payload share these bytes
+MOCK_OLLAMA_MASHUP_BYTES = orjson.dumps(MOCK_OLLAMA_MASHUP)
+
+
+@pytest.fixture
+def mock_ollama_response() -> dict:
+    """Mock Ollama response for testing, already parsed."""
+    return orjson.loads(MOCK_OLLAMA_MASHUP_BYTES)
+
+
+@pytest.fixture
+def mock_ollama_response_bytes() -> bytes:
+    """Mock Ollama response for testing, as raw JSON bytes."""
+    return MOCK_OLLAMA_MASHUP_BYTES
 
 
 # Utility functions for testing
@@ -169,26 +280,23 @@ def create_test_conversation_session(session_id: str = "test-session") -> dict:
     }
 
 
+class EducationalContent(BaseModel):
+    """Minimum shape required of generated educational content."""
+    theory_concepts: Annotated[List[str], Field(min_length=1, strict=True)]
+    cultural_context: Annotated[str, Field(min_length=50)]
+    teaching_notes: Annotated[str, Field(min_length=20)]
+
+
+# Compiled once so each validation runs in pydantic-core rather than Python
+EDUCATIONAL_CONTENT_ADAPTER = TypeAdapter(EducationalContent)
+
+
 def validate_educational_content(content: dict) -> bool:
     """Validate that educational content meets requirements."""
-    required_fields = ["theory_concepts", "cultural_context", "teaching_notes"]
-    
-    # Check all required fields exist
-    if not all(field in content for field in required_fields):
+    try:
+        EDUCATIONAL_CONTENT_ADAPTER.validate_python(content)
+    except ValidationError:
         return False
-    
-    # Check theory concepts
-    if not isinstance(content["theory_concepts"], list) or len(content["theory_concepts"]) < 1:
-        return False
-    
-    # Check cultural context length
-    if len(content["cultural_context"]) < 50:
-        return False
-    
-    # Check teaching notes
-    if len(content["teaching_notes"]) < 20:
-        return False
-    
     return True
 
 
@@ -0,0 +1,33 @@
+"""
+Tests for the UTC clock utilities.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.utils import utc_now, utc_now_iso
+
+
+class TestClock:
+    """Test the UTC clock."""
+    
+    def test_utc_now_is_aware_and_current(self):
+        """Test that the clock tracks the system clock."""
+        now = utc_now()
+        
+        assert now.tzinfo == timezone.utc
+        assert abs(now - datetime.now(timezone.utc)) < timedelta(seconds=1)
+    
+    def test_iso_matches_datetime(self):
+        """Test that the ISO string round-trips to a UTC datetime."""
+        parsed = datetime.fromisoformat(utc_now_iso())
+        
+        assert parsed.tzinfo is not None
+        assert abs(parsed - datetime.now(timezone.utc)) < timedelta(seconds=1)
+    
+    def test_clock_is_not_cached(self):
+        """Test that calls within the same millisecond get their own timestamp."""
+        first = utc_now()
+        time.sleep(0.0001)
+        
+        assert utc_now() > first
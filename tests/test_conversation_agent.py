@@ -7,12 +7,29 @@ This module contains tests for the conversation agent functionality.
 import pytest
 import pytest_asyncio
 import asyncio
+from contextlib import ExitStack
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 
 from app.agents import AsyncConversationalMashupAgent, ConversationPhase, SkillLevel
 
 
+@pytest.fixture(scope="module")
+def pooled_agent():
+    """Create one agent per module; per-test state is reset by the agent fixture."""
+    with ExitStack() as stack:
+        stack.enter_context(patch('app.agents.conversation_agent.AsyncConversationDB'))
+        mock_settings = stack.enter_context(patch('app.agents.conversation_agent.get_settings'))
+        mock_settings.return_value.DATABASE_PATH = '/tmp/test.db'
+        stack.enter_context(patch('app.agents.conversation_agent.ChatOllama'))
+        
+        yield AsyncConversationalMashupAgent(
+            model_name="test-model",
+            model_type="ollama",
+            db_path="/tmp/test.db"
+        )
+
+
 class TestAsyncConversationalMashupAgent:
     """Test cases for AsyncConversationalMashupAgent."""
     
@@ -28,32 +45,22 @@ class TestAsyncConversationalMashupAgent:
         })
         mock_db.create_conversation = AsyncMock(return_value=True)
         mock_db.add_message = AsyncMock(return_value=True)
+        mock_db.add_messages = AsyncMock(return_value=True)
         mock_db.update_conversation_phase = AsyncMock(return_value=True)
         mock_db.get_messages = AsyncMock(return_value=[])
         mock_db.close = AsyncMock()
         return mock_db
     
     @pytest_asyncio.fixture
-    async def agent(self, mock_db):
-        """Create an agent instance for testing."""
-        with patch('app.agents.conversation_agent.AsyncConversationDB', return_value=mock_db):
-            with patch('app.agents.conversation_agent.get_settings') as mock_settings:
-                mock_settings.return_value.DATABASE_PATH = '/tmp/test.db'
-                
-                # Mock the model initialization
-                with patch('app.agents.conversation_agent.ChatOllama') as mock_chat_ollama:
-                    mock_model = Mock()
-                    mock_model.ainvoke = AsyncMock(return_value=Mock(content="Test response"))
-                    mock_chat_ollama.return_value = mock_model
-                    
-                    agent = AsyncConversationalMashupAgent(
-                        model_name="test-model",
-                        model_type="ollama",
-                        db_path="/tmp/test.db"
-                    )
-                    agent.db = mock_db
-                    yield agent
-                    await agent.close()
+    async def agent(self, pooled_agent, mock_db, fake_message):
+        """Reset the pooled agent with a fresh database and model for each test."""
+        mock_model = Mock()
+        mock_model.ainvoke = AsyncMock(return_value=fake_message("Test response"))
+        
+        pooled_agent.db = mock_db
+        pooled_agent.model = mock_model
+        yield pooled_agent
+        await pooled_agent.close()
     
     @pytest.mark.asyncio
     async def test_agent_initialization(self, agent):
@@ -138,65 +145,55 @@ class TestAsyncConversationalMashupAgent:
         fallback = agent._get_fallback_response(ConversationPhase.GENRE_EXPLORATION)
         assert "genres" in fallback.lower()
     
+    @pytest.fixture
+    def agent_dependencies(self, monkeypatch):
+        """Replace the agent's database and settings lookups for construction tests."""
+        mock_settings = Mock()
+        mock_settings.DATABASE_PATH = '/tmp/test.db'
+        monkeypatch.setattr('app.agents.conversation_agent.AsyncConversationDB', Mock(return_value=Mock()))
+        monkeypatch.setattr('app.agents.conversation_agent.get_settings', Mock(return_value=mock_settings))
+    
     @pytest.mark.asyncio
-    async def test_model_initialization_ollama(self):
+    async def test_model_initialization_ollama(self, agent_dependencies, monkeypatch):
         """Test Ollama model initialization."""
-        with patch('app.agents.conversation_agent.ChatOllama') as mock_chat_ollama:
-            mock_chat_ollama.return_value = Mock()
-            
-            with patch('app.agents.conversation_agent.AsyncConversationDB') as mock_db_class:
-                mock_db_class.return_value = Mock()
-                
-                with patch('app.agents.conversation_agent.get_settings') as mock_settings:
-                    mock_settings.return_value.DATABASE_PATH = '/tmp/test.db'
-                    
-                    agent = AsyncConversationalMashupAgent(
-                        model_name="llama3.1:8b-instruct",
-                        model_type="ollama"
-                    )
-                    
-                    assert agent.model_type == "ollama"
-                    mock_chat_ollama.assert_called_once_with(
-                        model="llama3.1:8b-instruct",
-                        temperature=0.7
-                    )
+        mock_chat_ollama = Mock(return_value=Mock())
+        monkeypatch.setattr('app.agents.conversation_agent.ChatOllama', mock_chat_ollama)
+        
+        agent = AsyncConversationalMashupAgent(
+            model_name="llama3.1:8b-instruct",
+            model_type="ollama"
+        )
+        
+        assert agent.model_type == "ollama"
+        mock_chat_ollama.assert_called_once_with(
+            model="llama3.1:8b-instruct",
+            temperature=0.7
+        )
     
     @pytest.mark.asyncio
-    async def test_model_initialization_openai(self):
+    async def test_model_initialization_openai(self, agent_dependencies, monkeypatch):
         """Test OpenAI model initialization."""
-        with patch('app.agents.conversation_agent.ChatOpenAI') as mock_chat_openai:
-            mock_chat_openai.return_value = Mock()
-            
-            with patch('app.agents.conversation_agent.AsyncConversationDB') as mock_db_class:
-                mock_db_class.return_value = Mock()
-                
-                with patch('app.agents.conversation_agent.get_settings') as mock_settings:
-                    mock_settings.return_value.DATABASE_PATH = '/tmp/test.db'
-                    
-                    agent = AsyncConversationalMashupAgent(
-                        model_name="gpt-4",
-                        model_type="openai",
-                        openai_api_key="test-key"
-                    )
-                    
-                    assert agent.model_type == "openai"
-                    mock_chat_openai.assert_called_once_with(
-                        model="gpt-4",
-                        temperature=0.7,
-                        api_key="test-key"
-                    )
+        mock_chat_openai = Mock(return_value=Mock())
+        monkeypatch.setattr('app.agents.conversation_agent.ChatOpenAI', mock_chat_openai)
+        
+        agent = AsyncConversationalMashupAgent(
+            model_name="gpt-4",
+            model_type="openai",
+            openai_api_key="test-key"
+        )
+        
+        assert agent.model_type == "openai"
+        mock_chat_openai.assert_called_once_with(
+            model="gpt-4",
+            temperature=0.7,
+            api_key="test-key"
+        )
     
     @pytest.mark.asyncio
-    async def test_invalid_model_type(self):
+    async def test_invalid_model_type(self, agent_dependencies):
         """Test that invalid model type raises error."""
         with pytest.raises(ValueError, match="Unsupported model type"):
-            with patch('app.agents.conversation_agent.AsyncConversationDB') as mock_db_class:
-                mock_db_class.return_value = Mock()
-                
-                with patch('app.agents.conversation_agent.get_settings') as mock_settings:
-                    mock_settings.return_value.DATABASE_PATH = '/tmp/test.db'
-                    
-                    AsyncConversationalMashupAgent(
-                        model_name="test-model",
-                        model_type="invalid"
-                    ) 
\ No newline at end of file
+            AsyncConversationalMashupAgent(
+                model_name="test-model",
+                model_type="invalid"
+            ) 
\ No newline at end of file
@@ -8,7 +8,8 @@ tool orchestration, phase-based conversation management, and web search integrat
 import asyncio
 import pytest
 import pytest_asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, patch
 from datetime import datetime, timezone
 from typing import Dict, Any
 
@@ -18,6 +19,36 @@ from app.services.web_search import AsyncWebSearchService
 from app.db import AsyncConversationDB, ToolCallType
 
 
+class _StubConversationDB:
+    """Explicit database stub exposing only the methods the agent and orchestrator call."""
+    
+    def __init__(self):
+        self.get_conversation = AsyncMock(return_value=None)
+        self.create_conversation = AsyncMock(return_value=True)
+        self.update_conversation_phase = AsyncMock(return_value=True)
+        self.add_message = AsyncMock(return_value=True)
+        self.add_messages = AsyncMock(return_value=True)
+        self.get_messages = AsyncMock(return_value=[])
+        self.add_tool_call = AsyncMock(return_value=1)
+        self.update_tool_call = AsyncMock(return_value=True)
+        self.add_web_source = AsyncMock(return_value=True)
+        self.close = AsyncMock()
+
+
+@pytest.fixture(scope="module")
+def pooled_agent():
+    """Create one tool-enabled agent per module; per-test state is reset by the fixture using it."""
+    with ExitStack() as stack:
+        stack.enter_context(patch('app.agents.conversation_agent.get_shared_web_search_service'))
+        stack.enter_context(patch('app.agents.conversation_agent.AsyncToolOrchestrator'))
+        
+        yield AsyncConversationalMashupAgent(
+            model_name="test-model",
+            enable_tools=True,
+            db_path=":memory:"
+        )
+
+
 class TestConversationAgentWithTools:
     """Test the enhanced conversation agent with tool integration."""
     
@@ -32,6 +63,7 @@ class TestConversationAgentWithTools:
             "updated_at": datetime.now(timezone.utc)
         }
         mock_db.add_message.return_value = True
+        mock_db.add_messages.return_value = True
         mock_db.update_conversation_phase.return_value = True
         return mock_db
     
@@ -50,29 +82,20 @@ class TestConversationAgentWithTools:
         return mock_orchestrator
     
     @pytest_asyncio.fixture
-    async def conversation_agent(self, mock_db, mock_web_search_service, mock_tool_orchestrator):
-        """Create a conversation agent instance for testing."""
-        with patch('app.agents.conversation_agent.AsyncWebSearchService', return_value=mock_web_search_service), \
-             patch('app.agents.conversation_agent.AsyncToolOrchestrator', return_value=mock_tool_orchestrator):
-            
-            agent = AsyncConversationalMashupAgent(
-                model_name="test-model",
-                enable_tools=True,
-                db_path=":memory:"
-            )
-            agent.db = mock_db
-            agent.tool_orchestrator = mock_tool_orchestrator
-            
-            # Mock the AI model
-            mock_model = AsyncMock()
-            agent.model = mock_model
-            
-            return agent
+    async def conversation_agent(self, pooled_agent, mock_db, mock_tool_orchestrator):
+        """Reset the pooled conversation agent with fresh mocks for each test."""
+        pooled_agent.db = mock_db
+        pooled_agent.tool_orchestrator = mock_tool_orchestrator
+        
+        # Mock the AI model
+        pooled_agent.model = AsyncMock()
+        
+        return pooled_agent
     
     @pytest.mark.asyncio
     async def test_initialization_with_tools(self, mock_web_search_service, mock_tool_orchestrator):
         """Test conversation agent initialization with tools enabled."""
-        with patch('app.agents.conversation_agent.AsyncWebSearchService', return_value=mock_web_search_service), \
+        with patch('app.agents.conversation_agent.get_shared_web_search_service', return_value=mock_web_search_service), \
              patch('app.agents.conversation_agent.AsyncToolOrchestrator', return_value=mock_tool_orchestrator):
             
             agent = AsyncConversationalMashupAgent(enable_tools=True)
@@ -89,11 +112,10 @@ class TestConversationAgentWithTools:
         assert agent.tool_orchestrator is None
     
     @pytest.mark.asyncio
-    async def test_process_message_with_tools(self, conversation_agent, mock_db, mock_tool_orchestrator):
+    async def test_process_message_with_tools(self, conversation_agent, mock_db, mock_tool_orchestrator, fake_message):
         """Test message processing with tool integration."""
         # Mock AI model response
-        mock_response = MagicMock()
-        mock_response.content = "Hello! I'm here to help you create an educational music mashup."
+        mock_response = fake_message("Hello! I'm here to help you create an educational music mashup.")
         conversation_agent.model.ainvoke.return_value = mock_response
         
         # Mock tool execution results
@@ -119,11 +141,11 @@ class TestConversationAgentWithTools:
         assert "tool_results" in result
         
         # Verify database calls
-        mock_db.add_message.assert_called()
+        mock_db.add_messages.assert_called_once()
         mock_db.update_conversation_phase.assert_called()
     
     @pytest.mark.asyncio
-    async def test_genre_exploration_with_tools(self, conversation_agent, mock_tool_orchestrator):
+    async def test_genre_exploration_with_tools(self, conversation_agent, mock_tool_orchestrator, fake_message):
         """Test genre exploration phase with tool execution."""
         # Set up conversation for genre exploration
         conversation_agent.db.get_conversation.return_value = {
@@ -134,8 +156,7 @@ class TestConversationAgentWithTools:
         }
         
         # Mock AI model response
-        mock_response = MagicMock()
-        mock_response.content = "Great! Let me research jazz and rock for you."
+        mock_response = fake_message("Great! Let me research jazz and rock for you.")
         conversation_agent.model.ainvoke.return_value = mock_response
         
         # Mock tool execution
@@ -173,7 +194,7 @@ class TestConversationAgentWithTools:
         assert result["tool_results"]["synthesized"]["total_results"] == 2
     
     @pytest.mark.asyncio
-    async def test_cultural_research_with_tools(self, conversation_agent, mock_tool_orchestrator):
+    async def test_cultural_research_with_tools(self, conversation_agent, mock_tool_orchestrator, fake_message):
         """Test cultural research phase with tool execution."""
         # Set up conversation for cultural research
         conversation_agent.db.get_conversation.return_value = {
@@ -184,8 +205,7 @@ class TestConversationAgentWithTools:
         }
         
         # Mock AI model response
-        mock_response = MagicMock()
-        mock_response.content = "Let me research the cultural context of these genres."
+        mock_response = fake_message("Let me research the cultural context of these genres.")
         conversation_agent.model.ainvoke.return_value = mock_response
         
         # Mock tool execution
@@ -216,11 +236,10 @@ class TestConversationAgentWithTools:
         assert "tool_results" in result
     
     @pytest.mark.asyncio
-    async def test_tool_execution_error_handling(self, conversation_agent, mock_tool_orchestrator):
+    async def test_tool_execution_error_handling(self, conversation_agent, mock_tool_orchestrator, fake_message):
         """Test error handling when tool execution fails."""
         # Mock AI model response
-        mock_response = MagicMock()
-        mock_response.content = "I'll help you explore genres."
+        mock_response = fake_message("I'll help you explore genres.")
         conversation_agent.model.ainvoke.return_value = mock_response
         
         # Mock tool execution error
@@ -321,12 +340,55 @@ class TestConversationAgentWithTools:
         }
         
         ai_messages = await conversation_agent._prepare_messages_for_ai_with_tools(
-            messages, ConversationPhase.GENRE_EXPLORATION, {}, tool_results
+            messages, ConversationPhase.GENRE_EXPLORATION, {}, tool_results, "Tell me about jazz"
         )
         
-        # Verify system message includes tool context
-        system_message = ai_messages[0].content
-        assert "3 relevant sources" in system_message
+        # Verify the stable prefix comes first and the tool context follows the history
+        assert ai_messages[0].content == conversation_agent.system_prompts[ConversationPhase.GENRE_EXPLORATION]
+        assert [m.content for m in ai_messages[1:3]] == ["Hello", "Hi there!"]
+        assert "3 relevant sources" in ai_messages[-2].content
+        assert ai_messages[-1].content == "Tell me about jazz"
+    
+    @pytest.mark.asyncio
+    async def test_prepare_messages_reuses_cached_system_message(self, conversation_agent):
+        """Test that the phase system message is cached when there are no tool results."""
+        messages = [{"role": "user", "content": "Hello"}]
+        
+        first = await conversation_agent._prepare_messages_for_ai_with_tools(
+            messages, ConversationPhase.INITIAL, {}, {}
+        )
+        second = await conversation_agent._prepare_messages_for_ai_with_tools(
+            messages, ConversationPhase.INITIAL, {}, {}
+        )
+        
+        assert first[0] is second[0]
+        assert first[0].content == conversation_agent.system_prompts[ConversationPhase.INITIAL]
+    
+    @pytest.mark.asyncio
+    async def test_stream_message(self, conversation_agent, mock_db, mock_tool_orchestrator, fake_message):
+        """Test streaming a response chunk by chunk."""
+        async def astream(messages):
+            for text in ("Let's ", "explore ", "jazz!"):
+                yield fake_message(text)
+        
+        conversation_agent.model.astream = astream
+        mock_tool_orchestrator.execute_genre_exploration_searches.return_value = {}
+        mock_tool_orchestrator.process_search_results.return_value = {"total_results": 0, "results": []}
+        
+        events = [
+            event async for event in conversation_agent.stream_message(
+                session_id="test-session",
+                user_message="I want to explore jazz music"
+            )
+        ]
+        
+        assert [event['delta'] for event in events[:-1]] == ["Let's ", "explore ", "jazz!"]
+        final = events[-1]
+        assert final['done'] is True
+        assert final['response'] == "Let's explore jazz!"
+        assert final['phase_transition'] is True
+        mock_db.add_messages.assert_called_once()
+        mock_db.update_conversation_phase.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_fallback_response(self, conversation_agent):
@@ -349,8 +411,8 @@ class TestConversationAgentIntegration:
     
     @pytest_asyncio.fixture
     async def mock_db_for_integration(self):
-        """Create a mock database for integration tests."""
-        mock_db = AsyncMock(spec=AsyncConversationDB)
+        """Create a stub database for integration tests."""
+        mock_db = _StubConversationDB()
         
         # Track conversation state
         conversation_state = {
@@ -369,12 +431,10 @@ class TestConversationAgentIntegration:
         
         mock_db.get_conversation = get_conversation
         mock_db.update_conversation_phase = update_conversation_phase
-        mock_db.add_message.return_value = True
-        mock_db.create_conversation.return_value = True
         return mock_db
     
     @pytest.mark.asyncio
-    async def test_conversation_agent_with_real_web_search(self, mock_db_for_integration):
+    async def test_conversation_agent_with_real_web_search(self, mock_db_for_integration, fake_message):
         """Test conversation agent with real web search service (no API key)."""
         from app.services.web_search import AsyncWebSearchService
         
@@ -390,8 +450,7 @@ class TestConversationAgentIntegration:
         
         # Mock the AI model
         mock_model = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.content = "Hello! I'm here to help you explore jazz music."
+        mock_response = fake_message("Hello! I'm here to help you explore jazz music.")
         mock_model.ainvoke.return_value = mock_response
         agent.model = mock_model
         
@@ -407,7 +466,7 @@ class TestConversationAgentIntegration:
         assert "tool_results" in result
     
     @pytest.mark.asyncio
-    async def test_conversation_agent_phase_progression(self, mock_db_for_integration):
+    async def test_conversation_agent_phase_progression(self, mock_db_for_integration, fake_message):
         """Test conversation agent phase progression."""
         agent = AsyncConversationalMashupAgent(enable_tools=False)  # Disable tools for simpler testing
         
@@ -416,8 +475,7 @@ class TestConversationAgentIntegration:
         
         # Mock the AI model
         mock_model = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.content = "Great! Let's explore some genres."
+        mock_response = fake_message("Great! Let's explore some genres.")
         mock_model.ainvoke.return_value = mock_response
         agent.model = mock_model
         
@@ -0,0 +1,61 @@
+"""
+Tests for the AsyncConversationDB message operations.
+
+This module tests message persistence against a temporary SQLite database.
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.db import AsyncConversationDB, MessageRole
+
+
+class TestAsyncConversationDBMessages:
+    """Test message persistence in AsyncConversationDB."""
+    
+    @pytest_asyncio.fixture
+    async def db(self, tmp_path):
+        """Create an initialized database in a per-test temporary directory."""
+        db = AsyncConversationDB(str(tmp_path / "test.db"))
+        await db.connect()
+        await db.init_db()
+        await db.create_conversation("test-session")
+        yield db
+        await db.close()
+    
+    @pytest.mark.asyncio
+    async def test_add_messages_batch(self, db):
+        """Test adding a user/assistant turn in one call."""
+        result = await db.add_messages("test-session", [
+            {'role': MessageRole.USER, 'content': "I want to explore jazz"},
+            {'role': MessageRole.ASSISTANT, 'content': "Let's explore jazz!", 'metadata': {'cached': False}}
+        ])
+        
+        assert result is True
+        
+        messages = await db.get_messages("test-session")
+        assert [(m['role'], m['content']) for m in messages] == [
+            (MessageRole.USER.value, "I want to explore jazz"),
+            (MessageRole.ASSISTANT.value, "Let's explore jazz!")
+        ]
+        assert messages[1]['metadata'] == {'cached': False}
+    
+    @pytest.mark.asyncio
+    async def test_add_messages_keeps_order_after_single_add(self, db):
+        """Test that batched messages follow earlier messages."""
+        await db.add_message("test-session", MessageRole.USER, "Hello")
+        await db.add_messages("test-session", [
+            {'role': MessageRole.USER, 'content': "First"},
+            {'role': MessageRole.ASSISTANT, 'content': "Second"}
+        ])
+        
+        messages = await db.get_messages("test-session")
+        assert [m['content'] for m in messages] == ["Hello", "First", "Second"]
+    
+    @pytest.mark.asyncio
+    async def test_connection_uses_wal(self, db):
+        """Test that file databases are opened in WAL mode."""
+        cursor = await db._connection.execute("PRAGMA journal_mode")
+        row = await cursor.fetchone()
+        
+        assert row[0] == "wal"
@@ -7,22 +7,75 @@ and performance monitoring capabilities.
 
 import pytest
 import asyncio
-import tempfile
-import shutil
+import aiosqlite
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime, timezone
 
+from app.db.conversation_db import SQLITE_CONNECTION_PRAGMAS
 from app.db.utils import DatabaseUtils, DatabasePerformanceMonitor
 from app.db.validation import DatabaseValidator, ValidationError, validate_database_operation
 
+# Metadata with more keys than the validator allows
+INVALID_METADATA_TOO_MANY_KEYS = {f"key_{i}": f"value_{i}" for i in range(25)}
+
+# Pre-built performance monitor snapshot for history tests
+METRICS_SNAPSHOT = {
+    "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "size_bytes": 4096,
+    "table_count": 1,
+    "index_count": 0,
+    "table_metrics": {"test": 1},
+    "statistics": []
+}
+
+
+@asynccontextmanager
+async def open_test_db(path):
+    """Open a test database connection in WAL mode with relaxed syncing."""
+    async with aiosqlite.connect(path) as db:
+        for pragma in SQLITE_CONNECTION_PRAGMAS:
+            await db.execute(pragma)
+        yield db
+
 
 class TestDatabaseValidator:
     """Test database validation functionality."""
     
-    def test_sanitize_string_valid(self):
-        """Test string sanitization with valid input."""
-        result = DatabaseValidator.sanitize_string("Hello World", max_length=20)
-        assert result == "Hello World"
+    @pytest.mark.parametrize("validate,value,kwargs,expected", [
+        (DatabaseValidator.sanitize_string, "Hello World", {"max_length": 20}, "Hello World"),
+        (DatabaseValidator.validate_conversation_id, "conv_123", {}, "conv_123"),
+        (DatabaseValidator.validate_url, "https://example.com", {}, "https://example.com"),
+        (DatabaseValidator.validate_relevance_score, 0.5, {}, 0.5),
+    ], ids=[
+        "string",
+        "conversation-id",
+        "url",
+        "relevance-score",
+    ])
+    def test_valid_input(self, validate, value, kwargs, expected):
+        """Test that validators return valid input unchanged."""
+        assert validate(value, **kwargs) == expected
+    
+    @pytest.mark.parametrize("validate,value", [
+        (DatabaseValidator.sanitize_string, "a" * 1001),
+        (DatabaseValidator.sanitize_string, ""),
+        (DatabaseValidator.validate_conversation_id, "conv@123"),
+        (DatabaseValidator.validate_conversation_id, "ab"),
+        (DatabaseValidator.validate_url, "not-a-url"),
+        (DatabaseValidator.validate_relevance_score, 1.5),
+    ], ids=[
+        "string-too-long",
+        "string-empty",
+        "conversation-id-invalid-chars",
+        "conversation-id-too-short",
+        "url-invalid",
+        "relevance-score-out-of-range",
+    ])
+    def test_invalid_input_raises(self, validate, value):
+        """Test that validators reject invalid input."""
+        with pytest.raises(ValidationError):
+            validate(value)
     
     def test_sanitize_string_with_html(self):
         """Test string sanitization with HTML content."""
@@ -30,51 +83,6 @@ class TestDatabaseValidator:
         assert "&lt;" in result
         assert "&gt;" in result
     
-    def test_sanitize_string_too_long(self):
-        """Test string sanitization with too long input."""
-        with pytest.raises(ValidationError):
-            DatabaseValidator.sanitize_string("a" * 1001)
-    
-    def test_sanitize_string_empty(self):
-        """Test string sanitization with empty input."""
-        with pytest.raises(ValidationError):
-            DatabaseValidator.sanitize_string("")
-    
-    def test_validate_conversation_id_valid(self):
-        """Test conversation ID validation with valid input."""
-        result = DatabaseValidator.validate_conversation_id("conv_123")
-        assert result == "conv_123"
-    
-    def test_validate_conversation_id_invalid(self):
-        """Test conversation ID validation with invalid input."""
-        with pytest.raises(ValidationError):
-            DatabaseValidator.validate_conversation_id("conv@123")
-    
-    def test_validate_conversation_id_too_short(self):
-        """Test conversation ID validation with too short input."""
-        with pytest.raises(ValidationError):
-            DatabaseValidator.validate_conversation_id("ab")
-    
-    def test_validate_url_valid(self):
-        """Test URL validation with valid input."""
-        result = DatabaseValidator.validate_url("https://example.com")
-        assert result == "https://example.com"
-    
-    def test_validate_url_invalid(self):
-        """Test URL validation with invalid input."""
-        with pytest.raises(ValidationError):
-            DatabaseValidator.validate_url("not-a-url")
-    
-    def test_validate_relevance_score_valid(self):
-        """Test relevance score validation with valid input."""
-        result = DatabaseValidator.validate_relevance_score(0.5)
-        assert result == 0.5
-    
-    def test_validate_relevance_score_invalid_range(self):
-        """Test relevance score validation with invalid range."""
-        with pytest.raises(ValidationError):
-            DatabaseValidator.validate_relevance_score(1.5)
-    
     def test_validate_metadata_valid(self):
         """Test metadata validation with valid input."""
         metadata = {"key": "value", "number": 42}
@@ -85,25 +93,17 @@ class TestDatabaseValidator:
     
     def test_validate_metadata_too_many_keys(self):
         """Test metadata validation with too many keys."""
-        metadata = {f"key_{i}": f"value_{i}" for i in range(25)}
         with pytest.raises(ValidationError):
-            DatabaseValidator.validate_metadata(metadata)
+            DatabaseValidator.validate_metadata(INVALID_METADATA_TOO_MANY_KEYS)
 
 
 class TestDatabaseUtils:
     """Test database utility functions."""
     
     @pytest.fixture
-    def temp_db_path(self):
-        """Create a temporary database path."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            temp_path = f.name
-        yield temp_path
-        # Cleanup
-        try:
-            Path(temp_path).unlink(missing_ok=True)
-        except:
-            pass
+    def temp_db_path(self, tmp_path):
+        """Create a database path in a per-test temporary directory."""
+        return str(tmp_path / "test.db")
     
     @pytest.fixture
     def db_utils(self, temp_db_path):
@@ -113,47 +113,48 @@ class TestDatabaseUtils:
     @pytest.mark.asyncio
     async def test_create_backup(self, db_utils, temp_db_path):
         """Test database backup creation."""
-        # Create a simple database
-        import aiosqlite
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-            await db.execute("INSERT INTO test (name) VALUES (?)", ("test",))
-            await db.commit()
-        
-        # Create backup
-        backup_path = await db_utils.create_backup()
-        assert Path(backup_path).exists()
-        
-        # Verify backup contains data
-        async with aiosqlite.connect(backup_path) as db:
-            cursor = await db.execute("SELECT name FROM test")
+        # Create a simple database and keep its connection for verification
+        async with open_test_db(temp_db_path) as db:
+            await db.executescript("""
+                BEGIN;
+                CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);
+                INSERT INTO test (name) VALUES ('test');
+                COMMIT;
+            """)
+            
+            # Create backup
+            backup_path = await db_utils.create_backup()
+            assert Path(backup_path).exists()
+            
+            # Verify backup contains data
+            await db.execute("ATTACH DATABASE ? AS backup", (backup_path,))
+            cursor = await db.execute("SELECT name FROM backup.test")
             result = await cursor.fetchone()
             assert result[0] == "test"
     
     @pytest.mark.asyncio
     async def test_restore_backup(self, db_utils, temp_db_path):
         """Test database backup restoration."""
-        # Create original database
-        import aiosqlite
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-            await db.execute("INSERT INTO test (name) VALUES (?)", ("original",))
-            await db.commit()
-        
-        # Create backup
-        backup_path = await db_utils.create_backup()
-        
-        # Modify original database
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("DELETE FROM test")
-            await db.commit()
-        
-        # Restore from backup
-        success = await db_utils.restore_backup(backup_path)
-        assert success
-        
-        # Verify restoration
-        async with aiosqlite.connect(temp_db_path) as db:
+        async with open_test_db(temp_db_path) as db:
+            # Create original database
+            await db.executescript("""
+                BEGIN;
+                CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);
+                INSERT INTO test (name) VALUES ('original');
+                COMMIT;
+            """)
+            
+            # Create backup
+            backup_path = await db_utils.create_backup()
+            
+            # Modify original database
+            await db.executescript("BEGIN; DELETE FROM test; COMMIT;")
+            
+            # Restore from backup
+            success = await db_utils.restore_backup(backup_path)
+            assert success
+            
+            # Verify restoration
             cursor = await db.execute("SELECT name FROM test")
             result = await cursor.fetchone()
             assert result[0] == "original"
@@ -179,11 +180,13 @@ class TestDatabaseUtils:
     async def test_get_database_info(self, db_utils, temp_db_path):
         """Test getting database information."""
         # Create a simple database
-        import aiosqlite
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-            await db.execute("INSERT INTO test (name) VALUES (?)", ("test",))
-            await db.commit()
+        async with open_test_db(temp_db_path) as db:
+            await db.executescript("""
+                BEGIN;
+                CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);
+                INSERT INTO test (name) VALUES ('test');
+                COMMIT;
+            """)
         
         info = await db_utils.get_database_info()
         assert "path" in info
@@ -196,10 +199,8 @@ class TestDatabaseUtils:
     async def test_validate_database_integrity(self, db_utils, temp_db_path):
         """Test database integrity validation."""
         # Create a simple database
-        import aiosqlite
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-            await db.commit()
+        async with open_test_db(temp_db_path) as db:
+            await db.executescript("BEGIN; CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT); COMMIT;")
         
         integrity = await db_utils.validate_database_integrity()
         assert "integrity_ok" in integrity
@@ -209,10 +210,8 @@ class TestDatabaseUtils:
     async def test_optimize_database(self, db_utils, temp_db_path):
         """Test database optimization."""
         # Create a simple database
-        import aiosqlite
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-            await db.commit()
+        async with open_test_db(temp_db_path) as db:
+            await db.executescript("BEGIN; CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT); COMMIT;")
         
         success = await db_utils.optimize_database()
         assert success is True
@@ -222,16 +221,9 @@ class TestDatabasePerformanceMonitor:
     """Test database performance monitoring."""
     
     @pytest.fixture
-    def temp_db_path(self):
-        """Create a temporary database path."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            temp_path = f.name
-        yield temp_path
-        # Cleanup
-        try:
-            Path(temp_path).unlink(missing_ok=True)
-        except:
-            pass
+    def temp_db_path(self, tmp_path):
+        """Create a database path in a per-test temporary directory."""
+        return str(tmp_path / "test.db")
     
     @pytest.fixture
     def monitor(self, temp_db_path):
@@ -242,11 +234,13 @@ class TestDatabasePerformanceMonitor:
     async def test_collect_metrics(self, monitor, temp_db_path):
         """Test metrics collection."""
         # Create a simple database
-        import aiosqlite
-        async with aiosqlite.connect(temp_db_path) as db:
-            await db.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-            await db.execute("INSERT INTO test (name) VALUES (?)", ("test",))
-            await db.commit()
+        async with open_test_db(temp_db_path) as db:
+            await db.executescript("""
+                BEGIN;
+                CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);
+                INSERT INTO test (name) VALUES ('test');
+                COMMIT;
+            """)
         
         metrics = await monitor.collect_metrics()
         assert "timestamp" in metrics
@@ -256,12 +250,10 @@ class TestDatabasePerformanceMonitor:
         assert "table_metrics" in metrics
         assert metrics["table_metrics"]["test"] == 1
     
-    @pytest.mark.asyncio
-    async def test_metrics_history(self, monitor):
+    def test_metrics_history(self, monitor, monkeypatch):
         """Test metrics history tracking."""
-        # Collect some metrics
-        await monitor.collect_metrics()
-        await monitor.collect_metrics()
+        # Seed the history as two collect_metrics passes would, without touching SQLite
+        monkeypatch.setattr(monitor, "metrics", [METRICS_SNAPSHOT, METRICS_SNAPSHOT])
         
         history = monitor.get_metrics_history()
         assert len(history) == 2
@@ -270,12 +262,10 @@ class TestDatabasePerformanceMonitor:
         history_limited = monitor.get_metrics_history(limit=1)
         assert len(history_limited) == 1
     
-    @pytest.mark.asyncio
-    async def test_performance_summary(self, monitor):
+    def test_performance_summary(self, monitor, monkeypatch):
         """Test performance summary generation."""
-        # Collect some metrics
-        await monitor.collect_metrics()
-        await monitor.collect_metrics()
+        # Seed the history as two collect_metrics passes would, without touching SQLite
+        monkeypatch.setattr(monitor, "metrics", [METRICS_SNAPSHOT, METRICS_SNAPSHOT])
         
         summary = monitor.get_performance_summary()
         assert "metrics_count" in summary
@@ -315,9 +305,8 @@ class TestValidationDecorators:
         assert "metadata" in result
         
         # Test invalid metadata (too many keys)
-        invalid_metadata = {f"key_{i}": f"value_{i}" for i in range(25)}
         with pytest.raises(ValidationError):
-            await test_function(metadata=invalid_metadata)
+            await test_function(metadata=INVALID_METADATA_TOO_MANY_KEYS)
 
 
 class TestValidationUtilityFunctions:
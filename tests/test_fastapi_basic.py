@@ -1,55 +1,121 @@
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, patch
-from fastapi.testclient import TestClient
-from app.main import app, reset_rate_limit_storage
-from app.db import AsyncConversationDB
-from app.agents.conversation_agent import ConversationPhase
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from app.main import app, get_db, rate_limit_storage, reset_rate_limit_storage
 import time
-from datetime import datetime, timezone
+import itertools
 
-# Mock database for testing
-@pytest.fixture
-def mock_db():
-    """Create a mock database for testing."""
-    mock_db = AsyncMock(spec=AsyncConversationDB)
+# Client address httpx's ASGITransport reports to the app
+TEST_CLIENT_HOST = "127.0.0.1"
+
+# Payload values just over each validator's size limit
+LONG_CONVERSATION_ID = "a" * 101
+LONG_MESSAGE_CONTENT = "a" * 10001
+LONG_URL = "https://example.com/" + "a" * 2049  # Longer than 2048 characters
+LARGE_METADATA = {"data": "a" * 1001}
+
+# Sequential conversation IDs, unique within the test session
+_conv_counter = itertools.count()
+
+def _conv_id():
+    return f"test_conv_{next(_conv_counter):08x}"
+
+# Mock conversation data
+MOCK_CONVERSATION = {
+    "conversation_id": "test_conv_123",
+    "phase": "initial",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z"
+}
+
+class _StubConversationDB:
+    """Hand-written database stub with canned async methods for the API tests."""
     
-    # Mock conversation data
-    mock_conversation = {
-        "conversation_id": "test_conv_123",
-        "phase": "initial",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    }
+    def __init__(self):
+        # Conversations created through the API, keyed by conversation ID
+        self.conversations = {}
+        self.reset()
+    
+    def reset(self):
+        """Forget conversations created by earlier tests."""
+        self.conversations.clear()
+        self.conversations[MOCK_CONVERSATION["conversation_id"]] = MOCK_CONVERSATION
+    
+    async def init_db(self):
+        return None
+    
+    async def create_conversation(self, conversation_id, metadata=None):
+        self.conversations[conversation_id] = {**MOCK_CONVERSATION, "conversation_id": conversation_id}
+        return True
     
-    mock_db.get_conversation.return_value = mock_conversation
-    mock_db.create_conversation.return_value = True
-    mock_db.get_messages.return_value = []
-    mock_db.init_db.return_value = None
+    async def get_conversation(self, conversation_id):
+        return self.conversations.get(conversation_id)
     
-    return mock_db
+    async def get_messages(self, *args, **kwargs):
+        return []
+    
+    async def create_mashup(self, *args, **kwargs):
+        return 1
+
+# Mock database for testing
+@pytest.fixture(scope="session")
+def mock_db():
+    """Create a stub database for testing."""
+    return _StubConversationDB()
 
 # Create test client with mocked database
-@pytest.fixture
-def test_client(mock_db):
-    """Create a test client with mocked database."""
-    # Reset rate limiting storage before each test
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(mock_db):
+    """Create an async test client with mocked database, shared across the session."""
+    app.dependency_overrides[get_db] = lambda: mock_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_db, None)
+
+@pytest.fixture(scope="session", autouse=True)
+def openapi_schema():
+    """Build the OpenAPI schema once so later doc requests reuse the cached copy."""
+    schema = app.openapi()
+    assert app.openapi_schema is not None
+    return schema
+
+@pytest.fixture(scope="module", autouse=True)
+def api_key_env():
+    """Set the API key the authentication middleware checks, for this module only."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("API_KEY", "test-api-key")
+        yield
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    """Authorization headers accepted by the API in tests."""
+    return {"Authorization": "Bearer test-api-key"}
+
+@pytest.fixture(autouse=True)
+def reset_state(mock_db):
+    """Reset rate limiting storage and stub database state around each test."""
     reset_rate_limit_storage()
-    
-    with patch('app.main.get_db', return_value=mock_db):
-        with TestClient(app) as client:
-            yield client
+    yield
+    mock_db.reset()
+
+# Keep the module on one xdist worker so its tests share the session client
+pytestmark = [
+    pytest.mark.asyncio(loop_scope="session"),
+    pytest.mark.xdist_group("fastapi_basic"),
+]
 
 # Test authentication
-def test_authentication_exempt_paths(test_client):
+async def test_authentication_exempt_paths(client):
     """Test that exempt paths don't require authentication."""
     exempt_paths = ["/", "/health", "/docs", "/redoc", "/openapi.json"]
     
-    for path in exempt_paths:
-        response = test_client.get(path)
+    responses = await asyncio.gather(*(client.get(path) for path in exempt_paths))
+    for response in responses:
         assert response.status_code == 200
 
-def test_authentication_required_for_protected_endpoints(test_client):
+async def test_authentication_required_for_protected_endpoints(client):
     """Test that protected endpoints require authentication."""
     protected_endpoints = [
         "/conversations",
@@ -58,215 +124,125 @@ def test_authentication_required_for_protected_endpoints(test_client):
     ]
     
     for endpoint in protected_endpoints:
-        response = test_client.post(endpoint, json={})
+        response = await client.post(endpoint, json={})
         assert response.status_code == 401
         data = response.json()
         assert data["detail"] == "Authorization header required"
 
-def test_authentication_invalid_header_format(test_client):
+async def test_authentication_invalid_header_format(client):
     """Test authentication with invalid header format."""
     headers = {"Authorization": "InvalidFormat"}
-    response = test_client.post("/conversations", json={}, headers=headers)
+    response = await client.post("/conversations", json={}, headers=headers)
     assert response.status_code == 401
     data = response.json()
     assert data["detail"] == "Invalid authorization header format"
 
-def test_authentication_valid_api_key(test_client):
+async def test_authentication_valid_api_key(client, auth_headers):
     """Test authentication with valid API key."""
-    # Mock the API key environment variable
-    with patch.dict('os.environ', {'API_KEY': 'test-api-key'}):
-        headers = {"Authorization": "Bearer test-api-key"}
-        import uuid
-        unique_id = f"test_conv_{uuid.uuid4().hex[:8]}"
-        response = test_client.post("/conversations", json={
-            "conversation_id": unique_id,
-            "metadata": {"test": "data"}
-        }, headers=headers)
-        assert response.status_code == 200
+    unique_id = _conv_id()
+    response = await client.post("/conversations", json={
+        "conversation_id": unique_id,
+        "metadata": {"test": "data"}
+    }, headers=auth_headers)
+    assert response.status_code == 200
 
-def test_authentication_invalid_api_key(test_client):
+async def test_authentication_invalid_api_key(client):
     """Test authentication with invalid API key."""
-    # Mock the API key environment variable
-    with patch.dict('os.environ', {'API_KEY': 'test-api-key'}):
-        headers = {"Authorization": "Bearer wrong-api-key"}
-        response = test_client.post("/conversations", json={}, headers=headers)
-        assert response.status_code == 401
-        data = response.json()
-        assert data["detail"] == "Invalid API key"
+    headers = {"Authorization": "Bearer wrong-api-key"}
+    response = await client.post("/conversations", json={}, headers=headers)
+    assert response.status_code == 401
+    data = response.json()
+    assert data["detail"] == "Invalid API key"
 
 # Test enhanced validation
-def test_conversation_id_validation(test_client):
-    """Test conversation ID validation."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    # Test empty conversation ID
-    response = test_client.post("/conversations", json={
-        "conversation_id": "",
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test conversation ID with invalid characters
-    response = test_client.post("/conversations", json={
-        "conversation_id": "test@conv#123",
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test conversation ID too long
-    long_id = "a" * 101
-    response = test_client.post("/conversations", json={
-        "conversation_id": long_id,
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-
-def test_message_content_validation(test_client):
-    """Test message content validation."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    # Test empty message content
-    response = test_client.post("/conversations/test_conv_123/messages", json={
-        "role": "user",
-        "content": "",
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test message content with harmful patterns
-    response = test_client.post("/conversations/test_conv_123/messages", json={
-        "role": "user",
-        "content": "Hello <script>alert('xss')</script>",
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test message content too long
-    long_content = "a" * 10001
-    response = test_client.post("/conversations/test_conv_123/messages", json={
-        "role": "user",
-        "content": long_content,
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-
-def test_url_validation(test_client):
-    """Test URL validation for web sources."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    # Test invalid URL format
-    response = test_client.post("/tool-calls/1/web-sources", json={
-        "url": "invalid-url",
-        "title": "Test Title",
-        "snippet": "Test snippet"
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test empty URL
-    response = test_client.post("/tool-calls/1/web-sources", json={
-        "url": "",
-        "title": "Test Title",
-        "snippet": "Test snippet"
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test URL too long
-    long_url = "https://example.com/" + "a" * 2049  # Make it longer than 2048 characters
-    response = test_client.post("/tool-calls/1/web-sources", json={
-        "url": long_url,
-        "title": "Test Title",
-        "snippet": "Test snippet"
-    }, headers=headers)
-    assert response.status_code == 422
-
-def test_audio_file_path_validation(test_client):
-    """Test audio file path validation."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    # Test invalid audio file format
-    response = test_client.post("/conversations/test_conv_123/mashups", json={
-        "title": "Test Mashup",
-        "description": "Test description",
-        "audio_file_path": "test.txt"
-    }, headers=headers)
-    assert response.status_code == 422
-    
-    # Test valid audio file format
-    response = test_client.post("/conversations/test_conv_123/mashups", json={
-        "title": "Test Mashup",
-        "description": "Test description",
-        "audio_file_path": "test.mp3"
-    }, headers=headers)
-    # This should pass validation (though may fail at database level)
-
-def test_metadata_size_validation(test_client):
-    """Test metadata size validation."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    # Test metadata too large
-    large_metadata = {"data": "a" * 1001}
-    response = test_client.post("/conversations", json={
-        "conversation_id": "test_conv_123",
-        "metadata": large_metadata
-    }, headers=headers)
-    assert response.status_code == 422
+@pytest.mark.parametrize("endpoint,payload,expected", [
+    # Conversation ID validation
+    ("/conversations", {"conversation_id": "", "metadata": {"test": "data"}}, 422),
+    ("/conversations", {"conversation_id": "test@conv#123", "metadata": {"test": "data"}}, 422),
+    ("/conversations", {"conversation_id": LONG_CONVERSATION_ID, "metadata": {"test": "data"}}, 422),
+    # Message content validation
+    ("/conversations/test_conv_123/messages",
+     {"role": "user", "content": "", "metadata": {"test": "data"}}, 422),
+    ("/conversations/test_conv_123/messages",
+     {"role": "user", "content": "Hello <script>alert('xss')</script>", "metadata": {"test": "data"}}, 422),
+    ("/conversations/test_conv_123/messages",
+     {"role": "user", "content": LONG_MESSAGE_CONTENT, "metadata": {"test": "data"}}, 422),
+    # URL validation for web sources
+    ("/tool-calls/1/web-sources", {"url": "invalid-url", "title": "Test Title", "snippet": "Test snippet"}, 422),
+    ("/tool-calls/1/web-sources", {"url": "", "title": "Test Title", "snippet": "Test snippet"}, 422),
+    ("/tool-calls/1/web-sources",
+     {"url": LONG_URL, "title": "Test Title", "snippet": "Test snippet"}, 422),
+    # Audio file path validation
+    ("/conversations/test_conv_123/mashups",
+     {"title": "Test Mashup", "description": "Test description", "audio_file_path": "test.txt"}, 422),
+    ("/conversations/test_conv_123/mashups",
+     {"title": "Test Mashup", "description": "Test description", "audio_file_path": "test.mp3"}, 200),
+    # Metadata size validation
+    ("/conversations", {"conversation_id": "test_conv_123", "metadata": LARGE_METADATA}, 422),
+], ids=[
+    "conversation-id-empty",
+    "conversation-id-invalid-chars",
+    "conversation-id-too-long",
+    "message-content-empty",
+    "message-content-harmful",
+    "message-content-too-long",
+    "url-invalid-format",
+    "url-empty",
+    "url-too-long",
+    "audio-file-invalid-format",
+    "audio-file-valid-format",
+    "metadata-too-large",
+])
+async def test_request_validation(client, auth_headers, endpoint, payload, expected):
+    """Test request body validation across endpoints."""
+    response = await client.post(endpoint, json=payload, headers=auth_headers)
+    assert response.status_code == expected
+    if expected == 422:
+        assert "detail" in response.json()
 
 # Test rate limiting
-def test_rate_limiting(test_client):
+async def test_rate_limiting(client, auth_headers, monkeypatch):
     """Test rate limiting functionality."""
-    headers = {"Authorization": "Bearer test-api-key"}
+    # Fill the limit up to one below the 60 requests per minute threshold
+    monkeypatch.setitem(rate_limit_storage, TEST_CLIENT_HOST, [time.time()] * 59)
     
-    # Reset rate limit storage
-    from app.main import reset_rate_limit_storage
-    reset_rate_limit_storage()
+    # The 60th request is still allowed
+    response = await client.post("/conversations", json={
+        "conversation_id": "rate_limit_test_60",
+        "metadata": {"test": "data"}
+    }, headers=auth_headers)
+    assert response.status_code in [200, 500]  # 500 is expected due to mocked DB
     
-    # Make multiple requests quickly
-    for i in range(65):  # Exceed the 60 requests per minute limit
-        response = test_client.post("/conversations", json={
-            "conversation_id": f"rate_limit_test_{i}_{int(time.time())}",
-            "metadata": {"test": "data"}
-        }, headers=headers)
-        
-        if i >= 60:
-            assert response.status_code == 429
-            data = response.json()
-            assert data["detail"] == "Rate limit exceeded. Please try again later."
-        else:
-            assert response.status_code in [200, 500]  # 500 is expected due to mocked DB
+    # The 61st request is rejected
+    response = await client.post("/conversations", json={
+        "conversation_id": "rate_limit_test_61",
+        "metadata": {"test": "data"}
+    }, headers=auth_headers)
+    assert response.status_code == 429
+    data = response.json()
+    assert data["detail"] == "Rate limit exceeded. Please try again later."
 
 # Test response formatting
-def test_standardized_error_responses(test_client):
+async def test_standardized_error_responses(client, auth_headers):
     """Test standardized error response format."""
     # Test 404 error (with authentication)
-    headers = {"Authorization": "Bearer test-api-key"}
-    response = test_client.get("/conversations/nonexistent", headers=headers)
+    response = await client.get("/conversations/nonexistent", headers=auth_headers)
     assert response.status_code == 404
     data = response.json()
     assert "status" in data
     assert "message" in data
     assert "timestamp" in data
     assert data["status"] == "error"
+    assert data["detail"] == "Conversation not found"
     
     # Test 401 error (without authentication)
-    response = test_client.post("/conversations", json={})
+    response = await client.post("/conversations", json={})
     assert response.status_code == 401
 
-def test_standardized_success_responses(test_client):
-    """Test standardized success response format."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    response = test_client.get("/", headers=headers)
-    assert response.status_code == 200
-    data = response.json()
-    assert "name" in data
-    assert "version" in data
-    assert "description" in data
-    assert "status" in data
-
 # Test enhanced health check
-def test_health_endpoint_with_database_status(test_client):
+async def test_health_endpoint_with_database_status(client):
     """Test the enhanced health check endpoint."""
-    response = test_client.get("/health")
+    response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
@@ -275,25 +251,22 @@ def test_health_endpoint_with_database_status(test_client):
     assert "database_status" in data
 
 # Test API documentation
-def test_openapi_documentation(test_client):
+async def test_openapi_documentation(client, openapi_schema):
     """Test that OpenAPI documentation is available and enhanced."""
-    response = test_client.get("/docs")
-    assert response.status_code == 200
-    
-    response = test_client.get("/redoc")
-    assert response.status_code == 200
+    # Check the doc routes are mounted rather than rendering their HTML
+    route_paths = {route.path for route in app.routes}
+    assert "/docs" in route_paths
+    assert "/redoc" in route_paths
     
-    response = test_client.get("/openapi.json")
-    assert response.status_code == 200
-    data = response.json()
-    assert "info" in data
+    data = openapi_schema
+    assert data["info"]["title"]
     assert "paths" in data
     assert "components" in data
 
 # Test root endpoint
-def test_root_endpoint(test_client):
+async def test_root_endpoint(client):
     """Test the root endpoint with enhanced information."""
-    response = test_client.get("/")
+    response = await client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == "Lit Music Mashup Conversational API"
@@ -302,59 +275,45 @@ def test_root_endpoint(test_client):
     assert "description" in data
 
 # Test conversation endpoints with authentication
-def test_create_conversation_with_auth(test_client):
+async def test_create_conversation_with_auth(client, auth_headers):
     """Test creating a new conversation with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    import uuid
     conversation_data = {
-        "conversation_id": f"test_conv_{uuid.uuid4().hex[:8]}",
+        "conversation_id": _conv_id(),
         "metadata": {"test": "data"}
     }
-    response = test_client.post("/conversations", json=conversation_data, headers=headers)
+    response = await client.post("/conversations", json=conversation_data, headers=auth_headers)
     assert response.status_code == 200
     data = response.json()
     assert data["conversation_id"] == conversation_data["conversation_id"]
     assert data["phase"] == "initial"
     assert data["message_count"] == 0
 
-def test_get_conversation_with_auth(test_client):
+async def test_get_conversation_with_auth(client, auth_headers):
     """Test getting a conversation with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    import uuid
     # First create a conversation
-    conversation_id = f"test_conv_{uuid.uuid4().hex[:8]}"
+    conversation_id = _conv_id()
     conversation_data = {
         "conversation_id": conversation_id,
         "metadata": {"test": "data"}
     }
-    test_client.post("/conversations", json=conversation_data, headers=headers)
+    await client.post("/conversations", json=conversation_data, headers=auth_headers)
     
     # Then get it
-    response = test_client.get(f"/conversations/{conversation_id}", headers=headers)
+    response = await client.get(f"/conversations/{conversation_id}", headers=auth_headers)
     assert response.status_code == 200
     data = response.json()
     assert data["conversation_id"] == conversation_id
     assert data["phase"] == "initial"
 
-def test_get_nonexistent_conversation_with_auth(test_client):
-    """Test getting a conversation that doesn't exist with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    response = test_client.get("/conversations/nonexistent", headers=headers)
-    assert response.status_code == 404
-    data = response.json()
-    assert data["detail"] == "Conversation not found"
-
 # Test chat endpoint with authentication
-def test_chat_endpoint_with_auth(test_client):
+async def test_chat_endpoint_with_auth(client, auth_headers):
     """Test the chat endpoint with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
     # This test is complex due to dependency injection. For now, we'll test the endpoint exists
     # and returns a proper response structure, even if it's an error due to missing dependencies.
-    response = test_client.post("/api/v1/chat", json={
+    response = await client.post("/api/v1/chat", json={
         "message": "Hello",
         "session_id": "test_session"
-    }, headers=headers)
+    }, headers=auth_headers)
     
     # The endpoint should respond (even if with an error) rather than crash
     assert response.status_code in [200, 500]  # Accept either success or server error
@@ -362,23 +321,19 @@ def test_chat_endpoint_with_auth(test_client):
     assert "detail" in data or "response" in data  # Should have either error detail or response
 
 # Test tool statistics endpoint with authentication
-def test_tool_statistics_with_auth(test_client):
+async def test_tool_statistics_with_auth(client, auth_headers):
     """Test the tool statistics endpoint with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
     # This test is complex due to dependency injection. For now, we'll test the endpoint exists
     # and returns a proper response structure, even if it's an error due to missing dependencies.
-    response = test_client.get("/api/v1/tools/statistics", headers=headers)
+    response = await client.get("/api/v1/tools/statistics", headers=auth_headers)
     
     # The endpoint should respond (even if with an error) rather than crash
     assert response.status_code in [200, 500]  # Accept either success or server error
     data = response.json()
     assert "total_tool_calls" in data or "detail" in data  # Should have either stats or error detail
 
-def test_web_search_status_with_auth(test_client):
+async def test_web_search_status_with_auth(client, auth_headers):
     """Test the web search status endpoint with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
     # Mock the web search service
     with patch('app.main.get_web_search_service') as mock_web_search:
         mock_web_search_instance = AsyncMock()
@@ -389,17 +344,15 @@ def test_web_search_status_with_auth(test_client):
         }
         mock_web_search.return_value = mock_web_search_instance
     
-        response = test_client.get("/api/v1/web-search/status", headers=headers)
+        response = await client.get("/api/v1/web-search/status", headers=auth_headers)
         assert response.status_code == 200
         data = response.json()
         assert "status" in data
         assert "data" in data
         assert "api_key_configured" in data["data"]
 
-def test_web_search_search_with_auth(test_client):
+async def test_web_search_search_with_auth(client, auth_headers):
     """Test the web search endpoint with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
     # Mock the web search service
     with patch('app.main.get_web_search_service') as mock_web_search:
         mock_web_search_instance = AsyncMock()
@@ -415,37 +368,22 @@ def test_web_search_search_with_auth(test_client):
         }
         mock_web_search.return_value = mock_web_search_instance
     
-        response = test_client.post("/api/v1/web-search/search",
+        response = await client.post("/api/v1/web-search/search",
                                   params={"query": "music theory"},
-                                  headers=headers)
+                                  headers=auth_headers)
         assert response.status_code == 200
         data = response.json()
         assert "data" in data
         assert "results" in data["data"]
 
 # Test error handling
-def test_validation_error_handling(test_client):
-    """Test validation error handling."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    # Test invalid request data
-    response = test_client.post("/conversations", json={
-        "conversation_id": "",  # Invalid empty ID
-        "metadata": {"test": "data"}
-    }, headers=headers)
-    assert response.status_code == 422
-    data = response.json()
-    assert "detail" in data
-
-def test_global_exception_handling(test_client):
+async def test_global_exception_handling(client, mock_db, auth_headers):
     """Test global exception handling."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
     # Mock database to raise an exception for a different endpoint
-    with patch('app.main.get_db', side_effect=Exception("Database error")):
-        response = test_client.post("/conversations", json={
+    with patch.object(mock_db, 'create_conversation', side_effect=Exception("Database error")):
+        response = await client.post("/conversations", json={
             "conversation_id": "test_conv"
-        }, headers=headers)
+        }, headers=auth_headers)
         # The endpoint might return 400 for validation errors, so we'll check for either 400 or 500
         assert response.status_code in [400, 500]
         data = response.json()
@@ -458,50 +396,30 @@ def test_global_exception_handling(test_client):
             assert "detail" in data
 
 # Test session management
-def test_session_management_with_auth(test_client):
+async def test_session_management_with_auth(client, auth_headers):
     """Test session management with authentication."""
-    headers = {"Authorization": "Bearer test-api-key"}
-    
-    response = test_client.get("/api/v1/session/test_session", headers=headers)
+    response = await client.get("/api/v1/session/test_session", headers=auth_headers)
     # Should return 404 for non-existent session, but with proper error format
     assert response.status_code == 404
     data = response.json()
     assert "detail" in data
 
 # Performance tests
-def test_response_time_performance(test_client):
+async def test_response_time_performance(client):
     """Test that responses are returned within reasonable time."""
-    import time
     
     start_time = time.time()
-    response = test_client.get("/health")
+    response = await client.get("/health")
     end_time = time.time()
     
     assert response.status_code == 200
     assert (end_time - start_time) < 1.0  # Should respond within 1 second
 
-def test_concurrent_requests(test_client):
+async def test_concurrent_requests(client):
     """Test handling of concurrent requests."""
-    import threading
-    import time
-    
-    results = []
-    
-    def make_request():
-        response = test_client.get("/health")
-        results.append(response.status_code)
-    
-    # Start multiple threads
-    threads = []
-    for i in range(5):
-        thread = threading.Thread(target=make_request)
-        threads.append(thread)
-        thread.start()
-    
-    # Wait for all threads to complete
-    for thread in threads:
-        thread.join()
+    responses = await asyncio.gather(*(client.get("/health") for _ in range(5)))
+    results = [response.status_code for response in responses]
     
     # All requests should succeed
     assert all(status == 200 for status in results)
-    assert len(results) == 5 
\ No newline at end of file
+    assert len(results) == 5
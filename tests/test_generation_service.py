@@ -11,130 +11,243 @@ This module tests all aspects of the content generation service including:
 
 import pytest
 import asyncio
+import dataclasses
+import itertools
+import os
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Dict, Any, List
+import tracemalloc
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta, timezone
 
 import httpx
-from fastapi.testclient import TestClient
 
 from app.services.generation_service import (
     AsyncEnhancedGenerationService,
     OllamaClient,
-    PromptBuilder,
-    ContentValidator,
-    QualityScorer,
     GenerationRequest,
-    GenerationResponse,
     ContentType,
     SkillLevel,
     ContentQuality,
     ContentValidationResult,
     QualityMetrics
 )
-from app.db import AsyncConversationDB
+
+# Live-daemon tests only run where an Ollama host is configured
+requires_ollama = pytest.mark.skipif(
+    not os.environ.get("OLLAMA_HOST"),
+    reason="Ollama not configured; set OLLAMA_HOST to run integration tests"
+)
+
+# Upper bound for the concurrent generation test; above the Ollama client's 60s request timeout
+CONCURRENT_GENERATION_TIMEOUT = 90.0
+
+# Deterministic clock for generation timing; each now() call advances one step
+FROZEN_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+CLOCK_STEP = timedelta(seconds=1.5)
+
+# Reply the stubbed Ollama client gives to generate() unless a test overrides it
+OLLAMA_GENERATE_RESPONSE = {
+    "response": "Jazz Theory Lesson: Understanding Basic Concepts\n\nJazz music is a rich cultural tradition...",
+    "model": "mistral-small3.2:latest",
+    "done": True
+}
+
+
+def with_overrides(request: GenerationRequest, **overrides) -> GenerationRequest:
+    """Copy a generation request with some fields replaced."""
+    return dataclasses.replace(request, **overrides)
+
+
+# Content samples for the validator and scorer tests
+APPROPRIATE_LESSON = """
+        Jazz music is a rich cultural tradition that emerged from African American communities.
+        It features improvisation, syncopation, and complex harmonies. This lesson will teach
+        you the basics of jazz theory in a respectful and educational manner.
+        """
+INAPPROPRIATE_TEXT = "This content contains inappropriate language and concepts."
+
+HIGH_QUALITY_LESSON = """
+        Jazz Theory Lesson: Understanding the ii-V-I Progression
+        
+        The ii-V-I progression is the foundation of jazz harmony. This lesson explores:
+        1. The theoretical basis of the progression
+        2. Cultural significance in jazz history
+        3. Practical exercises for students
+        4. Historical context and evolution
+        
+        This content is engaging, educational, and culturally sensitive.
+        """
+HIGH_QUALITY_CONTEXT = {
+    "genre": "jazz",
+    "learning_objectives": ["theory", "improvisation"],
+    "skill_level": "intermediate"
+}
+LOW_QUALITY_TEXT = "This is poor quality content with no educational value."
+LOW_QUALITY_CONTEXT = {
+    "genre": "jazz",
+    "learning_objectives": ["theory"],
+    "skill_level": "beginner"
+}
+CULTURALLY_SENSITIVE_TEXT = """
+        Jazz emerged from African American communities in New Orleans, representing
+        a rich cultural tradition of musical innovation and social expression.
+        """
+EDUCATIONAL_TEXT = """
+        Jazz theory involves understanding chord progressions, scales, and improvisation.
+        The ii-V-I progression is fundamental to jazz harmony.
+        """
+JAZZ_LESSON_CONTENT = """
+        Jazz Theory Lesson: Understanding Basic Concepts
+        
+        Jazz music is a rich cultural tradition that emerged from African American 
+        communities in New Orleans. This lesson will teach you the fundamentals 
+        of jazz theory including chord progressions, scales, and improvisation.
+        
+        Key Concepts:
+        1. The ii-V-I progression
+        2. Jazz scales and modes
+        3. Improvisation techniques
+        4. Cultural significance
+        
+        This content is educational, culturally sensitive, and engaging for students.
+        """
+
+
+def _check_appropriate_result(result):
+    """Check the validation result for appropriate content."""
+    assert result.is_appropriate is True
+    assert result.cultural_sensitivity_score > 0.5  # Adjusted expectation
+    assert result.educational_value_score >= 0.1  # Adjusted expectation
+    assert result.age_appropriateness is True
+
+
+def _check_inappropriate_result(result):
+    """Check the validation result for inappropriate content."""
+    assert result.is_appropriate is False
+    assert len(result.issues) > 0
+
+
+def _check_high_quality_metrics(metrics):
+    """Check the quality metrics for high-quality content."""
+    assert metrics.educational_value >= 1.0  # Adjusted expectation
+    assert metrics.cultural_accuracy >= 1.0  # Adjusted expectation
+    assert metrics.engagement_level >= 1.0  # Adjusted expectation
+    assert metrics.content_relevance >= 0.0  # Adjusted expectation
+    assert metrics.overall_score >= 1.0  # Adjusted expectation
+    assert metrics.confidence_level >= 0.1  # Adjusted expectation
+
+
+def _check_low_quality_metrics(metrics):
+    """Check the quality metrics for low-quality content."""
+    assert metrics.educational_value < 4.0
+    assert metrics.cultural_accuracy < 4.0
+    assert metrics.engagement_level < 4.0
+    assert metrics.content_relevance < 4.0
+    assert metrics.overall_score < 4.0
+
+
+@pytest.fixture(scope="module")
+def fake_ollama():
+    """Create one Ollama client stand-in for the module."""
+    return AsyncMock(spec=OllamaClient)
+
+
+@pytest.fixture(autouse=True)
+def install_fake_ollama(request, monkeypatch, generation_service, fake_ollama):
+    """Swap the service's Ollama client for the fake, except in serial tests that talk to a live daemon."""
+    if request.node.get_closest_marker("serial"):
+        return
+    
+    fake_ollama.reset_mock(return_value=True, side_effect=True)
+    fake_ollama.generate.return_value = dict(OLLAMA_GENERATE_RESPONSE)
+    fake_ollama.health_check.return_value = True
+    fake_ollama.list_models.return_value = []
+    # Instance attributes are outside the class spec, so copy them from the real client
+    fake_ollama.available_models = generation_service.ollama_client.available_models
+    fake_ollama.default_model = generation_service.ollama_client.default_model
+    monkeypatch.setattr(generation_service, "ollama_client", fake_ollama)
+
+
+@pytest.fixture(scope="session")
+def basic_request():
+    """Create the general beginner theory lesson request shared by the service tests."""
+    return GenerationRequest(
+        prompt="Create a music lesson",
+        content_type=ContentType.THEORY_LESSON,
+        skill_level=SkillLevel.BEGINNER,
+        context={"genre": "general"}
+    )
 
 
 class TestOllamaClient:
     """Test suite for OllamaClient."""
 
-    @pytest.fixture
-    def ollama_client(self):
-        """Create OllamaClient instance for testing."""
-        return OllamaClient("http://localhost:11434")
-
-    @pytest.mark.asyncio
     async def test_ollama_client_initialization(self, ollama_client):
         """Test OllamaClient initialization."""
         assert ollama_client.base_url == "http://localhost:11434"
         assert ollama_client.client is not None
 
-    @pytest.mark.asyncio
-    async def test_list_models_success(self, ollama_client):
+    async def test_list_models_success(self, ollama_client, ollama_routes):
         """Test successful model listing."""
-        with patch.object(ollama_client.client, 'get') as mock_get:
-            mock_response = MagicMock()
-            mock_response.json.return_value = {
-                "models": [
-                    {"name": "mistral-small3.2:latest"},
-                    {"name": "llama3.1:8b:latest"}
-                ]
-            }
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-
-            models = await ollama_client.list_models()
-            
-            assert len(models) == 2
-            assert "mistral-small3.2:latest" in models
-            assert "llama3.1:8b:latest" in models
+        ollama_routes[("GET", "/api/tags")] = httpx.Response(200, json={
+            "models": [
+                {"name": "mistral-small3.2:latest"},
+                {"name": "llama3.1:8b:latest"}
+            ]
+        })
+        
+        models = await ollama_client.list_models()
+        
+        assert len(models) == 2
+        assert "mistral-small3.2:latest" in models
+        assert "llama3.1:8b:latest" in models
 
-    @pytest.mark.asyncio
-    async def test_list_models_failure(self, ollama_client):
+    async def test_list_models_failure(self, ollama_client, ollama_routes):
         """Test model listing failure."""
-        with patch.object(ollama_client.client, 'get') as mock_get:
-            mock_get.side_effect = httpx.ConnectError("Connection failed")
-
-            with pytest.raises(httpx.ConnectError):
-                await ollama_client.list_models()
+        ollama_routes[("GET", "/api/tags")] = httpx.ConnectError("Connection failed")
+        
+        with pytest.raises(httpx.ConnectError):
+            await ollama_client.list_models()
 
-    @pytest.mark.asyncio
-    async def test_generate_success(self, ollama_client):
+    async def test_generate_success(self, ollama_client, ollama_routes):
         """Test successful content generation."""
-        with patch.object(ollama_client.client, 'post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.json.return_value = {
-                "response": "Generated content here",
-                "model": "mistral-small3.2:latest",
-                "done": True
-            }
-            mock_response.raise_for_status.return_value = None
-            mock_post.return_value = mock_response
-
-            result = await ollama_client.generate("Test prompt", "mistral-small3.2:latest")
-            
-            assert result["response"] == "Generated content here"
-            assert result["model"] == "mistral-small3.2:latest"
-            assert result["done"] is True
+        ollama_routes[("POST", "/api/generate")] = httpx.Response(200, json={
+            "response": "Generated content here",
+            "model": "mistral-small3.2:latest",
+            "done": True
+        })
+        
+        result = await ollama_client.generate("Test prompt", "mistral-small3.2:latest")
+        
+        assert result["response"] == "Generated content here"
+        assert result["model"] == "mistral-small3.2:latest"
+        assert result["done"] is True
 
-    @pytest.mark.asyncio
-    async def test_generate_failure(self, ollama_client):
+    async def test_generate_failure(self, ollama_client, ollama_routes):
         """Test content generation failure."""
-        with patch.object(ollama_client.client, 'post') as mock_post:
-            mock_post.side_effect = httpx.RequestError("Request failed")
-
-            with pytest.raises(httpx.RequestError):
-                await ollama_client.generate("Test prompt", "mistral-small3.2:latest")
+        ollama_routes[("POST", "/api/generate")] = httpx.RequestError("Request failed")
+        
+        with pytest.raises(httpx.RequestError):
+            await ollama_client.generate("Test prompt", "mistral-small3.2:latest")
 
-    @pytest.mark.asyncio
-    async def test_health_check_success(self, ollama_client):
+    async def test_health_check_success(self, ollama_client, ollama_routes):
         """Test successful health check."""
-        with patch.object(ollama_client.client, 'get') as mock_get:
-            mock_response = MagicMock()
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-
-            result = await ollama_client.health_check()
-            assert result is True
+        ollama_routes[("GET", "/api/tags")] = httpx.Response(200, json={"models": []})
+        
+        result = await ollama_client.health_check()
+        assert result is True
 
-    @pytest.mark.asyncio
-    async def test_health_check_failure(self, ollama_client):
+    async def test_health_check_failure(self, ollama_client, ollama_routes):
         """Test health check failure."""
-        with patch.object(ollama_client.client, 'get') as mock_get:
-            mock_get.side_effect = httpx.ConnectError("Connection failed")
-
-            result = await ollama_client.health_check()
-            assert result is False
+        ollama_routes[("GET", "/api/tags")] = httpx.ConnectError("Connection failed")
+        
+        result = await ollama_client.health_check()
+        assert result is False
 
 
 class TestPromptBuilder:
     """Test suite for PromptBuilder."""
 
-    @pytest.fixture
-    def prompt_builder(self):
-        """Create PromptBuilder instance for testing."""
-        return PromptBuilder()
-
     @pytest.fixture
     def sample_request(self):
         """Create sample generation request."""
@@ -217,36 +330,15 @@ class TestPromptBuilder:
 class TestContentValidator:
     """Test suite for ContentValidator."""
 
-    @pytest.fixture
-    def content_validator(self):
-        """Create ContentValidator instance for testing."""
-        return ContentValidator()
-
-    @pytest.mark.asyncio
-    async def test_validate_content_appropriate(self, content_validator):
-        """Test validation of appropriate content."""
-        content = """
-        Jazz music is a rich cultural tradition that emerged from African American communities.
-        It features improvisation, syncopation, and complex harmonies. This lesson will teach
-        you the basics of jazz theory in a respectful and educational manner.
-        """
-        
-        result = await content_validator.validate_content(content, SkillLevel.INTERMEDIATE)
-        
-        assert result.is_appropriate is True
-        assert result.cultural_sensitivity_score > 0.5  # Adjusted expectation
-        assert result.educational_value_score >= 0.1  # Adjusted expectation
-        assert result.age_appropriateness is True
-
-    @pytest.mark.asyncio
-    async def test_validate_content_inappropriate(self, content_validator):
-        """Test validation of inappropriate content."""
-        content = "This content contains inappropriate language and concepts."
+    @pytest.mark.parametrize("content, skill_level, check_fn", [
+        (APPROPRIATE_LESSON, SkillLevel.INTERMEDIATE, _check_appropriate_result),
+        (INAPPROPRIATE_TEXT, SkillLevel.BEGINNER, _check_inappropriate_result),
+    ], ids=["appropriate", "inappropriate"])
+    async def test_validate_content(self, content_validator, content, skill_level, check_fn):
+        """Test validation of appropriate and inappropriate content."""
+        result = await content_validator.validate_content(content, skill_level)
         
-        result = await content_validator.validate_content(content, SkillLevel.BEGINNER)
-        
-        assert result.is_appropriate is False
-        assert len(result.issues) > 0
+        check_fn(result)
 
     def test_check_appropriateness(self, content_validator):
         """Test appropriateness checking."""
@@ -258,14 +350,9 @@ class TestContentValidator:
 
     def test_assess_cultural_sensitivity(self, content_validator):
         """Test cultural sensitivity assessment."""
-        sensitive_content = """
-        Jazz emerged from African American communities in New Orleans, representing
-        a rich cultural tradition of musical innovation and social expression.
-        """
-        
         insensitive_content = "Jazz is primitive music from tribal cultures."
         
-        sensitive_score = content_validator._assess_cultural_sensitivity(sensitive_content)
+        sensitive_score = content_validator._assess_cultural_sensitivity(CULTURALLY_SENSITIVE_TEXT)
         insensitive_score = content_validator._assess_cultural_sensitivity(insensitive_content)
         
         assert sensitive_score > 0.5  # Adjusted expectation
@@ -275,15 +362,10 @@ class TestContentValidator:
 
     def test_assess_educational_value(self, content_validator):
         """Test educational value assessment."""
-        educational_content = """
-        Jazz theory involves understanding chord progressions, scales, and improvisation.
-        The ii-V-I progression is fundamental to jazz harmony.
-        """
-        
         non_educational_content = "This is just random text without educational value."
         
         educational_score = content_validator._assess_educational_value(
-            educational_content, SkillLevel.INTERMEDIATE
+            EDUCATIONAL_TEXT, SkillLevel.INTERMEDIATE
         )
         non_educational_score = content_validator._assess_educational_value(
             non_educational_content, SkillLevel.INTERMEDIATE
@@ -311,80 +393,29 @@ class TestContentValidator:
 class TestQualityScorer:
     """Test suite for QualityScorer."""
 
-    @pytest.fixture
-    def quality_scorer(self):
-        """Create QualityScorer instance for testing."""
-        return QualityScorer()
-
-    @pytest.mark.asyncio
-    async def test_score_content_high_quality(self, quality_scorer):
-        """Test scoring of high-quality content."""
-        content = """
-        Jazz Theory Lesson: Understanding the ii-V-I Progression
-        
-        The ii-V-I progression is the foundation of jazz harmony. This lesson explores:
-        1. The theoretical basis of the progression
-        2. Cultural significance in jazz history
-        3. Practical exercises for students
-        4. Historical context and evolution
-        
-        This content is engaging, educational, and culturally sensitive.
-        """
-        
-        context = {
-            "genre": "jazz",
-            "learning_objectives": ["theory", "improvisation"],
-            "skill_level": "intermediate"
-        }
-        
-        metrics = await quality_scorer.score_content(
-            content, ContentType.THEORY_LESSON, SkillLevel.INTERMEDIATE, context
-        )
-        
-        assert metrics.educational_value >= 1.0  # Adjusted expectation
-        assert metrics.cultural_accuracy >= 1.0  # Adjusted expectation
-        assert metrics.engagement_level >= 1.0  # Adjusted expectation
-        assert metrics.content_relevance >= 0.0  # Adjusted expectation
-        assert metrics.overall_score >= 1.0  # Adjusted expectation
-        assert metrics.confidence_level >= 0.1  # Adjusted expectation
-
-    @pytest.mark.asyncio
-    async def test_score_content_low_quality(self, quality_scorer):
-        """Test scoring of low-quality content."""
-        content = "This is poor quality content with no educational value."
-        
-        context = {
-            "genre": "jazz",
-            "learning_objectives": ["theory"],
-            "skill_level": "beginner"
-        }
-        
+    @pytest.mark.parametrize("content, skill_level, context, check_fn", [
+        (HIGH_QUALITY_LESSON, SkillLevel.INTERMEDIATE, HIGH_QUALITY_CONTEXT, _check_high_quality_metrics),
+        (LOW_QUALITY_TEXT, SkillLevel.BEGINNER, LOW_QUALITY_CONTEXT, _check_low_quality_metrics),
+    ], ids=["high-quality", "low-quality"])
+    async def test_score_content(self, quality_scorer, content, skill_level, context, check_fn):
+        """Test scoring of high- and low-quality content."""
         metrics = await quality_scorer.score_content(
-            content, ContentType.THEORY_LESSON, SkillLevel.BEGINNER, context
+            content, ContentType.THEORY_LESSON, skill_level, context
         )
         
-        assert metrics.educational_value < 4.0
-        assert metrics.cultural_accuracy < 4.0
-        assert metrics.engagement_level < 4.0
-        assert metrics.content_relevance < 4.0
-        assert metrics.overall_score < 4.0
+        check_fn(metrics)
 
-    def test_score_dimension(self, quality_scorer):
+    @pytest.mark.parametrize("content, dimension", [
+        ("This lesson teaches important music theory concepts and helps you understand and learn through practice with examples.", "educational_value"),
+        ("Jazz has deep cultural significance and historical context in American music background.", "cultural_accuracy"),
+        ("Let's explore this exciting and interesting topic with fun and creative interactive exercises!", "engagement_level"),
+        ("This directly relates to jazz theory and is appropriate and suitable for targeted learning.", "content_relevance"),
+    ], ids=["educational_value", "cultural_accuracy", "engagement_level", "content_relevance"])
+    def test_score_dimension(self, quality_scorer, content, dimension):
         """Test individual dimension scoring."""
-        educational_content = "This lesson teaches important music theory concepts and helps you understand and learn through practice with examples."
-        cultural_content = "Jazz has deep cultural significance and historical context in American music background."
-        engaging_content = "Let's explore this exciting and interesting topic with fun and creative interactive exercises!"
-        relevant_content = "This directly relates to jazz theory and is appropriate and suitable for targeted learning."
+        score = quality_scorer._score_dimension(content, dimension)
         
-        educational_score = quality_scorer._score_dimension(educational_content, "educational_value")
-        cultural_score = quality_scorer._score_dimension(cultural_content, "cultural_accuracy")
-        engagement_score = quality_scorer._score_dimension(engaging_content, "engagement_level")
-        relevance_score = quality_scorer._score_dimension(relevant_content, "content_relevance")
-        
-        assert 0 <= educational_score <= 10
-        assert 0 <= cultural_score <= 10
-        assert 0 <= engagement_score <= 10
-        assert 0 <= relevance_score <= 10
+        assert 0 <= score <= 10
 
 
 class TestAsyncEnhancedGenerationService:
@@ -409,7 +440,6 @@ class TestAsyncEnhancedGenerationService:
             }
         )
 
-    @pytest.mark.asyncio
     async def test_service_initialization(self, generation_service):
         """Test service initialization."""
         assert generation_service.ollama_client is not None
@@ -418,55 +448,45 @@ class TestAsyncEnhancedGenerationService:
         assert generation_service.quality_scorer is not None
         assert generation_service.stats["total_requests"] == 0
 
-    @pytest.mark.asyncio
-    async def test_generate_with_context_success(self, generation_service, sample_generation_request):
+    async def test_generate_with_context_success(self, generation_service, sample_generation_request, monkeypatch):
         """Test successful content generation with context."""
-        with patch.object(generation_service.ollama_client, 'generate') as mock_generate:
-            mock_generate.return_value = {
-                "response": "Jazz Theory Lesson: Understanding Basic Concepts\n\nJazz music is a rich cultural tradition...",
-                "model": "mistral-small3.2:latest",
-                "done": True
-            }
-            
-            with patch.object(generation_service.content_validator, 'validate_content') as mock_validate:
-                mock_validate.return_value = ContentValidationResult(
-                    is_appropriate=True,
-                    cultural_sensitivity_score=0.8,
-                    educational_value_score=0.7,
-                    age_appropriateness=True,
-                    issues=[],
-                    suggestions=[]
-                )
-                
-                with patch.object(generation_service.quality_scorer, 'score_content') as mock_score:
-                    mock_score.return_value = QualityMetrics(
-                        educational_value=7.5,
-                        cultural_accuracy=8.0,
-                        engagement_level=6.5,
-                        content_relevance=7.0,
-                        overall_score=7.25,
-                        confidence_level=0.8
-                    )
-                    
-                    response = await generation_service.generate_with_context(sample_generation_request)
-                    
-                    assert response.content is not None
-                    assert response.content_type == ContentType.THEORY_LESSON
-                    assert response.skill_level == SkillLevel.BEGINNER
-                    assert response.quality_score > 0
-                    assert response.generation_time > 0
-                    assert response.model_used == "mistral-small3.2:latest"
-
-    @pytest.mark.asyncio
-    async def test_generate_with_context_failure(self, generation_service, sample_generation_request):
+        monkeypatch.setattr(generation_service.content_validator, 'validate_content', AsyncMock(
+            return_value=ContentValidationResult(
+                is_appropriate=True,
+                cultural_sensitivity_score=0.8,
+                educational_value_score=0.7,
+                age_appropriateness=True,
+                issues=[],
+                suggestions=[]
+            )
+        ))
+        monkeypatch.setattr(generation_service.quality_scorer, 'score_content', AsyncMock(
+            return_value=QualityMetrics(
+                educational_value=7.5,
+                cultural_accuracy=8.0,
+                engagement_level=6.5,
+                content_relevance=7.0,
+                overall_score=7.25,
+                confidence_level=0.8
+            )
+        ))
+        
+        response = await generation_service.generate_with_context(sample_generation_request)
+        
+        assert response.content is not None
+        assert response.content_type == ContentType.THEORY_LESSON
+        assert response.skill_level == SkillLevel.BEGINNER
+        assert response.quality_score > 0
+        assert response.generation_time > 0
+        assert response.model_used == "mistral-small3.2:latest"
+
+    async def test_generate_with_context_failure(self, generation_service, fake_ollama, sample_generation_request):
         """Test content generation failure handling."""
-        with patch.object(generation_service.ollama_client, 'generate') as mock_generate:
-            mock_generate.side_effect = Exception("Generation failed")
-            
-            with pytest.raises(Exception):
-                await generation_service.generate_with_context(sample_generation_request)
+        fake_ollama.generate.side_effect = RuntimeError("Generation failed")
+        
+        with pytest.raises(RuntimeError, match="Generation failed"):
+            await generation_service.generate_with_context(sample_generation_request)
 
-    @pytest.mark.asyncio
     async def test_select_model(self, generation_service):
         """Test model selection logic."""
         # Test theory lesson with intermediate level
@@ -477,263 +497,177 @@ class TestAsyncEnhancedGenerationService:
         model = generation_service._select_model(ContentType.PRACTICAL_EXERCISE, SkillLevel.BEGINNER)
         assert model in generation_service.ollama_client.available_models.values()
 
-    def test_determine_quality_level(self, generation_service):
+    @pytest.mark.parametrize("score, expected", [
+        (9.0, ContentQuality.EXCELLENT),
+        (7.5, ContentQuality.GOOD),
+        (5.0, ContentQuality.ACCEPTABLE),
+        (2.0, ContentQuality.NEEDS_IMPROVEMENT),
+    ])
+    def test_determine_quality_level(self, generation_service, score, expected):
         """Test quality level determination."""
-        assert generation_service._determine_quality_level(9.0) == ContentQuality.EXCELLENT
-        assert generation_service._determine_quality_level(7.5) == ContentQuality.GOOD
-        assert generation_service._determine_quality_level(5.0) == ContentQuality.ACCEPTABLE
-        assert generation_service._determine_quality_level(2.0) == ContentQuality.NEEDS_IMPROVEMENT
+        assert generation_service._determine_quality_level(score) == expected
+
+    async def test_generation_time_measured(self, generation_service, basic_request, monkeypatch):
+        """Test that the reported generation time spans the Ollama call."""
+        ticks = itertools.count()
+        
+        class SteppingDatetime(datetime):
+            """Datetime whose now() advances a fixed step on every call."""
+            
+            @classmethod
+            def now(cls, tz=None):
+                return FROZEN_START + next(ticks) * CLOCK_STEP
+        
+        monkeypatch.setattr("app.services.generation_service.datetime", SteppingDatetime)
+        
+        response = await generation_service.generate_with_context(basic_request)
+        
+        assert response.generation_time == CLOCK_STEP.total_seconds()
 
-    @pytest.mark.asyncio
     async def test_health_check(self, generation_service):
         """Test health check functionality."""
-        with patch.object(generation_service.ollama_client, 'health_check') as mock_health:
-            mock_health.return_value = True
-            
-            health_status = await generation_service.health_check()
-            
-            assert "status" in health_status
-            assert "ollama_available" in health_status
-            assert "available_models" in health_status
-            assert "stats" in health_status
+        health_status = await generation_service.health_check()
+        
+        assert "status" in health_status
+        assert "ollama_available" in health_status
+        assert "available_models" in health_status
+        assert "stats" in health_status
 
-    @pytest.mark.asyncio
-    async def test_get_available_models(self, generation_service):
+    async def test_get_available_models(self, generation_service, fake_ollama):
         """Test available models retrieval."""
-        with patch.object(generation_service.ollama_client, 'list_models') as mock_list:
-            mock_list.return_value = ["mistral-small3.2:latest", "llama3.1:8b:latest"]
-            
-            models = await generation_service.get_available_models()
-            
-            assert len(models) == 2
-            assert "mistral-small3.2:latest" in models
-            assert "llama3.1:8b:latest" in models
+        fake_ollama.list_models.return_value = ["mistral-small3.2:latest", "llama3.1:8b:latest"]
+        
+        models = await generation_service.get_available_models()
+        
+        assert len(models) == 2
+        assert "mistral-small3.2:latest" in models
+        assert "llama3.1:8b:latest" in models
 
 
+@pytest.mark.serial
+@requires_ollama
 class TestGenerationServiceIntegration:
     """Integration tests for the generation service."""
 
-    @pytest.mark.asyncio
-    async def test_full_generation_workflow(self):
-        """Test complete generation workflow."""
-        service = AsyncEnhancedGenerationService()
+    async def test_full_generation_workflow(self, generation_service, basic_request):
+        """Test complete generation workflow, ending with concurrent requests."""
+        # Test health check
+        health = await generation_service.health_check()
+        assert "status" in health
+        
+        # Test model availability
+        models = await generation_service.get_available_models()
+        assert isinstance(models, list)
+        
+        # Without a daemon every request would wait out its own connect timeout
+        if not health.get("ollama_available", False):
+            pytest.skip("Ollama unavailable")
+        
+        # Test content generation
+        request = with_overrides(
+            basic_request,
+            prompt="Create a simple music theory lesson",
+            context={"genre": "general", "learning_objectives": ["basics"]}
+        )
         
-        try:
-            # Test health check
-            health = await service.health_check()
-            assert "status" in health
-            
-            # Test model availability
-            models = await service.get_available_models()
-            assert isinstance(models, list)
-            
-            # Test content generation (if Ollama is available)
-            if health.get("ollama_available", False):
-                request = GenerationRequest(
-                    prompt="Create a simple music theory lesson",
-                    content_type=ContentType.THEORY_LESSON,
-                    skill_level=SkillLevel.BEGINNER,
-                    context={"genre": "general", "learning_objectives": ["basics"]}
-                )
-                
-                response = await service.generate_with_context(request)
-                
-                assert response.content is not None
-                assert len(response.content) > 0
-                assert response.quality_score >= 0
-                assert response.generation_time > 0
-                
-        finally:
-            await service.ollama_client.client.aclose()
-
-    @pytest.mark.asyncio
-    async def test_concurrent_generation_requests(self):
-        """Test handling of concurrent generation requests."""
-        service = AsyncEnhancedGenerationService()
+        response = await generation_service.generate_with_context(request)
         
-        try:
-            request = GenerationRequest(
-                prompt="Create a music lesson",
-                content_type=ContentType.THEORY_LESSON,
-                skill_level=SkillLevel.BEGINNER,
-                context={"genre": "general"}
-            )
-            
-            # Create multiple concurrent requests
-            tasks = [
-                service.generate_with_context(request)
+        assert response.content is not None
+        assert len(response.content) > 0
+        assert response.quality_score >= 0
+        assert response.generation_time > 0
+        
+        # Test concurrent requests on the same service, bounded so a stalled daemon cannot hang the run
+        responses = await asyncio.wait_for(
+            asyncio.gather(*(
+                generation_service.generate_with_context(basic_request)
                 for _ in range(3)
-            ]
-            
-            # Execute concurrently
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Check that all requests completed (some may fail if Ollama unavailable)
-            assert len(responses) == 3
-            
-        finally:
-            await service.ollama_client.client.aclose()
+            ), return_exceptions=True),
+            timeout=CONCURRENT_GENERATION_TIMEOUT
+        )
+        
+        assert len(responses) == 3
 
 
+@pytest.mark.serial
+@requires_ollama
 class TestGenerationServicePerformance:
     """Performance tests for the generation service."""
 
-    @pytest.mark.asyncio
-    async def test_generation_time_benchmark(self):
+    async def test_generation_time_benchmark(self, generation_service, basic_request):
         """Test generation time performance."""
-        service = AsyncEnhancedGenerationService()
-        
-        try:
-            request = GenerationRequest(
-                prompt="Create a short music lesson",
-                content_type=ContentType.THEORY_LESSON,
-                skill_level=SkillLevel.BEGINNER,
-                context={"genre": "general"}
-            )
-            
-            start_time = time.time()
-            response = await service.generate_with_context(request)
-            end_time = time.time()
-            
-            actual_time = end_time - start_time
-            reported_time = response.generation_time
-            
-            # Check that reported time is reasonable
-            assert reported_time > 0
-            assert abs(actual_time - reported_time) < 5.0  # Allow 5 second tolerance
-            
-        finally:
-            await service.ollama_client.client.aclose()
-
-    @pytest.mark.asyncio
-    async def test_memory_usage(self):
-        """Test memory usage during generation."""
-        import psutil
-        import os
+        request = with_overrides(basic_request, prompt="Create a short music lesson")
         
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss
+        start_time = time.time()
+        response = await generation_service.generate_with_context(request)
+        end_time = time.time()
         
-        service = AsyncEnhancedGenerationService()
+        actual_time = end_time - start_time
+        reported_time = response.generation_time
         
+        # Check that reported time is reasonable
+        assert reported_time > 0
+        assert abs(actual_time - reported_time) < 5.0  # Allow 5 second tolerance
+
+    async def test_memory_usage(self, generation_service, basic_request):
+        """Test memory usage during generation."""
+        # tracemalloc counts only allocations made while tracing, on every platform
+        tracemalloc.start()
         try:
-            request = GenerationRequest(
-                prompt="Create a music lesson",
-                content_type=ContentType.THEORY_LESSON,
-                skill_level=SkillLevel.BEGINNER,
-                context={"genre": "general"}
-            )
-            
-            response = await service.generate_with_context(request)
-            
-            final_memory = process.memory_info().rss
-            memory_increase = final_memory - initial_memory
-            
-            # Check that memory increase is reasonable (less than 100MB)
-            assert memory_increase < 100 * 1024 * 1024
-            
+            response = await generation_service.generate_with_context(basic_request)
+            _, peak_memory = tracemalloc.get_traced_memory()
         finally:
-            await service.ollama_client.client.aclose()
+            tracemalloc.stop()
+        
+        # Check that memory allocated during generation is reasonable (less than 100MB)
+        assert peak_memory < 100 * 1024 * 1024
 
 
 class TestGenerationServiceErrorHandling:
     """Error handling tests for the generation service."""
 
-    @pytest.mark.asyncio
-    async def test_ollama_connection_error(self):
+    async def test_ollama_connection_error(self, generation_service, fake_ollama):
         """Test handling of Ollama connection errors."""
-        service = AsyncEnhancedGenerationService()
+        fake_ollama.health_check.return_value = False
         
-        try:
-            with patch.object(service.ollama_client, 'health_check') as mock_health:
-                mock_health.return_value = False
-                
-                health = await service.health_check()
-                assert health["ollama_available"] is False
-                
-        finally:
-            await service.ollama_client.client.aclose()
+        health = await generation_service.health_check()
+        assert health["ollama_available"] is False
 
-    @pytest.mark.asyncio
-    async def test_model_selection_error(self):
+    async def test_model_selection_error(self, generation_service):
         """Test handling of model selection errors."""
-        service = AsyncEnhancedGenerationService()
-        
-        try:
-            # Test with invalid content type - this should not raise ValueError
-            # as the method handles invalid types gracefully
-            model = service._select_model("invalid_type", SkillLevel.BEGINNER)
-            # Should return a default model
-            assert model in service.ollama_client.available_models.values()
-                
-        finally:
-            await service.ollama_client.client.aclose()
+        # Test with invalid content type - this should not raise ValueError
+        # as the method handles invalid types gracefully
+        model = generation_service._select_model("invalid_type", SkillLevel.BEGINNER)
+        # Should return a default model
+        assert model in generation_service.ollama_client.available_models.values()
 
-    @pytest.mark.asyncio
-    async def test_validation_error_handling(self):
+    async def test_validation_error_handling(self, generation_service, basic_request, monkeypatch):
         """Test handling of validation errors."""
-        service = AsyncEnhancedGenerationService()
+        request = with_overrides(basic_request, prompt="Create a lesson")
+        monkeypatch.setattr(
+            generation_service.content_validator,
+            'validate_content',
+            AsyncMock(side_effect=RuntimeError("Validation failed"))
+        )
         
-        try:
-            request = GenerationRequest(
-                prompt="Create a lesson",
-                content_type=ContentType.THEORY_LESSON,
-                skill_level=SkillLevel.BEGINNER,
-                context={"genre": "general"}
-            )
-            
-            with patch.object(service.content_validator, 'validate_content') as mock_validate:
-                mock_validate.side_effect = Exception("Validation failed")
-                
-                with pytest.raises(Exception):
-                    await service.generate_with_context(request)
-                    
-        finally:
-            await service.ollama_client.client.aclose()
+        with pytest.raises(RuntimeError, match="Validation failed"):
+            await generation_service.generate_with_context(request)
 
-    @pytest.mark.asyncio
-    async def test_timeout_handling(self):
+    async def test_timeout_handling(self, generation_service, fake_ollama, basic_request):
         """Test handling of generation timeouts."""
-        service = AsyncEnhancedGenerationService()
+        request = with_overrides(basic_request, prompt="Create a lesson")
+        fake_ollama.generate.side_effect = asyncio.TimeoutError("Generation timeout")
         
-        try:
-            request = GenerationRequest(
-                prompt="Create a lesson",
-                content_type=ContentType.THEORY_LESSON,
-                skill_level=SkillLevel.BEGINNER,
-                context={"genre": "general"}
-            )
-            
-            with patch.object(service.ollama_client, 'generate') as mock_generate:
-                mock_generate.side_effect = asyncio.TimeoutError("Generation timeout")
-                
-                with pytest.raises(asyncio.TimeoutError):
-                    await service.generate_with_context(request)
-                    
-        finally:
-            await service.ollama_client.client.aclose()
+        with pytest.raises(asyncio.TimeoutError, match="Generation timeout"):
+            await generation_service.generate_with_context(request)
 
 
 # Test fixtures for generation service
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ollama_response():
     """Mock Ollama response for testing."""
     return {
-        "response": """
-        Jazz Theory Lesson: Understanding Basic Concepts
-        
-        Jazz music is a rich cultural tradition that emerged from African American 
-        communities in New Orleans. This lesson will teach you the fundamentals 
-        of jazz theory including chord progressions, scales, and improvisation.
-        
-        Key Concepts:
-        1. The ii-V-I progression
-        2. Jazz scales and modes
-        3. Improvisation techniques
-        4. Cultural significance
-        
-        This content is educational, culturally sensitive, and engaging for students.
-        """,
+        "response": JAZZ_LESSON_CONTENT,
         "model": "mistral-small3.2:latest",
         "done": True
     }
@@ -0,0 +1,93 @@
+"""
+Tests for the KeywordMatcher utility.
+
+This module checks that single-pass keyword matching returns the same
+hits as testing each keyword individually with a substring check.
+"""
+
+import pytest
+
+from app.utils import KeywordMatcher
+from app.agents.conversation_agent import (
+    CONTEXT_KEYWORD_MATCHER,
+    CULTURAL_ELEMENT_KEYWORDS,
+    GENRE_KEYWORDS,
+    THEORY_CONCEPT_KEYWORDS
+)
+
+
+class TestKeywordMatcher:
+    """Test the KeywordMatcher class."""
+    
+    def test_match_groups_by_category(self):
+        """Test that matches are grouped per category in declaration order."""
+        matcher = KeywordMatcher({
+            "genre": ["rock", "jazz", "hip hop"],
+            "skill": ["beginner", "advanced"]
+        })
+        
+        matches = matcher.match("jazz and hip hop for a beginner who likes rock")
+        
+        assert matches["genre"] == ["rock", "jazz", "hip hop"]
+        assert matches["skill"] == ["beginner"]
+    
+    def test_overlapping_keywords(self):
+        """Test keywords that are prefixes or substrings of one another."""
+        matcher = KeywordMatcher({
+            "goal": ["learn", "learning"],
+            "theory": ["rhythm", "polyrhythm"]
+        })
+        
+        matches = matcher.match("learning polyrhythm")
+        
+        assert matches["goal"] == ["learn", "learning"]
+        assert matches["theory"] == ["rhythm", "polyrhythm"]
+    
+    def test_keyword_shared_between_categories(self):
+        """Test that a keyword listed in two categories is reported in both."""
+        matcher = KeywordMatcher({
+            "teaching": ["teach", "learn"],
+            "learning": ["learn", "study"]
+        })
+        
+        matches = matcher.match("i want to learn")
+        
+        assert matches["teaching"] == ["learn"]
+        assert matches["learning"] == ["learn"]
+    
+    def test_empty_matcher(self):
+        """Test a matcher without keywords."""
+        matcher = KeywordMatcher({"empty": []})
+        
+        assert matcher.find("anything") == frozenset()
+        assert matcher.match("anything") == {"empty": []}
+    
+    @pytest.mark.parametrize("message", [
+        "I'm interested in jazz and blues music with cultural traditions",
+        "My students are beginners and I want to teach them about rhythm and melody",
+        "Exploring hip hop, r&b and world music rituals in the community",
+        "keyboard polyrhythms and transpositions across keys",
+        ""
+    ])
+    def test_matches_naive_substring_scan(self, message):
+        """Test equivalence with a per-keyword substring scan."""
+        message_lower = message.lower()
+        matches = CONTEXT_KEYWORD_MATCHER.match(message_lower)
+        
+        for category, keywords in (
+            ("genre", GENRE_KEYWORDS),
+            ("cultural_element", CULTURAL_ELEMENT_KEYWORDS),
+            ("theory_concept", THEORY_CONCEPT_KEYWORDS)
+        ):
+            assert matches[category] == [kw for kw in keywords if kw in message_lower]
+    
+    def test_repeated_text_is_scanned_once(self):
+        """Test that scanning the same text twice reuses the first result."""
+        matcher = KeywordMatcher({"genre": ["jazz", "rock"]})
+        
+        first = matcher.match("jazz and rock")
+        second = matcher.match("jazz and rock")
+        
+        assert first == second == {"genre": ["jazz", "rock"]}
+        assert first["genre"] is not second["genre"]
+        assert matcher._find_cached.cache_info().hits == 1
@@ -0,0 +1,105 @@
+"""
+Tests for the SemanticResponseCache utility.
+
+This module contains tests for exact and embedding-based response reuse.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from datetime import datetime
+
+from app.agents import AsyncConversationalMashupAgent, ConversationPhase
+from app.utils import SemanticResponseCache
+
+
+class TestSemanticResponseCache:
+    """Test cases for SemanticResponseCache."""
+    
+    def test_exact_hit_ignores_case_and_whitespace(self):
+        """Test that normalized messages hit the same entry."""
+        cache = SemanticResponseCache()
+        cache.store("s1", "initial", "I want to explore jazz", "Let's explore jazz!")
+        
+        assert cache.lookup("s1", "initial", "  i WANT to   explore jazz ") == "Let's explore jazz!"
+    
+    def test_miss_in_other_phase(self):
+        """Test that entries are scoped to their phase."""
+        cache = SemanticResponseCache()
+        cache.store("s1", "initial", "I want to explore jazz", "Let's explore jazz!")
+        
+        assert cache.lookup("s1", "genre_exploration", "I want to explore jazz") is None
+    
+    def test_miss_in_other_session(self):
+        """Test that entries are never shared between sessions."""
+        cache = SemanticResponseCache()
+        cache.store("s1", "initial", "I want to explore jazz", "Let's explore jazz!")
+        
+        assert cache.lookup("s2", "initial", "I want to explore jazz") is None
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SemanticResponseCache(max_entries=2)
+        cache.store("s1", "initial", "first", "1")
+        cache.store("s1", "initial", "second", "2")
+        cache.lookup("s1", "initial", "first")
+        cache.store("s1", "initial", "third", "3")
+        
+        assert len(cache) == 2
+        assert cache.lookup("s1", "initial", "first") == "1"
+        assert cache.lookup("s1", "initial", "second") is None
+    
+    def test_fuzzy_hit_with_embeddings(self):
+        """Test similarity fallback when an embedding function is supplied."""
+        vectors = {
+            "i want to explore jazz": [1.0, 0.0, 0.1],
+            "i'd like to explore jazz": [0.99, 0.0, 0.12],
+            "teach me about reggae": [0.0, 1.0, 0.0]
+        }
+        cache = SemanticResponseCache(similarity_threshold=0.9, embed=vectors.__getitem__)
+        cache.store("s1", "initial", "I want to explore jazz", "Let's explore jazz!")
+        
+        assert cache.lookup("s1", "initial", "I'd like to explore jazz") == "Let's explore jazz!"
+        assert cache.lookup("s1", "initial", "Teach me about reggae") is None
+        assert cache.lookup("s2", "initial", "I'd like to explore jazz") is None
+    
+    @pytest.mark.asyncio
+    async def test_agent_reuses_cached_response(self):
+        """Test that the agent skips the model for a repeated message."""
+        mock_db = Mock()
+        mock_db.get_conversation = AsyncMock(return_value={
+            'conversation_id': 'test-session',
+            'phase': ConversationPhase.INITIAL,
+            'created_at': datetime.now(),
+            'updated_at': datetime.now()
+        })
+        mock_db.add_message = AsyncMock(return_value=True)
+        mock_db.add_messages = AsyncMock(return_value=True)
+        mock_db.update_conversation_phase = AsyncMock(return_value=True)
+        mock_db.get_messages = AsyncMock(return_value=[])
+        mock_db.close = AsyncMock()
+        
+        with patch('app.agents.conversation_agent.AsyncConversationDB', return_value=mock_db), \
+             patch('app.agents.conversation_agent.ChatOllama') as mock_chat_ollama:
+            mock_model = Mock()
+            mock_model.ainvoke = AsyncMock(return_value=Mock(content="Test response"))
+            mock_chat_ollama.return_value = mock_model
+            
+            agent = AsyncConversationalMashupAgent(
+                model_name="test-model",
+                enable_tools=False,
+                db_path="/tmp/test.db",
+                response_cache=SemanticResponseCache()
+            )
+        
+        first = await agent.process_message("test-session", "Hello there")
+        second = await agent.process_message("test-session", "hello   there")
+        
+        assert first['response'] == second['response'] == "Test response"
+        assert mock_model.ainvoke.await_count == 1
+        # The hit skips loading history for the model input
+        assert mock_db.get_messages.await_count == 1
+        
+        await agent.process_message("other-session", "Hello there")
+        await agent.close()
+        
+        assert mock_model.ainvoke.await_count == 2
@@ -53,22 +53,28 @@ class TestToolCallResult:
         assert result.metadata is None
 
 
+@pytest.fixture(scope="module")
+def mock_web_search_service():
+    """Create one mock web search service for the module."""
+    return AsyncMock(spec=AsyncWebSearchService)
+
+
+@pytest.fixture(scope="module")
+def mock_db():
+    """Create one mock database for the module."""
+    return AsyncMock(spec=AsyncConversationDB)
+
+
 class TestAsyncToolOrchestrator:
     """Test the AsyncToolOrchestrator class."""
     
-    @pytest.fixture
-    def mock_web_search_service(self):
-        """Create a mock web search service."""
-        mock_service = AsyncMock(spec=AsyncWebSearchService)
-        mock_service.is_service_available.return_value = True
-        return mock_service
-    
-    @pytest.fixture
-    def mock_db(self):
-        """Create a mock database."""
-        mock_db = AsyncMock(spec=AsyncConversationDB)
+    @pytest.fixture(autouse=True)
+    def reset_mocks(self, mock_web_search_service, mock_db):
+        """Clear calls and configured results left on the shared mocks by earlier tests."""
+        mock_web_search_service.reset_mock(return_value=True, side_effect=True)
+        mock_web_search_service.is_service_available.return_value = True
+        mock_db.reset_mock(return_value=True, side_effect=True)
         mock_db.add_tool_call.return_value = 1
-        return mock_db
     
     @pytest.fixture
     def tool_orchestrator(self, mock_web_search_service, mock_db):
@@ -94,11 +100,12 @@ class TestAsyncToolOrchestrator:
         assert orchestrator.db == mock_db
         assert orchestrator.max_concurrent_tools == 3
         assert orchestrator.tool_timeout == 10.0
-        assert orchestrator.semaphore._value == 3
     
     @pytest.mark.asyncio
-    async def test_execute_web_search_success(self, tool_orchestrator, mock_web_search_service, mock_db):
+    async def test_execute_web_search_success(self, monkeypatch, tool_orchestrator, mock_web_search_service, mock_db):
         """Test successful web search execution."""
+        monkeypatch.setattr(tool_orchestrator, "clock", iter([10.0, 11.5]).__next__)
+        
         # Mock search result
         search_result = {
             "query": "test query",
@@ -116,22 +123,46 @@ class TestAsyncToolOrchestrator:
         assert result.tool_type == ToolCallType.WEB_SEARCH
         assert result.input_data == "test query"
         assert result.status == ToolExecutionStatus.COMPLETED
-        assert result.execution_time is not None
+        assert result.execution_time == 1.5
         assert result.metadata == search_result
         
-        # Verify database calls
+        # Verify the call is written once, already finished
+        mock_db.add_tool_call.assert_called_once()
+        assert mock_db.add_tool_call.call_args.kwargs["status"] == "completed"
+        mock_db.update_tool_call.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_web_search_with_pending_rows(self, mock_web_search_service, mock_db):
+        """Test that pending rows are written first and updated on completion."""
+        orchestrator = AsyncToolOrchestrator(
+            web_search_service=mock_web_search_service,
+            db=mock_db,
+            enable_pending_rows=True
+        )
+        mock_web_search_service.search_educational_content.return_value = {"query": "test query", "results": []}
+        
+        result = await orchestrator.execute_web_search(
+            "test query", {"skill_level": "beginner"}, "test-session"
+        )
+        
+        assert result.status == ToolExecutionStatus.COMPLETED
         mock_db.add_tool_call.assert_called_once()
+        assert mock_db.add_tool_call.call_args.kwargs["status"] == "running"
         mock_db.update_tool_call.assert_called_once()
+        assert mock_db.update_tool_call.call_args.kwargs["tool_call_id"] == 1
+        assert mock_db.update_tool_call.call_args.kwargs["status"] == "completed"
     
     @pytest.mark.asyncio
     async def test_execute_web_search_timeout(self, tool_orchestrator, mock_web_search_service, mock_db):
         """Test web search timeout handling."""
-        # Mock slow search
-        async def slow_search(*args, **kwargs):
-            await asyncio.sleep(10)  # Longer than timeout
-            return {"results": []}
+        # Mock a search that never finishes, against a short timeout
+        never_set = asyncio.Event()
+        
+        async def stalled_search(*args, **kwargs):
+            await never_set.wait()
         
-        mock_web_search_service.search_educational_content.side_effect = slow_search
+        mock_web_search_service.search_educational_content.side_effect = stalled_search
+        tool_orchestrator.tool_timeout = 0.01
         
         # Execute search
         result = await tool_orchestrator.execute_web_search(
@@ -179,15 +210,94 @@ class TestAsyncToolOrchestrator:
         assert results[0].input_data == "query1"
         assert results[1].input_data == "query2"
     
+    @pytest.mark.asyncio
+    async def test_execute_concurrent_searches_fail_fast(self, tool_orchestrator, mock_web_search_service, mock_db):
+        """Test that one failed search cancels the searches still running."""
+        never_set = asyncio.Event()
+        cancelled = []
+        
+        async def search(query, context):
+            if query == "broken":
+                raise Exception("Search failed")
+            try:
+                await never_set.wait()
+            except asyncio.CancelledError:
+                cancelled.append(query)
+                raise
+        
+        mock_web_search_service.search_educational_content.side_effect = search
+        
+        results = await asyncio.wait_for(
+            tool_orchestrator.execute_concurrent_searches(
+                ["slow", "broken", "queued"], {"skill_level": "beginner"}, "test-session", fail_fast=True
+            ),
+            timeout=1.0
+        )
+        
+        assert [result.status for result in results] == [ToolExecutionStatus.FAILED] * 3
+        assert results[1].error_message == "Search failed"
+        assert results[0].error_message == results[2].error_message == "Cancelled after an earlier search failed"
+        assert sorted(cancelled) == ["queued", "slow"]
+        assert tool_orchestrator._active_tools == 0
+    
+    @pytest.mark.asyncio
+    async def test_execute_concurrent_searches_survives_cancelled_search(self, tool_orchestrator, mock_web_search_service, mock_db):
+        """Test that a search raising CancelledError does not stall the worker pool."""
+        async def search(query, context):
+            if query == "cancelled":
+                raise asyncio.CancelledError()
+            return {"query": query, "results": []}
+        
+        mock_web_search_service.search_educational_content.side_effect = search
+        
+        results = await asyncio.wait_for(
+            tool_orchestrator.execute_concurrent_searches(
+                ["first", "cancelled", "second", "third"], {"skill_level": "beginner"}
+            ),
+            timeout=1.0
+        )
+        
+        assert [result.status for result in results] == [
+            ToolExecutionStatus.COMPLETED,
+            ToolExecutionStatus.FAILED,
+            ToolExecutionStatus.COMPLETED,
+            ToolExecutionStatus.COMPLETED
+        ]
+        assert results[1].error_message == "Search cancelled"
+        assert tool_orchestrator._active_tools == 0
+    
+    @pytest.mark.asyncio
+    async def test_stream_concurrent_searches(self, tool_orchestrator, mock_web_search_service, mock_db):
+        """Test that streamed searches yield every query index exactly once."""
+        mock_web_search_service.search_educational_content.return_value = {"results": []}
+        
+        queries = (f"query{i}" for i in range(5))
+        streamed = [
+            (index, result)
+            async for index, result in tool_orchestrator.stream_concurrent_searches(
+                queries, {"skill_level": "beginner"}, "test-session"
+            )
+        ]
+        
+        assert sorted(index for index, _ in streamed) == list(range(5))
+        assert all(result.input_data == f"query{index}" for index, result in streamed)
+        assert all(result.status == ToolExecutionStatus.COMPLETED for _, result in streamed)
+
     @pytest.mark.asyncio
     async def test_execute_genre_exploration_searches(self, tool_orchestrator, mock_web_search_service, mock_db):
         """Test genre exploration search execution."""
-        # Mock search results
-        search_results = [
-            {"query": "jazz music history cultural significance educational", "results": [{"title": "Jazz History"}]},
-            {"query": "rock music history cultural significance educational", "results": [{"title": "Rock History"}]}
-        ]
-        mock_web_search_service.search_educational_content.side_effect = search_results
+        # Each search waits until both have started, so a serial loop times out
+        started = []
+        both_started = asyncio.Event()
+        
+        async def search(query, context):
+            started.append(query)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1.0)
+            return {"query": query, "results": [{"title": query.split()[0].title() + " History"}]}
+        
+        mock_web_search_service.search_educational_content.side_effect = search
         
         # Execute genre searches
         results = await tool_orchestrator.execute_genre_exploration_searches(
@@ -195,6 +305,10 @@ class TestAsyncToolOrchestrator:
         )
         
         # Verify results
+        assert sorted(started) == [
+            "jazz music history cultural significance educational",
+            "rock music history cultural significance educational"
+        ]
         assert len(results) == 2
         assert "jazz" in results
         assert "rock" in results
@@ -223,6 +337,53 @@ class TestAsyncToolOrchestrator:
         assert results["history"].status == ToolExecutionStatus.COMPLETED
         assert results["tradition"].status == ToolExecutionStatus.COMPLETED
     
+    @pytest.mark.asyncio
+    async def test_genre_searches_reuse_recent_results(self, tool_orchestrator, mock_web_search_service):
+        """Test that repeated and duplicate genres are searched only once."""
+        mock_web_search_service.search_educational_content.return_value = {
+            "query": "jazz", "results": [{"title": "Jazz History"}]
+        }
+        context = {"skill_level": "beginner"}
+        
+        first = await tool_orchestrator.execute_genre_exploration_searches(["jazz", "jazz"], context)
+        second = await tool_orchestrator.execute_genre_exploration_searches(["jazz"], context)
+        
+        assert list(first) == ["jazz"]
+        assert second["jazz"] is first["jazz"]
+        assert mock_web_search_service.search_educational_content.await_count == 1
+        
+        # A different skill level changes the search, so it is not served from the cache
+        await tool_orchestrator.execute_genre_exploration_searches(["jazz"], {"skill_level": "advanced"})
+        assert mock_web_search_service.search_educational_content.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_genre_search_cache_follows_clock_and_records_hits(
+        self, monkeypatch, tool_orchestrator, mock_web_search_service, mock_db
+    ):
+        """Test that cached searches expire on the orchestrator clock and hits are still recorded."""
+        now = 0.0
+        monkeypatch.setattr(tool_orchestrator, "clock", lambda: now)
+        mock_web_search_service.search_educational_content.return_value = {
+            "query": "jazz", "results": [{"title": "Jazz History"}]
+        }
+        context = {"skill_level": "beginner"}
+        
+        await tool_orchestrator.execute_genre_exploration_searches(["jazz"], context, "session-1")
+        mock_db.add_tool_call.reset_mock()
+        
+        # Just inside the TTL: served from the cache, but logged for the new session
+        now = tool_orchestrator.search_cache_ttl - 1
+        await tool_orchestrator.execute_genre_exploration_searches(["jazz"], context, "session-2")
+        assert mock_web_search_service.search_educational_content.await_count == 1
+        mock_db.add_tool_call.assert_awaited_once()
+        assert mock_db.add_tool_call.await_args.kwargs["conversation_id"] == "session-2"
+        assert mock_db.add_tool_call.await_args.kwargs["status"] == ToolExecutionStatus.COMPLETED.value
+        
+        # At the TTL the entry has expired and the search runs again
+        now = tool_orchestrator.search_cache_ttl
+        await tool_orchestrator.execute_genre_exploration_searches(["jazz"], context, "session-2")
+        assert mock_web_search_service.search_educational_content.await_count == 2
+    
     @pytest.mark.asyncio
     async def test_process_search_results(self, tool_orchestrator):
         """Test search result processing and synthesis."""
@@ -371,6 +532,7 @@ class TestAsyncToolOrchestrator:
 class TestToolOrchestratorIntegration:
     """Integration tests for tool orchestrator with real components."""
     
+    @pytest.mark.integration
     @pytest.mark.asyncio
     async def test_tool_orchestrator_with_real_web_search(self):
         """Test tool orchestrator with real web search service (no API key)."""
@@ -391,31 +553,145 @@ class TestToolOrchestratorIntegration:
         assert result.metadata.get("service_available") == True
     
     @pytest.mark.asyncio
-    async def test_concurrent_execution_limits(self):
-        """Test that concurrent execution respects limits."""
+    @pytest.mark.parametrize("direct", [False, True], ids=["batch", "direct"])
+    @pytest.mark.parametrize("query_count", [4, 16, 64])
+    async def test_concurrent_execution_limits(self, query_count, direct):
+        """Test that the tool slots cap concurrency for batches and independent searches."""
         orchestrator = AsyncToolOrchestrator(max_concurrent_tools=2)
+        in_flight = 0
+        peak = 0
         
-        # Create multiple concurrent searches
+        # Create multiple concurrent searches that track how many overlap
         async def mock_search(query, context):
-            await asyncio.sleep(0.1)  # Simulate search time
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)  # Simulate search time
+            in_flight -= 1
             return {"query": query, "results": []}
         
+        queries = [f"query{i}" for i in range(query_count)]
+        context = {"skill_level": "beginner"}
         with patch.object(orchestrator, '_execute_search_with_error_handling', side_effect=mock_search):
-            # Execute multiple searches concurrently
-            results = await orchestrator.execute_concurrent_searches(
-                ["query1", "query2", "query3", "query4"],
-                {"skill_level": "beginner"}
-            )
+            # Execute multiple searches concurrently, either as one batch or as
+            # separate tasks that only the tool slots keep in check
+            if direct:
+                results = await asyncio.gather(*(
+                    orchestrator.execute_web_search(query, context) for query in queries
+                ))
+            else:
+                results = await orchestrator.execute_concurrent_searches(queries, context)
             
-            # All should complete successfully
-            assert len(results) == 4
+            # All should complete successfully, never more than two at once
+            assert len(results) == query_count
             assert all(result.status == ToolExecutionStatus.COMPLETED for result in results)
+            assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_resizing_concurrency_wakes_waiters(self):
+        """Test that raising the limit mid-flight lets waiting searches start."""
+        orchestrator = AsyncToolOrchestrator(max_concurrent_tools=1)
+        started = {"query1": asyncio.Event(), "query2": asyncio.Event()}
+        release = asyncio.Event()
+        
+        async def blocking_search(query, context):
+            started[query].set()
+            await release.wait()
+            return {"query": query, "results": []}
+        
+        with patch.object(orchestrator, '_execute_search_with_error_handling', side_effect=blocking_search):
+            tasks = [
+                asyncio.create_task(orchestrator.execute_web_search(query, {"skill_level": "beginner"}))
+                for query in started
+            ]
+            await asyncio.wait_for(started["query1"].wait(), timeout=1.0)
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert not started["query2"].is_set()
+            
+            await orchestrator.set_max_concurrent_tools(2)
+            await asyncio.wait_for(started["query2"].wait(), timeout=1.0)
+            
+            release.set()
+            results = await asyncio.gather(*tasks)
+        
+        assert orchestrator.max_concurrent_tools == 2
+        assert all(result.status == ToolExecutionStatus.COMPLETED for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_resizing_concurrency_mid_batch(self):
+        """Test that raising the limit lets a running batch start more searches."""
+        orchestrator = AsyncToolOrchestrator(max_concurrent_tools=1)
+        started = {"query1": asyncio.Event(), "query2": asyncio.Event()}
+        release = asyncio.Event()
+        
+        async def blocking_search(query, context):
+            started[query].set()
+            await release.wait()
+            return {"query": query, "results": []}
+        
+        with patch.object(orchestrator, '_execute_search_with_error_handling', side_effect=blocking_search):
+            batch = asyncio.create_task(
+                orchestrator.execute_concurrent_searches(list(started), {"skill_level": "beginner"})
+            )
+            await asyncio.wait_for(started["query1"].wait(), timeout=1.0)
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert not started["query2"].is_set()
+            
+            await orchestrator.set_max_concurrent_tools(2)
+            await asyncio.wait_for(started["query2"].wait(), timeout=1.0)
+            
+            release.set()
+            results = await batch
+        
+        assert all(result.status == ToolExecutionStatus.COMPLETED for result in results)
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_strand_others(self):
+        """Test that a waiter cancelled right after being notified does not swallow the wakeup."""
+        orchestrator = AsyncToolOrchestrator(max_concurrent_tools=1)
+        release = asyncio.Event()
+        acquired = []
+        
+        async def hold_then_cancel_next():
+            async with orchestrator._tool_slot():
+                await release.wait()
+            # Cancel the notified waiter before it can re-acquire the lock
+            waiters[0].cancel()
+        
+        async def take_slot(name):
+            async with orchestrator._tool_slot():
+                acquired.append(name)
+        
+        holder = asyncio.create_task(hold_then_cancel_next())
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(take_slot(name)) for name in ("b", "c")]
+        for _ in range(5):
+            await asyncio.sleep(0)
+        
+        release.set()
+        await holder
+        await asyncio.wait_for(waiters[1], timeout=1.0)
+        
+        assert waiters[0].cancelled()
+        assert acquired == ["c"]
+        assert orchestrator._active_tools == 0
 
 
 # Test the get_tool_orchestrator factory function
 class TestGetToolOrchestrator:
     """Test the get_tool_orchestrator factory function."""
     
+    @pytest.fixture(autouse=True)
+    def reset_orchestrator_cache(self):
+        """Give each test an empty orchestrator cache."""
+        from app.services.tool_orchestrator import reset_tool_orchestrator_cache
+        
+        yield
+        reset_tool_orchestrator_cache()
+    
     @pytest.mark.asyncio
     async def test_get_tool_orchestrator(self):
         """Test the factory function."""
@@ -428,18 +704,27 @@ class TestGetToolOrchestrator:
         assert orchestrator.db is None
     
     @pytest.mark.asyncio
-    async def test_get_tool_orchestrator_with_services(self):
+    async def test_get_tool_orchestrator_with_services(self, mock_web_search_service, mock_db):
         """Test the factory function with services."""
         from app.services.tool_orchestrator import get_tool_orchestrator
         
-        mock_web_search = AsyncMock(spec=AsyncWebSearchService)
-        mock_db = AsyncMock(spec=AsyncConversationDB)
-        
         orchestrator = await get_tool_orchestrator(
-            web_search_service=mock_web_search,
+            web_search_service=mock_web_search_service,
             db=mock_db
         )
         
         assert isinstance(orchestrator, AsyncToolOrchestrator)
-        assert orchestrator.web_search_service == mock_web_search
-        assert orchestrator.db == mock_db 
\ No newline at end of file
+        assert orchestrator.web_search_service == mock_web_search_service
+        assert orchestrator.db == mock_db 
+    
+    @pytest.mark.asyncio
+    async def test_get_tool_orchestrator_reuses_instance(self, mock_web_search_service, mock_db):
+        """Test that repeated calls with the same services share an orchestrator."""
+        from app.services.tool_orchestrator import get_tool_orchestrator
+        
+        first = await get_tool_orchestrator(web_search_service=mock_web_search_service, db=mock_db)
+        second = await get_tool_orchestrator(web_search_service=mock_web_search_service, db=mock_db)
+        other = await get_tool_orchestrator(web_search_service=mock_web_search_service)
+        
+        assert first is second
+        assert other is not first
@@ -8,199 +8,170 @@ and Tavily API integration.
 
 import pytest
 import asyncio
+import threading
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timezone
+from types import MappingProxyType, SimpleNamespace
 from typing import Dict, Any
 
-from app.services.web_search import AsyncWebSearchService
+from app.services.web_search import AsyncWebSearchService, get_shared_web_search_service
+
+
+# Keep the module on one xdist worker so the class-scoped services are built once
+pytestmark = pytest.mark.xdist_group("web_search_service")
+
+# Search contexts shared by the tests; the service only reads them
+BEGINNER_CONTEXT = MappingProxyType({"skill_level": "beginner"})
+BEGINNER_JAZZ_CONTEXT = MappingProxyType({
+    "skill_level": "beginner",
+    "genres": ("jazz",),
+    "cultural_elements": ("improvisation",)
+})
+
+# Raw results for the filter test, read-only so any mutation by the service fails loudly
+RAW_SEARCH_RESULTS = tuple(MappingProxyType(result) for result in [
+    {
+        "title": "Music Theory Basics",
+        "url": "https://musictheory.net/lessons",
+        "content": "Learn the fundamentals of music theory including scales, chords, and rhythm."
+    },
+    {
+        "title": "Inappropriate Content",
+        "url": "https://inappropriate.com",
+        "content": "Adult content that should be filtered out."
+    },
+    {
+        "title": "Jazz History",
+        "url": "https://wikipedia.org/jazz",
+        "content": "Explore the rich history of jazz music."
+    }
+])
+
+
+def _make_settings(tavily_api_key="test_api_key"):
+    """Build stand-in settings carrying only the fields the web search service reads."""
+    return SimpleNamespace(
+        TAVILY_API_KEY=tavily_api_key,
+        WEB_SEARCH_MAX_RESULTS=3,
+        WEB_SEARCH_TIMEOUT_SECONDS=10
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_settings():
+    """Create mock settings shared by the module."""
+    return _make_settings()
+
+
+@pytest.fixture
+def patched_env(monkeypatch, mock_settings):
+    """Install the mock settings and a mock Tavily client class, and return the class."""
+    mock_tavily = Mock()
+    monkeypatch.setattr('app.services.web_search.get_settings', lambda: mock_settings)
+    monkeypatch.setattr('app.services.web_search.TAVILY_AVAILABLE', True)
+    monkeypatch.setattr('app.services.web_search.TavilyClient', mock_tavily)
+    return mock_tavily
 
 
 class TestAsyncWebSearchService:
     """Test AsyncWebSearchService functionality."""
     
-    @pytest.fixture
-    def mock_settings(self):
-        """Create mock settings."""
-        mock_settings = Mock()
-        mock_settings.TAVILY_API_KEY = "test_api_key"
-        mock_settings.WEB_SEARCH_MAX_RESULTS = 3
-        mock_settings.WEB_SEARCH_TIMEOUT_SECONDS = 10
-        return mock_settings
-    
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def web_search_service(self, mock_settings):
-        """Create web search service instance."""
+        """Create one web search service instance for the class."""
         with patch('app.services.web_search.get_settings', return_value=mock_settings):
             return AsyncWebSearchService()
     
-    @pytest.fixture
-    def mock_tavily_client(self):
-        """Create mock Tavily client."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "results": [
-                {
-                    "title": "Music Theory Basics",
-                    "url": "https://musictheory.net/lessons",
-                    "content": "Learn the fundamentals of music theory including scales, chords, and rhythm."
-                },
-                {
-                    "title": "Jazz Music History",
-                    "url": "https://wikipedia.org/jazz_history",
-                    "content": "Explore the rich history of jazz music and its cultural significance."
-                }
-            ]
-        }
-        return mock_client
+    @pytest.fixture(autouse=True)
+    def restore_service_state(self, web_search_service):
+        """Undo the client and availability overrides tests apply to the shared service."""
+        client, is_available = web_search_service.client, web_search_service.is_available
+        yield
+        web_search_service.client = client
+        web_search_service.is_available = is_available
     
-    def test_initialization_with_api_key(self, mock_settings):
+    def test_initialization_with_api_key(self, patched_env):
         """Test service initialization with API key."""
-        with patch('app.services.web_search.TAVILY_AVAILABLE', True):
-            with patch('app.services.web_search.TavilyClient') as mock_tavily:
-                mock_client = Mock()
-                mock_tavily.return_value = mock_client
-                
-                service = AsyncWebSearchService("test_key")
-                
-                assert service.api_key == "test_key"
-                assert service.is_available is True
-                mock_tavily.assert_called_once_with(api_key="test_key")
-    
-    def test_initialization_without_api_key(self, mock_settings):
-        """Test service initialization without API key."""
-        with patch('app.services.web_search.TAVILY_AVAILABLE', False):
-            service = AsyncWebSearchService()
-            
-            assert service.is_available is False
-            assert service.client is None
-    
-    def test_initialization_without_tavily_package(self, mock_settings):
-        """Test service initialization when Tavily package is not available."""
-        with patch('app.services.web_search.TAVILY_AVAILABLE', False):
-            service = AsyncWebSearchService("test_key")
-            
-            assert service.is_available is False
-            assert service.client is None
+        service = AsyncWebSearchService("test_key")
+        
+        assert service.api_key == "test_key"
+        assert service.is_available is True
+        patched_env.assert_called_once_with(api_key="test_key")
     
-    @pytest.mark.asyncio
-    async def test_search_educational_content_success(self, web_search_service, mock_tavily_client):
+    async def test_search_educational_content_success(self, web_search_service, fake_tavily):
         """Test successful educational content search."""
         # Mock the service to be available
         web_search_service.is_available = True
-        web_search_service.client = mock_tavily_client
-        
-        context = {
-            "skill_level": "beginner",
-            "genres": ["jazz"],
-            "cultural_elements": ["improvisation"]
-        }
+        web_search_service.client = fake_tavily
         
-        result = await web_search_service.search_educational_content("music theory", context)
+        result = await web_search_service.search_educational_content("music theory", BEGINNER_JAZZ_CONTEXT)
         
         assert result["query"] == "music theory"
         assert "enhanced_query" in result
         assert result["service_available"] is True
         assert "results" in result
+        assert result["total_results"] == 2
         assert "processing_metadata" in result
         assert result["processing_metadata"]["query_enhancement_applied"] is True
     
-    @pytest.mark.asyncio
     async def test_search_educational_content_service_unavailable(self, web_search_service):
         """Test search when service is unavailable."""
         web_search_service.is_available = False
         
-        context = {"skill_level": "beginner"}
-        result = await web_search_service.search_educational_content("music theory", context)
+        result = await web_search_service.search_educational_content("music theory", BEGINNER_CONTEXT)
         
         assert result["service_available"] is False
         assert result["total_results"] == 0
         assert result["processing_metadata"]["degradation_reason"] == "Service unavailable"
     
-    @pytest.mark.asyncio
-    async def test_search_educational_content_error(self, web_search_service):
+    async def test_search_educational_content_error(self, web_search_service, fake_tavily):
         """Test search error handling."""
+        fake_tavily.search.side_effect = Exception("API Error")
         web_search_service.is_available = True
-        web_search_service.client = Mock()
-        web_search_service.client.search.side_effect = Exception("API Error")
+        web_search_service.client = fake_tavily
         
-        context = {"skill_level": "beginner"}
-        result = await web_search_service.search_educational_content("music theory", context)
+        result = await web_search_service.search_educational_content("music theory", BEGINNER_CONTEXT)
         
         assert result["service_available"] is False
         assert "error" in result
         assert result["processing_metadata"]["error_type"] == "search_error"
     
-    def test_enhance_query_for_education(self, web_search_service):
+    @pytest.mark.parametrize("query, context, must_contain, must_not_contain", [
+        (
+            "music",
+            {"skill_level": "beginner", "genres": ["jazz", "blues"], "cultural_elements": ["improvisation"]},
+            ["music", "music theory basics", "jazz music history", "cultural significance improvisation",
+             "educational content", "music education"],
+            []
+        ),
+        (
+            "composition",
+            {"skill_level": "advanced", "genres": ["classical"]},
+            ["composition", "advanced music theory", "classical music history"],
+            []
+        ),
+        (
+            # Only the first two genres and cultural elements are used
+            "chords",
+            {"skill_level": "intermediate", "genres": ["rock", "pop", "electronic"], "cultural_elements": ["rhythm", "melody"]},
+            ["rock music history", "pop music history", "cultural significance rhythm", "cultural significance melody"],
+            ["electronic music history"]
+        ),
+        ("music", {}, ["music", "educational content", "music education"], []),
+        ("music", None, ["music", "educational content"], []),
+    ], ids=["beginner", "advanced", "list-context", "empty-context", "none-context"])
+    def test_enhance_query(self, web_search_service, query, context, must_contain, must_not_contain):
         """Test query enhancement for educational content."""
-        context = {
-            "skill_level": "beginner",
-            "genres": ["jazz", "blues"],
-            "cultural_elements": ["improvisation"]
-        }
-        
-        enhanced_query = web_search_service._enhance_query_for_education("music", context)
-        
-        assert "music" in enhanced_query
-        assert "music theory basics" in enhanced_query
-        assert "jazz music history" in enhanced_query
-        assert "cultural significance improvisation" in enhanced_query
-        assert "educational content" in enhanced_query
-        assert "music education" in enhanced_query
-    
-    def test_enhance_query_for_advanced_level(self, web_search_service):
-        """Test query enhancement for advanced skill level."""
-        context = {
-            "skill_level": "advanced",
-            "genres": ["classical"]
-        }
-        
-        enhanced_query = web_search_service._enhance_query_for_education("composition", context)
-        
-        assert "composition" in enhanced_query
-        assert "advanced music theory" in enhanced_query
-        assert "classical music history" in enhanced_query
-    
-    def test_enhance_query_with_list_context(self, web_search_service):
-        """Test query enhancement with list-based context."""
-        context = {
-            "skill_level": "intermediate",
-            "genres": ["rock", "pop", "electronic"],
-            "cultural_elements": ["rhythm", "melody"]
-        }
-        
-        enhanced_query = web_search_service._enhance_query_for_education("chords", context)
+        enhanced_query = web_search_service._enhance_query_for_education(query, context)
         
-        # Should only include first 2 genres and cultural elements
-        assert "rock music history" in enhanced_query
-        assert "pop music history" in enhanced_query
-        assert "cultural significance rhythm" in enhanced_query
-        assert "cultural significance melody" in enhanced_query
-        # Should not include electronic (third genre)
-        assert "electronic music history" not in enhanced_query
+        for expected in must_contain:
+            assert expected in enhanced_query
+        for unexpected in must_not_contain:
+            assert unexpected not in enhanced_query
     
-    @pytest.mark.asyncio
     async def test_filter_and_validate_results(self, web_search_service):
         """Test result filtering and validation."""
-        raw_results = [
-            {
-                "title": "Music Theory Basics",
-                "url": "https://musictheory.net/lessons",
-                "content": "Learn the fundamentals of music theory including scales, chords, and rhythm."
-            },
-            {
-                "title": "Inappropriate Content",
-                "url": "https://inappropriate.com",
-                "content": "Adult content that should be filtered out."
-            },
-            {
-                "title": "Jazz History",
-                "url": "https://wikipedia.org/jazz",
-                "content": "Explore the rich history of jazz music."
-            }
-        ]
-        
-        context = {"skill_level": "beginner"}
-        filtered_results = await web_search_service._filter_and_validate_results(raw_results, context)
+        filtered_results = await web_search_service._filter_and_validate_results(RAW_SEARCH_RESULTS, BEGINNER_CONTEXT)
         
         # Should filter out inappropriate content
         assert len(filtered_results) == 2
@@ -225,109 +196,50 @@ class TestAsyncWebSearchService:
         }
         assert web_search_service._validate_result_basic(invalid_result) is False
     
-    def test_filter_educational_content(self, web_search_service):
+    @pytest.mark.parametrize("result, expected", [
+        ({"title": "Music Theory", "url": "https://musictheory.net/lessons", "content": "Learn music theory"}, True),
+        ({"title": "Learn Music Theory", "url": "https://example.com", "content": "Educational content about music"}, True),
+        ({"title": "Adult Content", "url": "https://example.com", "content": "Inappropriate adult content"}, False),
+        ({"title": "Shopping Site", "url": "https://shopping.com", "content": "Buy products online"}, False),
+    ], ids=["educational-domain", "educational-keywords", "inappropriate", "non-educational"])
+    def test_filter_educational_content(self, web_search_service, result, expected):
         """Test educational content filtering."""
-        context = {"skill_level": "beginner"}
-        
-        # Educational domain
-        edu_result = {
-            "title": "Music Theory",
-            "url": "https://musictheory.net/lessons",
-            "content": "Learn music theory"
-        }
-        assert web_search_service._filter_educational_content(edu_result, context) is True
-        
-        # Educational keywords
-        keyword_result = {
-            "title": "Learn Music Theory",
-            "url": "https://example.com",
-            "content": "Educational content about music"
-        }
-        assert web_search_service._filter_educational_content(keyword_result, context) is True
-        
-        # Inappropriate content
-        inappropriate_result = {
-            "title": "Adult Content",
-            "url": "https://example.com",
-            "content": "Inappropriate adult content"
-        }
-        assert web_search_service._filter_educational_content(inappropriate_result, context) is False
-        
-        # Non-educational content
-        non_edu_result = {
-            "title": "Shopping Site",
-            "url": "https://shopping.com",
-            "content": "Buy products online"
-        }
-        assert web_search_service._filter_educational_content(non_edu_result, context) is False
+        assert web_search_service._filter_educational_content(result, BEGINNER_CONTEXT) is expected
     
-    def test_assess_source_quality(self, web_search_service):
-        """Test source quality assessment."""
-        # High quality educational domain
-        high_quality = {
-            "title": "Music Theory Fundamentals",
-            "url": "https://musictheory.net/lessons",
-            "content": "Comprehensive guide to music theory fundamentals including scales, chords, rhythm, and harmony. This educational resource provides detailed explanations and interactive examples for learning music theory."
-        }
-        score = web_search_service._assess_source_quality(high_quality)
-        assert score > 0.8  # Should be high quality
-        
-        # Medium quality
-        medium_quality = {
-            "title": "Music Basics",
-            "url": "https://example.com/music",
-            "content": "Basic music information with some educational content."
-        }
-        score = web_search_service._assess_source_quality(medium_quality)
-        assert 0.5 <= score <= 0.7  # Should be medium quality
-        
-        # Low quality
-        low_quality = {
-            "title": "Music",
-            "url": "https://example.com",
-            "content": "Short content"
-        }
-        score = web_search_service._assess_source_quality(low_quality)
-        assert score < 0.6  # Should be lower quality
-    
-    def test_assess_context_alignment(self, web_search_service):
-        """Test context alignment assessment."""
-        result = {
-            "title": "Beginner Music Theory",
-            "content": "Basic music theory for beginners"
-        }
-        
-        # Beginner context
-        beginner_context = {"skill_level": "beginner"}
-        alignment = web_search_service._assess_context_alignment(result, beginner_context)
-        assert alignment > 0.6  # Should align well with beginner context
-        
-        # Advanced context
-        advanced_context = {"skill_level": "advanced"}
-        alignment = web_search_service._assess_context_alignment(result, advanced_context)
-        assert alignment < 0.6  # Should not align well with advanced context
-    
-    def test_assess_context_alignment_with_genres(self, web_search_service):
-        """Test context alignment with genre information."""
-        result = {
-            "title": "Jazz Music History",
-            "content": "Explore the rich history of jazz music"
-        }
+    @pytest.mark.parametrize("result, lo, hi", [
+        (
+            {
+                "title": "Music Theory Fundamentals",
+                "url": "https://musictheory.net/lessons",
+                "content": "Comprehensive guide to music theory fundamentals including scales, chords, rhythm, and harmony. This educational resource provides detailed explanations and interactive examples for learning music theory."
+            },
+            0.8, None
+        ),
+        (
+            {"title": "Music Basics", "url": "https://example.com/music", "content": "Basic music information with some educational content."},
+            0.5, 0.7
+        ),
+        ({"title": "Music", "url": "https://example.com", "content": "Short content"}, None, 0.6),
+    ], ids=["high", "medium", "low"])
+    def test_assess_source_quality(self, web_search_service, result, lo, hi):
+        """Test source quality assessment; None leaves a bound open."""
+        score = web_search_service._assess_source_quality(result)
         
-        context = {"genres": ["jazz", "blues"]}
+        assert lo is None or score > lo
+        assert hi is None or score < hi
+    
+    @pytest.mark.parametrize("result, context, lo, hi", [
+        ({"title": "Beginner Music Theory", "content": "Basic music theory for beginners"}, BEGINNER_CONTEXT, 0.6, None),
+        ({"title": "Beginner Music Theory", "content": "Basic music theory for beginners"}, {"skill_level": "advanced"}, None, 0.6),
+        ({"title": "Jazz Music History", "content": "Explore the rich history of jazz music"}, {"genres": ["jazz", "blues"]}, 0.6, None),
+        ({"title": "Improvisation in Music", "content": "Learn about musical improvisation techniques"}, {"cultural_elements": ["improvisation"]}, 0.6, None),
+    ], ids=["beginner", "advanced-mismatch", "genres", "cultural-elements"])
+    def test_assess_context_alignment(self, web_search_service, result, context, lo, hi):
+        """Test context alignment assessment; None leaves a bound open."""
         alignment = web_search_service._assess_context_alignment(result, context)
-        assert alignment > 0.6  # Should align well with jazz genre
-    
-    def test_assess_context_alignment_with_cultural_elements(self, web_search_service):
-        """Test context alignment with cultural elements."""
-        result = {
-            "title": "Improvisation in Music",
-            "content": "Learn about musical improvisation techniques"
-        }
         
-        context = {"cultural_elements": ["improvisation"]}
-        alignment = web_search_service._assess_context_alignment(result, context)
-        assert alignment > 0.6  # Should align well with improvisation
+        assert lo is None or alignment > lo
+        assert hi is None or alignment < hi
     
     def test_create_empty_response(self, web_search_service):
         """Test empty response creation."""
@@ -371,135 +283,157 @@ class TestAsyncWebSearchService:
 class TestWebSearchServiceIntegration:
     """Test web search service integration scenarios."""
     
+    @pytest.fixture(scope="class")
+    def tavily_service(self, mock_settings):
+        """Create one service backed by a mock Tavily client for the class."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr('app.services.web_search.get_settings', lambda: mock_settings)
+            mp.setattr('app.services.web_search.TAVILY_AVAILABLE', True)
+            mp.setattr('app.services.web_search.TavilyClient', Mock(return_value=Mock(spec=["search"])))
+            service = AsyncWebSearchService()
+        
+        assert service.is_available is True
+        return service
+    
     @pytest.fixture
-    def mock_settings(self):
-        """Create mock settings."""
-        mock_settings = Mock()
-        mock_settings.TAVILY_API_KEY = "test_api_key"
-        mock_settings.WEB_SEARCH_MAX_RESULTS = 3
-        mock_settings.WEB_SEARCH_TIMEOUT_SECONDS = 10
-        return mock_settings
+    def tavily_client(self, tavily_service, fake_tavily, monkeypatch):
+        """Swap a fresh fake Tavily client into the shared service for one test."""
+        monkeypatch.setattr(tavily_service, "client", fake_tavily)
+        return fake_tavily
     
-    @pytest.mark.asyncio
-    async def test_search_with_timeout(self, mock_settings):
+    async def test_search_with_timeout(self, tavily_service, mock_settings, monkeypatch):
         """Test search timeout handling."""
-        with patch('app.services.web_search.get_settings', return_value=mock_settings):
-            with patch('app.services.web_search.TAVILY_AVAILABLE', True):
-                with patch('app.services.web_search.TavilyClient') as mock_tavily:
-                    # Mock a slow search that will timeout
-                    async def slow_search(*args, **kwargs):
-                        await asyncio.sleep(15)  # Longer than timeout
-                        return {"results": []}
-                    
-                    mock_client = Mock()
-                    mock_client.search = slow_search
-                    mock_tavily.return_value = mock_client
-                    
-                    service = AsyncWebSearchService()
-                    service.is_available = True
-                    service.client = mock_client
-                    
-                    context = {"skill_level": "beginner"}
-                    result = await service.search_educational_content("music theory", context)
-                    
-                    assert result["service_available"] is False
-                    assert "error" in result
+        # Mock a search that never finishes, against a short timeout
+        monkeypatch.setattr(mock_settings, "WEB_SEARCH_TIMEOUT_SECONDS", 0.01)
+        never_set = asyncio.Event()
+        
+        async def stalled_search(query):
+            await never_set.wait()
+        
+        monkeypatch.setattr(tavily_service, "_search_with_timeout", stalled_search)
+        
+        result = await tavily_service.search_educational_content("music theory", BEGINNER_CONTEXT)
+        
+        assert result["service_available"] is False
+        assert result["error"] == "Search timeout"
+    
+    async def test_cancelled_owner_fails_joiners(self, tavily_service, tavily_client, monkeypatch):
+        """Test that a joiner gets an error result when the owning search is cancelled."""
+        never_set = asyncio.Event()
+        started = asyncio.Event()
+        
+        async def stalled_search(query):
+            started.set()
+            await never_set.wait()
+        
+        monkeypatch.setattr(tavily_service, "_search_with_timeout", stalled_search)
+        
+        # The owner is cut off by a caller's timeout, as the orchestrator's tool_timeout does
+        owner = asyncio.create_task(asyncio.wait_for(
+            tavily_service.search_educational_content("music theory", BEGINNER_CONTEXT), timeout=0.05
+        ))
+        await asyncio.wait_for(started.wait(), timeout=1.0)
+        joiner = asyncio.create_task(
+            tavily_service.search_educational_content("music theory", BEGINNER_CONTEXT)
+        )
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await owner
+        result = await asyncio.wait_for(joiner, timeout=1.0)
+        
+        assert result["service_available"] is False
+        assert result["error"] == "Search cancelled"
+        assert tavily_service._inflight == {}
     
-    @pytest.mark.asyncio
-    async def test_concurrent_searches(self, mock_settings):
+    async def test_concurrent_searches(self, tavily_service, tavily_client):
         """Test concurrent search operations."""
-        with patch('app.services.web_search.get_settings', return_value=mock_settings):
-            with patch('app.services.web_search.TAVILY_AVAILABLE', True):
-                with patch('app.services.web_search.TavilyClient') as mock_tavily:
-                    mock_client = Mock()
-                    mock_client.search.return_value = {"results": [{"title": "Test", "url": "https://test.com"}]}
-                    mock_tavily.return_value = mock_client
-                    
-                    service = AsyncWebSearchService()
-                    service.is_available = True
-                    service.client = mock_client
-                    
-                    # Perform concurrent searches
-                    tasks = [
-                        service.search_educational_content("query1", {"skill_level": "beginner"}),
-                        service.search_educational_content("query2", {"skill_level": "intermediate"}),
-                        service.search_educational_content("query3", {"skill_level": "advanced"})
-                    ]
-                    
-                    results = await asyncio.gather(*tasks)
-                    
-                    assert len(results) == 3
-                    for result in results:
-                        assert result["service_available"] is True
-                        assert "results" in result
+        # Each blocking search waits until all three are running in the thread pool
+        all_running = threading.Barrier(3, timeout=1.0)
+        
+        def search(query, **kwargs):
+            all_running.wait()
+            return {"results": [{"title": "Test", "url": "https://test.com"}]}
+        
+        tavily_client.search.side_effect = search
+        
+        # Perform concurrent searches; the group cancels the rest if one raises
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(tavily_service.search_educational_content("query1", BEGINNER_CONTEXT)),
+                tg.create_task(tavily_service.search_educational_content("query2", {"skill_level": "intermediate"})),
+                tg.create_task(tavily_service.search_educational_content("query3", {"skill_level": "advanced"}))
+            ]
+        
+        results = [task.result() for task in tasks]
+        
+        assert len(results) == 3
+        assert tavily_client.search.call_count == 3
+        for result in results:
+            assert result["service_available"] is True
+            assert "results" in result
+    
+    async def test_concurrent_identical_searches_share_request(self, tavily_service, tavily_client):
+        """Test that identical in-flight searches issue a single request."""
+        results = await asyncio.gather(
+            *(tavily_service.search_educational_content("query1", BEGINNER_CONTEXT) for _ in range(3))
+        )
+        
+        assert tavily_client.search.call_count == 1
+        assert all(result["service_available"] is True for result in results)
+        assert tavily_service._inflight == {}
 
 
 class TestWebSearchServiceEdgeCases:
     """Test web search service edge cases and error conditions."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_settings(self):
-        """Create mock settings."""
-        mock_settings = Mock()
-        mock_settings.TAVILY_API_KEY = None  # No API key
-        mock_settings.WEB_SEARCH_MAX_RESULTS = 3
-        mock_settings.WEB_SEARCH_TIMEOUT_SECONDS = 10
-        return mock_settings
-    
-    def test_initialization_without_api_key(self, mock_settings):
-        """Test initialization without API key."""
-        with patch('app.services.web_search.get_settings', return_value=mock_settings):
-            with patch('app.services.web_search.TAVILY_AVAILABLE', True):
-                service = AsyncWebSearchService()
-                
-                assert service.is_available is False
-                assert service.api_key is None
-    
-    @pytest.mark.asyncio
-    async def test_search_with_empty_context(self, mock_settings):
-        """Test search with empty context."""
-        with patch('app.services.web_search.get_settings', return_value=mock_settings):
-            service = AsyncWebSearchService()
-            service.is_available = False  # Service unavailable
-            
-            result = await service.search_educational_content("music", {})
-            
-            assert result["query"] == "music"
-            assert result["service_available"] is False
-            assert result["total_results"] == 0
-    
-    @pytest.mark.asyncio
-    async def test_search_with_none_context(self, mock_settings):
-        """Test search with None context."""
-        with patch('app.services.web_search.get_settings', return_value=mock_settings):
-            service = AsyncWebSearchService()
-            service.is_available = False  # Service unavailable
-            
-            result = await service.search_educational_content("music", None)
-            
-            assert result["query"] == "music"
-            assert result["service_available"] is False
+        """Create mock settings without an API key."""
+        return _make_settings(tavily_api_key=None)
     
-    def test_enhance_query_with_empty_context(self, mock_settings):
-        """Test query enhancement with empty context."""
+    @pytest.fixture(scope="class")
+    def keyless_service(self, mock_settings):
+        """Create one service without an API key for the class."""
         with patch('app.services.web_search.get_settings', return_value=mock_settings):
             service = AsyncWebSearchService()
-            
-            enhanced_query = service._enhance_query_for_education("music", {})
-            
-            assert "music" in enhanced_query
-            assert "educational content" in enhanced_query
-            assert "music education" in enhanced_query
+        
+        assert service.is_available is False
+        return service
+    
+    @pytest.mark.parametrize("api_key, tavily_available", [
+        (None, True),
+        ("test_key", False),
+        (None, False),
+    ], ids=["no-api-key", "no-tavily-package", "neither"])
+    def test_initialization_unavailable(self, patched_env, monkeypatch, api_key, tavily_available):
+        """Test that the service is disabled without an API key or the Tavily package."""
+        monkeypatch.setattr('app.services.web_search.TAVILY_AVAILABLE', tavily_available)
+        
+        service = AsyncWebSearchService(api_key)
+        
+        assert service.is_available is False
+        assert service.client is None
+        assert service.api_key == api_key
+        patched_env.assert_not_called()
+    
+    @pytest.mark.parametrize("context", [{}, None], ids=["empty-context", "none-context"])
+    async def test_search_without_context(self, keyless_service, context):
+        """Test search with an empty or missing context on an unavailable service."""
+        result = await keyless_service.search_educational_content("music", context)
+        
+        assert result["query"] == "music"
+        assert result["service_available"] is False
+        assert result["total_results"] == 0
     
-    def test_enhance_query_with_none_context(self, mock_settings):
-        """Test query enhancement with None context."""
+    def test_shared_service_per_api_key(self, mock_settings, monkeypatch):
+        """Test that the shared service is created once per API key."""
+        monkeypatch.setattr('app.services.web_search._shared_services', {})
+        
         with patch('app.services.web_search.get_settings', return_value=mock_settings):
-            service = AsyncWebSearchService()
-            
-            enhanced_query = service._enhance_query_for_education("music", None)
+            first = get_shared_web_search_service("key-a")
             
-            assert "music" in enhanced_query
-            assert "educational content" in enhanced_query
+            assert get_shared_web_search_service("key-a") is first
+            assert get_shared_web_search_service("key-b") is not first
 
 
 if __name__ == "__main__":